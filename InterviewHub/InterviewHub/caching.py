@@ -0,0 +1,183 @@
+"""
+Кэширование ответов API с инвалидацией по поколениям.
+
+Для каждой модели в кэше хранится счетчик поколения. Ключ кэшированного
+ответа включает поколения всех моделей, из которых он собран, поэтому
+изменение любой из них сбрасывает все такие ответы одним INCR счетчика, без
+поиска ключей по шаблону (KEYS/SCAN). Устаревшие записи вытесняются по TTL.
+
+Счетчики увеличиваются сигналами post_save/post_delete моделей,
+подключенных через register(), после коммита транзакции. Операции без
+сигналов (bulk_create, update, _raw_delete) вызывают invalidate() сами.
+
+Те же поколения служат валидаторами условных запросов: ETag и
+Last-Modified вычисляются без запросов к БД (ConditionalViewSetMixin).
+"""
+
+import hashlib
+import math
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+def generation_key(model):
+    return f"generation:{model._meta.label_lower}"
+
+
+def modified_key(model):
+    return f"generation:{model._meta.label_lower}:modified"
+
+
+def query_key(request):
+    # Параметры сортируются, чтобы ?a=1&b=2 и ?b=2&a=1 давали один ключ
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    return hashlib.md5(query.encode()).hexdigest()
+
+
+def get_generations(models):
+    """Текущие поколения моделей, отсутствующие счетчики создаются."""
+    keys = [generation_key(model) for model in models]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            # Начальное значение - время в мс, а не 1: если счетчик вытеснен из кэша,
+            # новое поколение не совпадет с поколением оставшихся записей
+            initial = time.time_ns() // 1_000_000
+            cache.add(key, initial, timeout=None)
+            # Время изменения неизвестно, текущее время - его верхняя граница
+            cache.add(f"{key}:modified", initial / 1000, timeout=None)
+            generations[key] = cache.get(key, initial)
+    return [generations[key] for key in keys]
+
+
+def get_last_modified(models):
+    """Время последнего изменения моделей (timestamp) или None, если оно неизвестно."""
+    keys = [modified_key(model) for model in models]
+    modified = cache.get_many(keys)
+    if not keys or len(modified) < len(keys):
+        return None
+    return max(modified.values())
+
+
+def invalidate(model):
+    try:
+        cache.incr(generation_key(model))
+    except ValueError:
+        # Счетчика нет - нет и записей, собранных с его поколением
+        return
+    cache.set(modified_key(model), time.time(), timeout=None)
+
+
+# Поля моделей, попадающие в ответы API (register(..., fields=...))
+_response_fields = {}
+
+
+def invalidate_on_commit(sender, using=None, update_fields=None, **kwargs):
+    fields = _response_fields.get(sender)
+    if fields is not None and update_fields is not None and fields.isdisjoint(update_fields):
+        # Сохранены только поля, которых нет в ответах (например, last_login при входе)
+        return
+    # До коммита параллельный запрос мог бы закэшировать старые данные с новым поколением
+    transaction.on_commit(lambda: invalidate(sender), using=using)
+
+
+def register(*models, fields=None):
+    """
+    Сбрасывать кэш ответов, собранных из models, при каждом их изменении.
+    fields - поля, которые выводятся в ответах: сохранение с update_fields
+    без этих полей кэш не сбрасывает.
+    """
+    for model in models:
+        if fields is not None:
+            _response_fields[model] = frozenset(fields)
+        post_save.connect(invalidate_on_commit, sender=model)
+        post_delete.connect(invalidate_on_commit, sender=model)
+
+
+class CachedViewSetMixin:
+    """
+    Кэширование list и retrieve у ViewSet.
+
+    cache_prefix - префикс ключей, cache_models - модели, из которых собирается
+    ответ (включая вложенные сериализаторы; они должны быть подключены через
+    register()), cache_timeout - время жизни записей, cache_hit_status - код
+    ответа из кэша.
+    """
+
+    cache_prefix = None
+    cache_models = ()
+    cache_timeout = settings.API_CACHE_TIMEOUT
+    cache_hit_status = 200
+
+    def get_cache_key(self, suffix):
+        generations = ".".join(str(generation) for generation in get_generations(self.cache_models))
+        return f"{self.cache_prefix}:{self.action}:{generations}:{suffix}"
+
+    def cached_response(self, key, view, request, *args, **kwargs):
+        data = cache.get(key)
+        if data is not None:
+            return Response(data, status=self.cache_hit_status)
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, timeout=self.cache_timeout)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        key = self.get_cache_key(query_key(request))
+        return self.cached_response(key, super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        key = self.get_cache_key(kwargs[self.lookup_url_kwarg or self.lookup_field])
+        return self.cached_response(key, super().retrieve, request, *args, **kwargs)
+
+
+class ConditionalViewSetMixin:
+    """
+    Условные запросы для list у ViewSet (другие действия оборачиваются в
+    conditional_response()). ETag строится из поколений conditional_models,
+    параметров запроса и формата ответа, Last-Modified - время последнего
+    изменения этих моделей. Если клиент прислал совпадающий If-None-Match или
+    If-Modified-Since, возвращается 304 без запросов к БД и сериализации.
+    """
+
+    conditional_models = ()
+
+    def get_conditional_models(self):
+        return self.conditional_models
+
+    def get_etag(self, request, models, **kwargs):
+        generations = ".".join(str(generation) for generation in get_generations(models))
+        value = ":".join(
+            [self.action, str(sorted(kwargs.items())), request.accepted_renderer.format, generations, query_key(request)]
+        )
+        return quote_etag(hashlib.md5(value.encode()).hexdigest())
+
+    def conditional_response(self, view, request, *args, **kwargs):
+        models = self.get_conditional_models()
+        etag = self.get_etag(request, models, **kwargs)
+        last_modified = get_last_modified(models)
+        if last_modified is not None:
+            # Last-Modified передается с точностью до секунды, округление вверх не занижает его
+            last_modified = math.ceil(last_modified)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        # Ответ зависит от авторизации и должен проверяться при каждом опросе
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
@@ -33,4 +33,24 @@ app.conf.beat_schedule = {
         'task': 'users.tasks.save_user_activity_to_db',
         'schedule': crontab(minute='*'),
     },
+    'rollup_user_activity': {
+        'task': 'users.tasks.rollup_user_activity',
+        'schedule': crontab(minute=5),  # Каждый час в HH:05
+    },
+    'rebuild_interview_stats': {
+        'task': 'interviews.tasks.rebuild_interview_stats',
+        'schedule': crontab(hour=3, minute=30),  # Каждый день в 03:30
+    },
+    'compact_history_tables': {
+        'task': 'audit.tasks.compact_history_tables',
+        'schedule': crontab(hour=4, minute=0),  # Каждый день в 04:00
+    },
+    'delete_expired_export_jobs': {
+        'task': 'exports.tasks.delete_expired_export_jobs',
+        'schedule': crontab(hour=4, minute=30),  # Каждый день в 04:30
+    },
+    'purge_user_activity': {
+        'task': 'users.tasks.purge_user_activity',
+        'schedule': crontab(hour=3, minute=0),  # Каждый день в 03:00
+    },
 }
\ No newline at end of file
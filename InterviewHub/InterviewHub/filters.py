@@ -0,0 +1,26 @@
+"""
+Общие фильтры API.
+"""
+
+from rest_framework.filters import SearchFilter
+
+
+def normalize_email(email):
+    """Email в виде, в котором он хранится в денормализованных полях поиска."""
+    return (email or "").strip().lower()
+
+
+class EmailSearchFilter(SearchFilter):
+    """
+    Поиск ?search= по началу email в денормализованных полях модели
+    (search_fields, например candidate_email и interviewer_email).
+
+    Поля хранятся в нижнем регистре, поэтому поиск выполняется как
+    LIKE 'prefix%' по индексу с varchar_pattern_ops, без JOIN и ILIKE.
+    """
+
+    def get_search_terms(self, request):
+        return [normalize_email(term) for term in super().get_search_terms(request)]
+
+    def construct_search(self, field_name, queryset):
+        return f"{field_name}__startswith"
@@ -1,50 +1,119 @@
+import atexit
 import logging
 import json
-from datetime import datetime
+import threading
+import time
 import redis
 
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from django.conf import settings
+from django.utils import timezone
 
 logger = logging.getLogger('user_activity')
 
 
+class ActivityBuffer:
+    """
+    Буфер записей активности в памяти процесса.
+
+    Записи копятся локально и отправляются в Redis одним пайплайном,
+    когда набирается max_size записей или проходит flush_interval секунд
+    с момента предыдущей отправки.
+    """
+
+    # Максимальное количество значений в одной команде LPUSH
+    push_chunk_size = 500
+
+    def __init__(self, redis_client, key, max_size, flush_interval):
+        self.redis_client = redis_client
+        self.key = key
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self._items = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def add(self, record):
+        """
+        Добавляет запись в буфер и отправляет буфер в Redis, если достигнут порог.
+        """
+        with self._lock:
+            self._items.append(json.dumps(record))
+            is_full = len(self._items) >= self.max_size
+            is_stale = time.monotonic() - self._last_flush >= self.flush_interval
+            if not (is_full or is_stale):
+                return
+            items = self._take()
+        self._push(items)
+
+    def flush(self):
+        """
+        Принудительно отправляет все накопленные записи в Redis.
+        """
+        with self._lock:
+            items = self._take()
+        self._push(items)
+
+    def _take(self):
+        items, self._items = self._items, []
+        self._last_flush = time.monotonic()
+        return items
+
+    def _push(self, items):
+        if not items:
+            return
+        # LPUSH с несколькими значениями сохраняет порядок для RPOP-потребителя
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for start in range(0, len(items), self.push_chunk_size):
+                pipe.lpush(self.key, *items[start:start + self.push_chunk_size])
+            pipe.execute()
+        except redis.RedisError:
+            logger.exception("Не удалось записать %s записей активности в Redis", len(items))
+            return
+        logger.info("Записано в Redis: %s записей активности", len(items))
+
+
 class LoggingMiddleware:
     def __init__(self, get_response):
         """
         Конструктор класса, который инициализирует необходимые объекты.
         """
         self.get_response = get_response
-        self.jwt_authenticator = JWTAuthentication()
-        self.redis_client = redis.StrictRedis(host='redis', port=6379, db=0)  # Настройка Redis
+        self.redis_client = redis.StrictRedis.from_url(settings.REDIS_URL)  # Настройка Redis
+        self.activity_buffer = ActivityBuffer(
+            self.redis_client,
+            key=settings.USER_ACTIVITY_KEY,
+            max_size=settings.USER_ACTIVITY_BUFFER_SIZE,
+            flush_interval=settings.USER_ACTIVITY_FLUSH_INTERVAL,
+        )
+        # Отправляем остаток буфера при остановке процесса
+        atexit.register(self.activity_buffer.flush)
 
     def __call__(self, request):
         """
         Метод, который обрабатывает каждый входящий HTTP-запрос.
         """
-        user_info = "Анонимус"  # Значение по умолчанию для анонимных пользователей
+        timestamp = timezone.now().isoformat()  # Время запроса в формате ISO
+
+        response = self.get_response(request)
 
-        # Проверка на наличие авторизованного пользователя через стандартный механизм Django
-        if request.user.is_authenticated:
-            user_info = f"{request.user.first_name} {request.user.last_name} ({request.user.username})"
-        else:
-            try:
-                token = request.headers.get('Authorization', '').split()[1]
-                validated_token = self.jwt_authenticator.get_validated_token(token)
-                user = self.jwt_authenticator.get_user(validated_token)
-                user_info = f"{user.first_name} {user.last_name} ({user})"
-            except Exception:
-                pass
+        # Пользователь определяется после выполнения view: DRF при аутентификации
+        # по JWT записывает найденного пользователя в request.user исходного запроса,
+        # поэтому токен не декодируется и пользователь не загружается повторно
+        user = getattr(request, "user", None)
+        user_id = user.pk if user is not None and user.is_authenticated else None
 
+        # Вместо конкретного пути сохраняется шаблон маршрута, по которому отработал запрос
+        resolver_match = request.resolver_match
         visit_data = {
-            "user": user_info,  # Информация о пользователе
-            "path": request.path,  # URL, по которому был отправлен запрос
+            "user_id": user_id,  # None для анонимных пользователей
+            "route": resolver_match.route if resolver_match else None,
+            "view_name": resolver_match.view_name if resolver_match else None,
             "method": request.method,  # HTTP-метод (GET, POST и т.д.)
-            "timestamp": datetime.now().isoformat(),  # Время запроса в формате ISO
+            "timestamp": timestamp,
         }
 
-        # Запись данных в Redis
-        self.redis_client.lpush("user_activity", json.dumps(visit_data))
-        logger.info(f"Записано в Redis: {visit_data}")
+        # Запись данных в буфер, который пакетно отправляется в Redis
+        self.activity_buffer.add(visit_data)
 
-        response = self.get_response(request)
         return response
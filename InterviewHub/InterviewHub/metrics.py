@@ -0,0 +1,196 @@
+"""
+Инструментирование запросов: время ответа, время и количество SQL-запросов
+и размер ответа для каждого маршрута.
+
+Метрики агрегируются в памяти процесса и периодически отправляются в Redis
+одним пайплайном. Сводка по всем процессам доступна на /api/metrics/.
+Включается настройкой REQUEST_METRICS_ENABLED.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+
+import redis
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+# Верхние границы корзин гистограммы времени ответа, мс
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def bucket_field(wall_ms):
+    """Имя поля гистограммы, в которое попадает указанное время ответа."""
+    for bound in LATENCY_BUCKETS_MS:
+        if wall_ms <= bound:
+            return f"le_{bound}"
+    return "le_inf"
+
+
+class MetricsStore:
+    """
+    Агрегатор метрик в памяти процесса с периодической отправкой в Redis.
+    Для каждого маршрута хранится хэш {prefix}:{route} со счетчиками и
+    гистограммой, список маршрутов хранится в множестве {prefix}:routes.
+    """
+
+    def __init__(self, redis_client, prefix, flush_interval):
+        self.redis_client = redis_client
+        self.prefix = prefix
+        self.flush_interval = flush_interval
+        self._data = defaultdict(lambda: defaultdict(float))
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def record(self, route, wall_ms, db_ms, queries, size):
+        """Учитывает один обработанный запрос."""
+        with self._lock:
+            stats = self._data[route]
+            stats["count"] += 1
+            stats["wall_ms"] += wall_ms
+            stats["db_ms"] += db_ms
+            stats["queries"] += queries
+            stats["bytes"] += size
+            stats[bucket_field(wall_ms)] += 1
+            if time.monotonic() - self._last_flush < self.flush_interval:
+                return
+            data = self._take()
+        self._push(data)
+
+    def flush(self):
+        """Принудительно отправляет накопленные метрики в Redis."""
+        with self._lock:
+            data = self._take()
+        self._push(data)
+
+    def _take(self):
+        data, self._data = self._data, defaultdict(lambda: defaultdict(float))
+        self._last_flush = time.monotonic()
+        return data
+
+    def _push(self, data):
+        if not data:
+            return
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.sadd(f"{self.prefix}:routes", *data.keys())
+            for route, stats in data.items():
+                key = f"{self.prefix}:{route}"
+                for field, value in stats.items():
+                    pipe.hincrbyfloat(key, field, value)
+            pipe.execute()
+        except redis.RedisError:
+            logger.exception("Не удалось отправить метрики запросов в Redis")
+
+    def summary(self):
+        """
+        Возвращает сводку по всем маршрутам: средние значения, гистограмму
+        и оценку перцентилей p50/p95 по верхним границам корзин.
+        """
+        routes = sorted(r.decode() for r in self.redis_client.smembers(f"{self.prefix}:routes"))
+        pipe = self.redis_client.pipeline(transaction=False)
+        for route in routes:
+            pipe.hgetall(f"{self.prefix}:{route}")
+
+        result = {}
+        for route, raw in zip(routes, pipe.execute()):
+            stats = {key.decode(): float(value) for key, value in raw.items()}
+            count = stats.get("count", 0)
+            if not count:
+                continue
+            histogram = {
+                field: int(stats.get(field, 0))
+                for field in [f"le_{bound}" for bound in LATENCY_BUCKETS_MS] + ["le_inf"]
+            }
+            result[route] = {
+                "count": int(count),
+                "avg_wall_ms": round(stats.get("wall_ms", 0) / count, 2),
+                "avg_db_ms": round(stats.get("db_ms", 0) / count, 2),
+                "avg_queries": round(stats.get("queries", 0) / count, 2),
+                "avg_bytes": round(stats.get("bytes", 0) / count),
+                "p50_ms": _percentile(histogram, count, 0.5),
+                "p95_ms": _percentile(histogram, count, 0.95),
+                "histogram": histogram,
+            }
+        return result
+
+    def reset(self):
+        """Удаляет все накопленные в Redis метрики."""
+        routes = self.redis_client.smembers(f"{self.prefix}:routes")
+        keys = [f"{self.prefix}:{route.decode()}" for route in routes]
+        self.redis_client.delete(f"{self.prefix}:routes", *keys)
+
+
+def _percentile(histogram, count, quantile):
+    threshold = count * quantile
+    seen = 0
+    for field, value in histogram.items():
+        seen += value
+        if seen >= threshold:
+            return None if field == "le_inf" else int(field[3:])
+    return None
+
+
+_store = None
+
+
+def get_metrics_store():
+    """Возвращает хранилище метрик процесса (создается при первом обращении)."""
+    global _store
+    if _store is None:
+        _store = MetricsStore(
+            redis.StrictRedis.from_url(settings.REDIS_URL),
+            prefix=settings.REQUEST_METRICS_KEY_PREFIX,
+            flush_interval=settings.REQUEST_METRICS_FLUSH_INTERVAL,
+        )
+        atexit.register(_store.flush)
+    return _store
+
+
+class QueryCounter:
+    """
+    Обертка execute_wrapper, считающая количество и суммарное время SQL-запросов.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_ms += (time.perf_counter() - start) * 1000
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        """
+        Middleware подключается только при включенной настройке REQUEST_METRICS_ENABLED.
+        """
+        if not settings.REQUEST_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.store = get_metrics_store()
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+        wall_ms = (time.perf_counter() - start) * 1000
+
+        # Метрики группируются по имени маршрута, например interview-get-tasks
+        resolver_match = request.resolver_match
+        route = resolver_match.view_name if resolver_match else "unresolved"
+        size = len(response.content) if not response.streaming else 0
+
+        self.store.record(route, wall_ms, counter.db_ms, counter.queries, size)
+        return response
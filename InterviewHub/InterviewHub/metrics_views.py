@@ -0,0 +1,58 @@
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .metrics import get_metrics_store
+
+
+class MetricsView(APIView):
+    """
+    Сводка метрик производительности по маршрутам API.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_summary="Получить метрики производительности",
+        operation_description=(
+            "Возвращает для каждого маршрута количество запросов, среднее время ответа, "
+            "среднее время и количество SQL-запросов, средний размер ответа, "
+            "гистограмму времени ответа и оценку перцентилей p50/p95. "
+            "Метрики собираются при включенной настройке REQUEST_METRICS_ENABLED."
+        ),
+        responses={
+            200: openapi.Response(
+                description="Успешный ответ",
+                examples={
+                    "application/json": {
+                        "interview-get-tasks": {
+                            "count": 120,
+                            "avg_wall_ms": 48.3,
+                            "avg_db_ms": 21.7,
+                            "avg_queries": 4.0,
+                            "avg_bytes": 5120,
+                            "p50_ms": 50,
+                            "p95_ms": 100,
+                            "histogram": {"le_10": 0, "le_25": 12, "le_50": 60, "le_100": 45},
+                        }
+                    }
+                },
+            ),
+            403: "Доступ только для администраторов",
+        },
+    )
+    def get(self, request):
+        """Возвращает сводку метрик по всем маршрутам."""
+        return Response(get_metrics_store().summary())
+
+    @swagger_auto_schema(
+        operation_summary="Сбросить метрики производительности",
+        responses={204: "Метрики сброшены", 403: "Доступ только для администраторов"},
+    )
+    def delete(self, request):
+        """Удаляет накопленные метрики."""
+        get_metrics_store().reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
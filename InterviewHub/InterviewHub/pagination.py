@@ -0,0 +1,189 @@
+"""
+Общие классы пагинации API.
+
+FeedPagination работает как обычная постраничная пагинация, а при наличии
+параметра ?cursor= переключается на keyset-пагинацию: страница выбирается
+условием по колонкам сортировки и id, без OFFSET и COUNT(*), поэтому
+стоимость N-й страницы не отличается от первой.
+"""
+
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class StandardResultsSetPagination(PageNumberPagination):
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+def approximate_count(queryset):
+    """
+    Оценка количества строк по плану запроса PostgreSQL (EXPLAIN), без COUNT(*).
+    Для других СУБД возвращает None.
+    """
+    if connections[queryset.db].vendor != "postgresql":
+        return None
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return plan[0]["Plan"]["Plan Rows"]
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset-пагинация по колонке сортировки и id.
+
+    Сортировка берется из атрибута view cursor_ordering, например
+    ("-start_time", "-id"): первое поле - колонка ленты, второе - id для
+    однозначного порядка строк с одинаковым значением. Колонка сортировки
+    не должна содержать NULL.
+
+    Курсор - base64 от JSON с позицией последней (или первой, для перехода
+    назад) строки страницы. Общее количество по умолчанию не считается,
+    ?count=exact выполняет COUNT(*), ?count=approx возвращает оценку по
+    плану запроса (только PostgreSQL).
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    invalid_cursor_message = "Неверный курсор."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+        self.field, self.descending = self.get_ordering(view)
+        self.count = self.get_count(queryset, request)
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor["reverse"])
+
+        # При переходе назад строки выбираются в обратном порядке и разворачиваются
+        descending = self.descending != reverse
+        prefix = "-" if descending else ""
+        queryset = queryset.order_by(f"{prefix}{self.field}", f"{prefix}id")
+        if cursor:
+            lookup = "lt" if descending else "gt"
+            queryset = queryset.filter(
+                Q(**{f"{self.field}__{lookup}": cursor["value"]})
+                | Q(**{self.field: cursor["value"], f"id__{lookup}": cursor["id"]})
+            )
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        payload = OrderedDict()
+        if self.count is not None:
+            payload["count"] = self.count
+        payload["next"] = self.get_next_link()
+        payload["previous"] = self.get_previous_link()
+        payload["results"] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "nullable": True},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, view):
+        field = getattr(view, "cursor_ordering", ("-id", "-id"))[0]
+        return field.lstrip("-"), field.startswith("-")
+
+    def get_count(self, queryset, request):
+        mode = request.query_params.get(self.count_query_param)
+        if mode == "exact":
+            return queryset.count()
+        if mode == "approx":
+            return approximate_count(queryset)
+        return None
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            value = self.model._meta.get_field(self.field).to_python(position["v"])
+            return {"value": value, "id": int(position["id"]), "reverse": bool(position.get("r"))}
+        except (TypeError, ValueError, KeyError, binascii.Error, UnicodeEncodeError, ValidationError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+
+    def encode_cursor(self, obj, reverse):
+        value = getattr(obj, self.field)
+        position = {"v": value.isoformat() if hasattr(value, "isoformat") else value, "id": obj.pk}
+        if reverse:
+            position["r"] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(position).encode()).decode("ascii")
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Перешли за конец ленты: возвращаемся к первой странице
+            return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, "")
+        return self.encode_cursor(self.page[0], reverse=True)
+
+
+class FeedPagination(StandardResultsSetPagination):
+    """
+    Постраничная пагинация с переходом на KeysetPagination по параметру ?cursor=
+    (пустое значение - первая страница ленты).
+    """
+
+    cursor_query_param = "cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            self.keyset = None
+            return super().paginate_queryset(queryset, request, view)
+        self.keyset = KeysetPagination()
+        return self.keyset.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -41,6 +41,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.sites",
+    "django.contrib.postgres",
 
     "drf_yasg",
     "rest_framework",
@@ -62,6 +63,10 @@ INSTALLED_APPS = [
     "tasks",
     "selections",
     "test_tasks",
+    "benchmarks",
+    "audit",
+    "imports",
+    "exports",
 ]
 
 SITE_ID = 1
@@ -108,6 +113,7 @@ SWAGGER_SETTINGS = {
 }
 
 MIDDLEWARE = [
+    "InterviewHub.metrics.MetricsMiddleware",  # Активна только при REQUEST_METRICS_ENABLED
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -142,19 +148,28 @@ WSGI_APPLICATION = "InterviewHub.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": config["PG_DB_NAME"],  # Имя базы данных, созданной через pgAdmin
-        "USER": config[
-            "PG_USER"
-        ],  # Имя пользователя базы данных, указанного при создании
-        "PASSWORD": config["PG_PASSWORD"],  # Пароль пользователя базы данных
-        "HOST": config["PG_HOST"],  # Адрес сервера базы данных
-        # "HOST": 'host.docker.internal',
-        "PORT": config["PG_PORT"],  # Порт PostgreSQL, обычно 5432
+if config.get("DB_ENGINE") == "sqlite":
+    # Локальный запуск без PostgreSQL, например для manage.py benchmark_queries
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": config["PG_DB_NAME"],  # Имя базы данных, созданной через pgAdmin
+            "USER": config[
+                "PG_USER"
+            ],  # Имя пользователя базы данных, указанного при создании
+            "PASSWORD": config["PG_PASSWORD"],  # Пароль пользователя базы данных
+            "HOST": config["PG_HOST"],  # Адрес сервера базы данных
+            # "HOST": 'host.docker.internal',
+            "PORT": config["PG_PORT"],  # Порт PostgreSQL, обычно 5432
+        }
     }
-}
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -193,6 +208,8 @@ STATICFILES_DIRS = [os.path.join(BASE_DIR, "static")]
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# Файлы, которые не должны раздаваться по MEDIA_URL (загрузки импорта и т.п.)
+PRIVATE_MEDIA_ROOT = BASE_DIR / "private_media"
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
@@ -206,6 +223,65 @@ EMAIL_PORT = 1025
 EMAIL_USE_TLS = False
 EMAIL_USE_SSL = False
 
+# История изменений simple_history (audit)
+HISTORY_SKIP_UNCHANGED = True  # Не создавать запись "~", если отслеживаемые поля не изменились
+# Запись истории задачей Celery после коммита вместо INSERT в транзакции запроса
+HISTORY_ASYNC = config.get("HISTORY_ASYNC", "0") == "1"
+HISTORY_ASYNC_BATCH_SIZE = 500  # Записей истории в одной задаче
+HISTORY_PRUNE_CHUNK_SIZE = 1000  # Записей истории в одном DELETE
+HISTORY_RETENTION = {
+    # days - срок хранения в днях (None - бессрочно), squash - удалять повторяющиеся записи.
+    # По умолчанию история хранится бессрочно, сроки задаются для моделей явно
+    "default": {"days": None, "squash": False},
+    "selections.CompanySelection": {"days": 730},
+    "interviews.Interview": {"days": 730},
+    "interviews.InterviewTaskItem": {"days": 365},
+    "test_tasks.TestTask": {"days": 365},
+    "test_tasks.TestTaskItem": {"days": 365},
+}
+
+# Фоновый импорт (imports): строк в одной транзакции и одном bulk_create
+IMPORT_BATCH_SIZE = 1000
+
+# Выгрузка (exports): объектов в одной порции чтения из БД и записи в ответ
+EXPORT_CHUNK_SIZE = 2000
+# Сколько дней хранятся задачи фоновой выгрузки и их файлы
+EXPORT_KEEP_DAYS = 7
+
+# Архивация отклоненных отборов (selections.archive)
+SELECTION_ARCHIVE_AFTER_DAYS = 180  # Возраст отклоненного отбора, после которого он архивируется
+SELECTION_ARCHIVE_CHUNK_SIZE = 500  # Отборов в одной транзакции
+# "jsonl" - выгрузка в сжатый JSONL перед удалением, "delete" - удаление без выгрузки
+SELECTION_ARCHIVE_MODE = config.get("SELECTION_ARCHIVE_MODE", "jsonl")
+SELECTION_ARCHIVE_DIR = BASE_DIR / "archive"  # Вне MEDIA_ROOT: архив не должен раздаваться по HTTP
+
+INTERVIEW_REMINDER_BATCH_SIZE = 200  # Писем за один запуск обхода; при полной порции ставится следующий
+INTERVIEW_REMINDER_GRACE_MINUTES = 10  # Насколько напоминание может опоздать и все еще быть отправлено
+# Статистика интервью по неделям: сколько прошлых недель пересчитывается ежедневно
+INTERVIEW_STATS_REBUILD_WEEKS = 12
+
+REDIS_URL = 'redis://redis:6379/0'
+
+# Буфер активности пользователей в LoggingMiddleware
+USER_ACTIVITY_KEY = 'user_activity'  # Список в Redis, который разбирает users.tasks
+USER_ACTIVITY_BUFFER_SIZE = 100  # Отправка в Redis после накопления N записей
+USER_ACTIVITY_FLUSH_INTERVAL = 5  # ...или спустя N секунд после предыдущей отправки
+USER_ACTIVITY_DRAIN_CHUNK_SIZE = 1000  # Размер порции при переносе активности из Redis в БД
+USER_ACTIVITY_DRAIN_MAX_CHUNKS = 50  # Максимум порций за один запуск задачи
+USER_ACTIVITY_ROLLUP_WINDOW_HOURS = 3  # Сколько последних часов пересчитывается в почасовых агрегатах
+USER_ACTIVITY_RETENTION_DAYS = 90  # Срок хранения сырых записей активности
+
+# Метрики производительности по маршрутам (InterviewHub.metrics), доступны на /api/metrics/
+REQUEST_METRICS_ENABLED = config.get("REQUEST_METRICS_ENABLED", "0") == "1"
+REQUEST_METRICS_KEY_PREFIX = 'request_metrics'
+REQUEST_METRICS_FLUSH_INTERVAL = 10  # Секунд между отправками метрик процесса в Redis
+
+# Ключи ответов заданий (tasks.answer_keys) сбрасываются сигналами, срок хранения - страховка
+TASK_ANSWER_KEY_TIMEOUT = 60 * 60 * 24
+
+# Конфигурация полнотекстового поиска заданий (tasks.search), PostgreSQL
+TASK_SEARCH_CONFIG = 'russian'
+
 CELERY_BROKER_URL = 'redis://redis:6379/0'
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
@@ -225,6 +301,8 @@ CACHES = {
         "TIMEOUT": 60 * 15,  # Тайм-аут кэша (15 минут)
     }
 }
+# Время жизни кэшированных ответов API по умолчанию (InterviewHub.caching), секунды
+API_CACHE_TIMEOUT = 60 * 15
 
 LOGGING = {
     'version': 1,
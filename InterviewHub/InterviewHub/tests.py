@@ -0,0 +1,87 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+
+from interviews.models import Interview, InterviewTaskItem
+from interviews.tasks import refresh_interview_stats
+from resumes.models import Resume
+from selections.models import CompanySelection
+from tasks.models import CodeQuestion, MultipleChoiceQuestion, OpenQuestion, TaskItem
+from users.models import Candidate, Company, Interviewer, User
+
+from .caching import get_generations
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class CacheGenerationTests(TestCase):
+    def setUp(self):
+        company = Company.objects.create(name="Компания", location="Москва")
+        self.user = User.objects.create_user(username="interviewer", email="interviewer@example.com")
+        interviewer = Interviewer.objects.create(user=self.user, company=company, position="Разработчик")
+        candidate = Candidate.objects.create(
+            user=User.objects.create_user(username="candidate", email="candidate@example.com"),
+            city="Москва",
+        )
+        resume = Resume.objects.create(candidate=candidate, desired_position="Разработчик", desired_salary=100)
+        selection = CompanySelection.objects.create(interviewer=interviewer, resume=resume, status="На рассмотрении")
+        interview = Interview.objects.create(
+            selection=selection,
+            start_time=now(),
+            end_time=now() + timedelta(hours=1),
+            type="Техническое",
+            status="Запланировано",
+        )
+        task_item = TaskItem.objects.create(title="Сумма", complexity=1, task_condition="Сложите два числа")
+        # По одному объекту каждой модели, подключенной через caching.register()
+        self.objects = [
+            company,
+            self.user,
+            interviewer,
+            candidate,
+            resume,
+            selection,
+            interview,
+            InterviewTaskItem.objects.create(interview=interview, task_item=task_item, candidate_answer="3"),
+            task_item,
+            OpenQuestion.objects.create(task_item=task_item, correct_answer="3"),
+            MultipleChoiceQuestion.objects.create(task_item=task_item, answer_text="3", is_correct_answer=True),
+            CodeQuestion.objects.create(task_item=task_item, input_data="1 2", output_data="3"),
+        ]
+
+    def generation(self, model):
+        return get_generations([model])[0]
+
+    def test_write_bumps_generation_after_commit(self):
+        for obj in self.objects:
+            model = type(obj)
+            with self.subTest(model=model._meta.label):
+                before = self.generation(model)
+                with (
+                    mock.patch.object(refresh_interview_stats, "delay"),
+                    self.captureOnCommitCallbacks(execute=True),
+                ):
+                    obj.save()
+                    # До коммита поколение не меняется
+                    self.assertEqual(self.generation(model), before)
+                self.assertGreater(self.generation(model), before)
+
+    def test_delete_bumps_generation_after_commit(self):
+        question = self.objects[-1]
+        before = self.generation(CodeQuestion)
+        with self.captureOnCommitCallbacks(execute=True):
+            question.delete()
+        self.assertGreater(self.generation(CodeQuestion), before)
+
+    def test_last_login_update_keeps_generation(self):
+        before = self.generation(User)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.last_login = now()
+            self.user.save(update_fields=["last_login"])
+        self.assertEqual(self.generation(User), before)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.email = "new@example.com"
+            self.user.save(update_fields=["email"])
+        self.assertGreater(self.generation(User), before)
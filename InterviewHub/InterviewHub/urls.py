@@ -22,6 +22,7 @@ from django.conf.urls.static import static
 from rest_framework import permissions
 
 from . import settings
+from .metrics_views import MetricsView
 
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
@@ -49,6 +50,7 @@ urlpatterns = [
     path("api/", include("interviews.urls")),
     path("api/", include("tasks.urls")),
     path("api/", include("test_tasks.urls")),
+    path("api/metrics/", MetricsView.as_view(), name="metrics"),
 
     path(
         "swagger/",
@@ -0,0 +1,153 @@
+"""
+HistoricalRecords проекта: подключается в моделях вместо
+simple_history.models.HistoricalRecords.
+
+При HISTORY_ASYNC записи истории не сохраняются в транзакции запроса:
+они копятся в пакете текущей транзакции и после коммита передаются
+задаче audit.tasks.write_history_records, которая сохраняет их через
+bulk_create. Время и автор изменения фиксируются в момент сохранения
+объекта, поэтому порядок истории не зависит от задержки очереди.
+Модели с историей m2m-полей или с обработчиками
+post_create_historical_record пишут историю синхронно.
+"""
+
+import threading
+
+from django.conf import settings
+from django.core import serializers
+from django.db import connections, router, transaction
+from django.utils import timezone
+from simple_history.models import HistoricalRecords as BaseHistoricalRecords
+from simple_history.signals import post_create_historical_record, pre_create_historical_record
+
+_local = threading.local()
+
+
+def compared_fields(fields):
+    """
+    Имена полей, по которым сравниваются версии объекта. Поля auto_now
+    меняются при каждом сохранении и не считаются изменением.
+    """
+    return [field.attname for field in fields if not getattr(field, "auto_now", False)]
+
+
+class HistoryBatch:
+    """Записи истории одной транзакции, отправляемые в Celery после ее коммита."""
+
+    def __init__(self, connection):
+        self.records = []
+        # Список on_commit соединения заменяется новым при коммите и откате, а
+        # вложенный atomic добавляет точку сохранения. Пакет пополняется, только
+        # пока обе не изменились, иначе записи отката могли бы попасть в чужой пакет
+        self.run_on_commit = connection.run_on_commit
+        self.savepoint_ids = list(connection.savepoint_ids)
+
+    def is_current(self, connection):
+        return (
+            connection.in_atomic_block
+            and self.run_on_commit is connection.run_on_commit
+            and self.savepoint_ids == connection.savepoint_ids
+        )
+
+    def flush(self):
+        from .tasks import write_history_records
+
+        batch_size = settings.HISTORY_ASYNC_BATCH_SIZE
+        for start in range(0, len(self.records), batch_size):
+            write_history_records.delay(serializers.serialize("json", self.records[start:start + batch_size]))
+
+
+def enqueue_history_record(history_instance, using):
+    alias = using or router.db_for_write(type(history_instance))
+    connection = connections[alias]
+    batches = getattr(_local, "batches", None)
+    if batches is None:
+        batches = _local.batches = {}
+
+    batch = batches.get(alias)
+    if batch is not None and batch.is_current(connection):
+        batch.records.append(history_instance)
+        return
+
+    batch = HistoryBatch(connection)
+    batch.records.append(history_instance)
+    batches[alias] = batch
+    # Вне транзакции on_commit вызывает flush сразу
+    transaction.on_commit(batch.flush, using=alias)
+
+
+class HistoricalRecords(BaseHistoricalRecords):
+    """
+    Не создает запись "~", если ни одно отслеживаемое поле, кроме полей
+    auto_now, не изменилось относительно последней записи истории объекта
+    (HISTORY_SKIP_UNCHANGED).
+    Проверка стоит одного SELECT по индексу вместо INSERT в таблицу истории.
+
+    При HISTORY_ASYNC запись передается в пакет транзакции (HistoryBatch)
+    вместо сохранения в транзакции запроса (кроме моделей, для которых это
+    невозможно, см. writes_async).
+    """
+
+    def post_save(self, instance, created, using=None, **kwargs):
+        if (
+            not created
+            and not kwargs.get("raw", False)
+            and settings.HISTORY_SKIP_UNCHANGED
+            # При асинхронной записи последняя запись истории может быть еще в очереди
+            and not self.writes_async(instance)
+            and not self.has_changes(instance)
+        ):
+            return
+        super().post_save(instance, created, using=using, **kwargs)
+
+    def has_changes(self, instance):
+        fields = compared_fields(self.fields_included(instance))
+        manager = getattr(instance, self.manager_name)
+        last = manager.order_by("-history_date", "-history_id").values(*fields).first()
+        if last is None:
+            return True
+        return any(last[name] != getattr(instance, name) for name in fields)
+
+    def writes_async(self, instance):
+        """
+        Записи сохраняются после коммита, только если после сохранения записи
+        ничего не нужно делать в транзакции: у модели нет истории m2m-полей
+        (create_historical_record_m2ms) и обработчиков post_create_historical_record.
+        """
+        manager = getattr(instance, self.manager_name)
+        return (
+            settings.HISTORY_ASYNC
+            and not self.get_m2m_fields_from_model(type(instance))
+            and not post_create_historical_record.has_listeners(manager.model)
+        )
+
+    def create_historical_record(self, instance, history_type, using=None):
+        if not self.writes_async(instance):
+            return super().create_historical_record(instance, history_type, using=using)
+
+        # Та же запись, что строит simple_history, но сохраняется после коммита
+        using = using if self.use_base_model_db else None
+        history_date = getattr(instance, "_history_date", timezone.now())
+        history_user = self.get_history_user(instance)
+        history_change_reason = self.get_change_reason_for_object(instance, history_type, using)
+        manager = getattr(instance, self.manager_name)
+        attrs = {field.attname: getattr(instance, field.attname) for field in self.fields_included(instance)}
+        if getattr(manager.model, "history_relation", None) is not None:
+            attrs["history_relation"] = instance
+        history_instance = manager.model(
+            history_date=history_date,
+            history_type=history_type,
+            history_user=history_user,
+            history_change_reason=history_change_reason,
+            **attrs,
+        )
+        pre_create_historical_record.send(
+            sender=manager.model,
+            instance=instance,
+            history_date=history_date,
+            history_user=history_user,
+            history_change_reason=history_change_reason,
+            history_instance=history_instance,
+            using=using,
+        )
+        enqueue_history_record(history_instance, using)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from audit.retention import compact_history
+
+
+class Command(BaseCommand):
+    help = "Удаляет устаревшие и повторяющиеся записи истории изменений по политикам HISTORY_RETENTION"
+
+    def add_arguments(self, parser):
+        parser.add_argument("models", nargs="*", help="Метки моделей, например interviews.Interview")
+        squash = parser.add_mutually_exclusive_group()
+        squash.add_argument(
+            "--squash", action="store_true", default=None, help="Удалить повторяющиеся записи для всех моделей"
+        )
+        squash.add_argument(
+            "--no-squash", action="store_false", dest="squash", help="Не удалять повторяющиеся записи"
+        )
+
+    def handle(self, *args, **options):
+        result = compact_history(labels=options["models"] or None, squash=options["squash"])
+        for label, counts in result.items():
+            self.stdout.write(f"{label}: устаревших {counts['pruned']}, повторяющихся {counts['squashed']}")
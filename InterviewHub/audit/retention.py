@@ -0,0 +1,119 @@
+"""
+Сроки хранения истории изменений simple_history.
+
+Политики задаются в HISTORY_RETENTION по метке модели ("interviews.Interview")
+поверх политики "default":
+
+- days: записи старше указанного числа дней удаляются, кроме последней записи
+  существующего объекта, чтобы его текущее состояние оставалось в истории.
+  None - хранить бессрочно.
+- squash: удалять записи "~", которые не отличаются от предыдущей записи того
+  же объекта (сохранения без изменений до включения HISTORY_SKIP_UNCHANGED).
+
+Все удаления выполняются порциями по HISTORY_PRUNE_CHUNK_SIZE записей.
+"""
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Q
+from django.utils.timezone import now, timedelta
+
+from .history import compared_fields
+
+
+def history_models():
+    """Пары (модель, историческая модель) для всех моделей с HistoricalRecords."""
+    for model in apps.get_models():
+        manager_name = getattr(model._meta, "simple_history_manager_attribute", None)
+        if manager_name:
+            yield model, getattr(model, manager_name).model
+
+
+def retention_policy(model):
+    policies = settings.HISTORY_RETENTION
+    return {**policies["default"], **policies.get(model._meta.label, {})}
+
+
+def prune_history(model, history_model, days, chunk_size):
+    """Удаляет записи истории старше days дней. Возвращает число удаленных записей."""
+    object_pk = model._meta.pk.attname
+    newer = history_model.objects.filter(**{object_pk: OuterRef(object_pk)}).filter(
+        Q(history_date__gt=OuterRef("history_date"))
+        | Q(history_date=OuterRef("history_date"), history_id__gt=OuterRef("history_id"))
+    )
+    # Запись можно удалить, если у объекта есть более новая запись или объекта больше нет
+    # (в том числе удаленного без записи "-", например архивацией отборов)
+    exists = model._default_manager.filter(pk=OuterRef(object_pk))
+    stale = history_model.objects.filter(history_date__lt=now() - timedelta(days=days)).filter(
+        Q(history_type="-") | Exists(newer) | ~Exists(exists)
+    )
+    deleted = 0
+    while True:
+        ids = list(stale.values_list("history_id", flat=True)[:chunk_size])
+        if not ids:
+            return deleted
+        deleted += history_model.objects.filter(history_id__in=ids).delete()[0]
+
+
+def squash_history(model, history_model, chunk_size):
+    """
+    Удаляет записи "~", совпадающие по отслеживаемым полям (кроме полей
+    auto_now) с предыдущей записью объекта. Объекты обрабатываются порциями по chunk_size. Возвращает число
+    удаленных записей.
+    """
+    object_pk = model._meta.pk.attname
+    fields = compared_fields(history_model.tracked_fields)
+    deleted = 0
+    last_pk = None
+    while True:
+        object_pks = history_model.objects.order_by(object_pk).values_list(object_pk, flat=True).distinct()
+        if last_pk is not None:
+            object_pks = object_pks.filter(**{f"{object_pk}__gt": last_pk})
+        object_pks = list(object_pks[:chunk_size])
+        if not object_pks:
+            return deleted
+
+        rows = (
+            history_model.objects.filter(**{f"{object_pk}__in": object_pks})
+            .order_by(object_pk, "history_date", "history_id")
+            .values("history_id", "history_type", *fields)
+        )
+        duplicates = []
+        previous = None
+        for row in rows.iterator(chunk_size=2000):
+            if (
+                previous is not None
+                and row["history_type"] == "~"
+                and previous[object_pk] == row[object_pk]
+                and all(previous[name] == row[name] for name in fields)
+            ):
+                duplicates.append(row["history_id"])
+                continue
+            previous = row
+        for start in range(0, len(duplicates), chunk_size):
+            deleted += history_model.objects.filter(
+                history_id__in=duplicates[start:start + chunk_size]
+            ).delete()[0]
+        last_pk = object_pks[-1]
+
+
+def compact_history(labels=None, squash=None):
+    """
+    Применяет политики хранения ко всем моделям с историей (или к моделям
+    из labels). squash=True/False переопределяет настройку squash политик.
+    Возвращает {метка модели: {"pruned": N, "squashed": M}}.
+    """
+    chunk_size = settings.HISTORY_PRUNE_CHUNK_SIZE
+    result = {}
+    for model, history_model in history_models():
+        label = model._meta.label
+        if labels and label not in labels:
+            continue
+        policy = retention_policy(model)
+        pruned = squashed = 0
+        if policy["days"] is not None:
+            pruned = prune_history(model, history_model, policy["days"], chunk_size)
+        if policy["squash"] if squash is None else squash:
+            squashed = squash_history(model, history_model, chunk_size)
+        result[label] = {"pruned": pruned, "squashed": squashed}
+    return result
@@ -0,0 +1,31 @@
+import logging
+from collections import defaultdict
+
+from celery import shared_task
+from django.core import serializers
+from django.db import DatabaseError
+
+from .retention import compact_history
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def compact_history_tables():
+    """Применяет политики хранения HISTORY_RETENTION к таблицам истории."""
+    result = compact_history()
+    for label, counts in result.items():
+        if counts["pruned"] or counts["squashed"]:
+            logger.info("История %s: удалено устаревших %s, повторяющихся %s", label, counts["pruned"], counts["squashed"])
+    return result
+
+
+@shared_task(autoretry_for=(DatabaseError,), retry_backoff=True, max_retries=5)
+def write_history_records(payload):
+    """Сохраняет записи истории, накопленные при HISTORY_ASYNC (audit.history.HistoryBatch)."""
+    records = defaultdict(list)
+    for deserialized in serializers.deserialize("json", payload):
+        records[type(deserialized.object)].append(deserialized.object)
+    for history_model, objects in records.items():
+        history_model.objects.bulk_create(objects)
+    return sum(len(objects) for objects in records.values())
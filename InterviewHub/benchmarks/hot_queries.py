@@ -0,0 +1,98 @@
+"""
+Реестр "горячих" запросов проекта и индексов, на которые они рассчитаны.
+Используется командой explain_hot_queries.
+
+Запросы повторяют фильтры и сортировки из views и задач Celery. При
+изменении запроса в коде его копию здесь нужно обновить.
+"""
+
+from collections import namedtuple
+from datetime import timedelta
+
+from django.utils import timezone
+
+from interviews.models import Interview
+from resumes.models import Resume
+from selections.models import CompanySelection
+from users.models import Candidate
+
+HotQuery = namedtuple("HotQuery", ["name", "source", "index", "build"])
+
+HOT_QUERIES = [
+    HotQuery(
+        "interview-by-status",
+        "InterviewViewSet.get_by_status",
+        "interview_status_start_idx",
+        lambda: Interview.objects.filter(status="Запланировано").order_by("-start_time")[:10],
+    ),
+    HotQuery(
+        "interview-reminder-due",
+        "interviews.tasks.send_interview_reminder",
+        "interview_reminder_due_idx",
+        lambda: Interview.objects.filter(
+            reminder_sent_at__isnull=True,
+            start_time__gt=timezone.now() + timedelta(minutes=50),
+            start_time__lte=timezone.now() + timedelta(hours=1),
+        ).order_by("start_time", "id")[:200],
+    ),
+    HotQuery(
+        "interview-feed-cursor",
+        "InterviewViewSet.list?cursor=",
+        "interview_start_id_idx",
+        lambda: Interview.objects.filter(start_time__lt=timezone.now()).order_by("-start_time", "-id")[:11],
+    ),
+    HotQuery(
+        "selection-by-status",
+        "CompanySelectionViewSet.practical_filter",
+        "selection_status_created_idx",
+        lambda: CompanySelection.objects.filter(status="На рассмотрении").order_by("-created_at")[:10],
+    ),
+    HotQuery(
+        "selection-feed",
+        "CompanySelectionViewSet.list",
+        "selection_created_id_idx",
+        lambda: CompanySelection.objects.order_by("-created_at", "-id")[:11],
+    ),
+    HotQuery(
+        "selection-email-search",
+        "CompanySelectionViewSet.list?search=",
+        "selection_cand_email_idx",
+        lambda: CompanySelection.objects.filter(candidate_email__startswith="ivanov"),
+    ),
+    HotQuery(
+        "interview-email-search",
+        "InterviewViewSet.list?search=",
+        "interview_intv_email_idx",
+        lambda: Interview.objects.filter(interviewer_email__startswith="ivanov"),
+    ),
+    HotQuery(
+        "selection-archive",
+        "selections.tasks.archive_rejected_company_selections",
+        "selection_rejected_id_idx",
+        lambda: CompanySelection.objects.filter(
+            status="Отклонен", created_at__lt=timezone.now() - timedelta(days=180), id__gt=0
+        )
+        .order_by("id")
+        .values_list("id", flat=True)[:500],
+    ),
+    HotQuery(
+        "resume-by-date",
+        "ResumeViewSet.filter_by_date",
+        "resume_created_at_idx",
+        lambda: Resume.objects.filter(
+            created_at__range=(timezone.now() - timedelta(days=7), timezone.now())
+        ),
+    ),
+    HotQuery(
+        "resume-by-salary",
+        "ResumeFilter.max_salary",
+        "resume_desired_salary_idx",
+        lambda: Resume.objects.filter(desired_salary__lte=150000),
+    ),
+    HotQuery(
+        "candidate-by-city",
+        "CandidateViewSet.count_by_city",
+        "candidate_city_idx",
+        lambda: Candidate.objects.filter(city="Москва").values("id"),
+    ),
+]
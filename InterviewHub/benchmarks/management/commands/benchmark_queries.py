@@ -0,0 +1,211 @@
+"""
+Бенчмарк количества SQL-запросов и времени ответа эндпоинтов API.
+
+Команда создает тестовую базу данных (как manage.py test), наполняет ее
+данными через benchmarks.seed, выполняет сценарии из benchmarks.scenarios
+и сравнивает результаты с базовым уровнем benchmarks/baseline.json.
+Рост количества запросов считается регрессией и завершает команду с ошибкой,
+замедление сверх допуска выводится как предупреждение.
+Та же проверка количества запросов без замеров времени выполняется
+тестами benchmarks.tests (manage.py test benchmarks).
+
+Внешние сервисы не нужны: кэш подменяется на локальный, middleware,
+пишущие в Redis, отключаются. Работает на SQLite (DB_ENGINE=sqlite в .env)
+и на локальном PostgreSQL. Перед запуском должны быть созданы миграции
+(manage.py makemigrations).
+
+    python manage.py benchmark_queries
+    python manage.py benchmark_queries --scale 3 --only company-selection
+    python manage.py benchmark_queries --update-baseline
+"""
+
+import json
+import statistics
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+    setup_databases,
+    teardown_databases,
+)
+from rest_framework.test import APIClient
+
+from benchmarks import scenarios, seed
+from users.models import User
+
+DEFAULT_BASELINE = Path(__file__).resolve().parents[2] / "baseline.json"
+
+# Middleware, которым для работы нужен Redis
+REDIS_MIDDLEWARE = (
+    "InterviewHub.metrics.MetricsMiddleware",
+    "InterviewHub.logging_middleware.LoggingMiddleware",
+)
+
+
+class Command(BaseCommand):
+    help = "Измеряет количество SQL-запросов и время ответа эндпоинтов API и сравнивает с базовым уровнем"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=int, default=1, help="Множитель объема данных")
+        parser.add_argument("--repeat", type=int, default=5, help="Количество замеров времени на сценарий")
+        parser.add_argument("--only", help="Выполнить только сценарии, имя которых содержит подстроку")
+        parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Путь к файлу базового уровня")
+        parser.add_argument(
+            "--update-baseline", action="store_true", help="Записать результаты как новый базовый уровень"
+        )
+        parser.add_argument(
+            "--latency-tolerance",
+            type=float,
+            default=1.5,
+            help="Допустимое отношение медианы времени ответа к базовому уровню",
+        )
+        parser.add_argument(
+            "--latency-min-delta",
+            type=float,
+            default=5.0,
+            help="Минимальный прирост медианы времени ответа в мс, считающийся замедлением",
+        )
+        parser.add_argument("--output", help="Сохранить отчет в JSON-файл")
+
+    def handle(self, *args, **options):
+        selected = [
+            scenario
+            for scenario in scenarios.SCENARIOS
+            if not options["only"] or options["only"] in scenario.name
+        ]
+        if not selected:
+            raise CommandError("Нет сценариев, подходящих под --only.")
+
+        middleware = [name for name in settings.MIDDLEWARE if name not in REDIS_MIDDLEWARE]
+        isolated = override_settings(
+            CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+            MIDDLEWARE=middleware,
+            REQUEST_METRICS_ENABLED=False,
+            ALLOWED_HOSTS=["*"],
+            DEBUG=False,
+        )
+
+        with isolated:
+            old_config = setup_databases(verbosity=0, interactive=False)
+            try:
+                started = time.perf_counter()
+                counts = seed.seed(scale=options["scale"])
+                self.stdout.write(
+                    f"Данные созданы за {time.perf_counter() - started:.1f} с: "
+                    + ", ".join(f"{name}={count}" for name, count in counts.items())
+                )
+                results = self.run_scenarios(selected, options["repeat"])
+            finally:
+                teardown_databases(old_config, verbosity=0)
+
+        baseline_path = Path(options["baseline"])
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else None
+        report = self.compare(results, baseline, options)
+
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+        if options["update_baseline"]:
+            stored = baseline["scenarios"] if baseline and baseline.get("scale") == options["scale"] else {}
+            stored.update(results)
+            baseline_path.write_text(
+                json.dumps(
+                    {"scale": options["scale"], "vendor": connection.vendor, "scenarios": stored},
+                    ensure_ascii=False,
+                    indent=2,
+                    sort_keys=True,
+                )
+                + "\n",
+                encoding="utf-8",
+            )
+            self.stdout.write(self.style.SUCCESS(f"Базовый уровень сохранен в {baseline_path}"))
+            return
+
+        regressions = [name for name, row in report["scenarios"].items() if row["verdict"] == "regression"]
+        if regressions:
+            raise CommandError(f"Рост количества запросов: {', '.join(regressions)}")
+
+    def run_scenarios(self, selected, repeat):
+        client = APIClient()
+        client.force_authenticate(
+            User.objects.create_superuser(username="benchmark", email="benchmark@example.com", password="benchmark")
+        )
+
+        results = {}
+        for scenario in selected:
+            url = scenarios.resolve_url(scenario)
+            # Прогревочный запрос не замеряется: разовая инициализация в процессе
+            # (например, индекс поиска в памяти) не считается запросом эндпоинта
+            cache.clear()
+            response = client.get(url, scenario.params)
+            if response.status_code >= 400:
+                raise CommandError(f"{scenario.name}: {url} вернул {response.status_code}")
+
+            timings = []
+            queries = []
+            for _ in range(repeat):
+                # Каждый замер выполняется с пустым кэшем, чтобы измерять обращения к БД
+                cache.clear()
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    response = client.get(url, scenario.params)
+                    timings.append((time.perf_counter() - started) * 1000)
+                if response.status_code >= 400:
+                    raise CommandError(f"{scenario.name}: {url} вернул {response.status_code}")
+                queries.append(len(captured))
+
+            results[scenario.name] = {
+                # Худший из замеров: лишний запрос в любом из повторов - регрессия
+                "queries": max(queries),
+                "median_ms": round(statistics.median(timings), 2),
+            }
+        return results
+
+    def compare(self, results, baseline, options):
+        baseline_scenarios = {}
+        if baseline:
+            if baseline.get("scale") != options["scale"]:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Базовый уровень снят при scale={baseline.get('scale')}, время ответа не сравнивается"
+                    )
+                )
+            baseline_scenarios = baseline.get("scenarios", {})
+
+        rows = {}
+        self.stdout.write(f"{'Сценарий':<45}{'Запросы':>10}{'База':>8}{'мс':>10}{'База, мс':>10}  Итог")
+        for name, result in results.items():
+            base = baseline_scenarios.get(name)
+            verdict = "ok"
+            if base is None:
+                verdict = "new"
+            elif result["queries"] > base["queries"]:
+                verdict = "regression"
+            elif result["queries"] < base["queries"]:
+                verdict = "improved"
+            elif (
+                baseline.get("scale") == options["scale"]
+                and result["median_ms"] > base["median_ms"] * options["latency_tolerance"]
+                and result["median_ms"] - base["median_ms"] > options["latency_min_delta"]
+            ):
+                verdict = "slower"
+            rows[name] = {**result, "baseline": base, "verdict": verdict}
+
+            style = {
+                "regression": self.style.ERROR,
+                "slower": self.style.WARNING,
+                "improved": self.style.SUCCESS,
+            }.get(verdict, str)
+            self.stdout.write(
+                style(
+                    f"{name:<45}{result['queries']:>10}{base['queries'] if base else '-':>8}"
+                    f"{result['median_ms']:>10.1f}{base['median_ms'] if base else '-':>10}  {verdict}"
+                )
+            )
+        return {"scale": options["scale"], "vendor": connection.vendor, "scenarios": rows}
@@ -0,0 +1,61 @@
+"""
+Выводит планы выполнения (EXPLAIN) запросов из benchmarks.hot_queries и
+проверяет, что каждый из них использует предназначенный для него индекс.
+
+На маленьких таблицах PostgreSQL предпочитает последовательное сканирование,
+поэтому для проверки применимости индексов на тестовых данных есть
+--no-seqscan (SET enable_seqscan = off на время команды).
+
+    python manage.py explain_hot_queries
+    python manage.py explain_hot_queries --analyze --only selection
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from benchmarks.hot_queries import HOT_QUERIES
+
+
+class Command(BaseCommand):
+    help = "Показывает EXPLAIN для горячих запросов и проверяет использование индексов"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--only", help="Только запросы, имя которых содержит подстроку")
+        parser.add_argument("--analyze", action="store_true", help="EXPLAIN ANALYZE (только PostgreSQL)")
+        parser.add_argument(
+            "--no-seqscan",
+            action="store_true",
+            help="Запретить последовательное сканирование (только PostgreSQL)",
+        )
+        parser.add_argument("--quiet", action="store_true", help="Не выводить планы, только итог")
+
+    def handle(self, *args, **options):
+        postgres = connection.vendor == "postgresql"
+        if (options["analyze"] or options["no_seqscan"]) and not postgres:
+            raise CommandError("--analyze и --no-seqscan поддерживаются только для PostgreSQL.")
+
+        queries = [query for query in HOT_QUERIES if not options["only"] or options["only"] in query.name]
+        missing = []
+
+        # SET LOCAL действует до конца транзакции, поэтому настройки не выходят за пределы команды
+        with transaction.atomic():
+            if options["no_seqscan"]:
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+
+            for query in queries:
+                explain_options = {"analyze": True} if options["analyze"] else {}
+                plan = query.build().explain(**explain_options)
+                uses_index = query.index in plan
+
+                style = self.style.SUCCESS if uses_index else self.style.WARNING
+                verdict = "индекс используется" if uses_index else "индекс НЕ используется"
+                self.stdout.write(style(f"{query.name} ({query.source}): {query.index} - {verdict}"))
+                if not options["quiet"]:
+                    self.stdout.write(plan)
+                    self.stdout.write("")
+                if not uses_index:
+                    missing.append(query.name)
+
+        if missing:
+            self.stdout.write(self.style.WARNING(f"Без индекса: {', '.join(missing)}"))
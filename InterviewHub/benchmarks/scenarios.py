@@ -0,0 +1,87 @@
+"""
+Сценарии бенчмарка: GET-запросы к list/retrieve и пользовательским
+действиям всех ViewSet проекта.
+
+Имя сценария совпадает с именем маршрута, если маршрут не задан отдельно
+в route; по имени сравниваются результаты с сохраненным базовым уровнем.
+Аргументы маршрута вычисляются после наполнения базы, поэтому задаются
+функциями.
+"""
+
+from collections import namedtuple
+
+from django.urls import reverse
+
+from interviews.models import Interview, InterviewTaskItem
+from resumes.models import JobExperience, Resume, Skill
+from selections.models import CompanySelection
+from tasks.models import CodeQuestion, MultipleChoiceQuestion, OpenQuestion, TaskItem
+from test_tasks.models import TestTask, TestTaskItem
+from users.models import Candidate, Company, Interviewer
+
+Scenario = namedtuple("Scenario", ["name", "kwargs", "params", "route"], defaults=[None])
+
+
+def first_pk(model):
+    return lambda: {"pk": model.objects.order_by("pk").values_list("pk", flat=True).first()}
+
+
+def interview_with_tasks():
+    return {"pk": InterviewTaskItem.objects.order_by("pk").values_list("interview_id", flat=True).first()}
+
+
+def no_kwargs():
+    return {}
+
+
+def detail_scenarios(basename, model):
+    return [
+        Scenario(f"{basename}-list", no_kwargs, {}),
+        Scenario(f"{basename}-detail", first_pk(model), {}),
+    ]
+
+
+SCENARIOS = [
+    # users
+    Scenario("user-current-user", no_kwargs, {}),
+    *detail_scenarios("candidates", Candidate),
+    Scenario("candidates-count-by-city", no_kwargs, {"city": "Москва"}),
+    *detail_scenarios("companies", Company),
+    *detail_scenarios("interviews", Interviewer),
+    # resumes
+    *detail_scenarios("resume", Resume),
+    Scenario("resume-filter-by-date", no_kwargs, {}),
+    Scenario(
+        "resume-filter-by-salary-and-experience",
+        no_kwargs,
+        {"desired_salary": 300000, "days_since_posted": 30, "min_job_experience_companies": 2},
+    ),
+    *detail_scenarios("skill", Skill),
+    *detail_scenarios("jobexperience", JobExperience),
+    # selections
+    *detail_scenarios("company-selection", CompanySelection),
+    Scenario("company-selection-practical-filter", no_kwargs, {"status": "На рассмотрении,Принят"}),
+    Scenario("company-selection-exclude-by-status", no_kwargs, {"exclude_status": "Отклонен"}),
+    Scenario("company-selection-search", no_kwargs, {"search": "bench_user_1"}, "company-selection-list"),
+    # interviews
+    *detail_scenarios("interview", Interview),
+    Scenario("interview-get-tasks", interview_with_tasks, {}),
+    Scenario("interview-get-by-status", lambda: {"status": "Запланировано"}, {}),
+    Scenario("interview-search", no_kwargs, {"search": "bench_user_1"}, "interview-list"),
+    Scenario("interview-duration-by-status", no_kwargs, {}),
+    *detail_scenarios("interview-task", InterviewTaskItem),
+    # tasks
+    *detail_scenarios("taskitem", TaskItem),
+    Scenario("taskitem-filter-by-complexity", no_kwargs, {"complexity": 3}),
+    Scenario("taskitem-search-by-keyword", no_kwargs, {"keyword": "функцию"}),
+    *detail_scenarios("openquestion", OpenQuestion),
+    *detail_scenarios("multiplechoicequestion", MultipleChoiceQuestion),
+    *detail_scenarios("codequestion", CodeQuestion),
+    # test_tasks
+    *detail_scenarios("test-task", TestTask),
+    *detail_scenarios("test-task-item", TestTaskItem),
+]
+
+
+def resolve_url(scenario):
+    return reverse(scenario.route or scenario.name, kwargs=scenario.kwargs())
@@ -0,0 +1,205 @@
+"""
+Наполнение базы данными реалистичного объема для бенчмарков.
+
+Все объекты создаются через bulk_create, поэтому записи истории
+(simple_history) и сигналы моделей при наполнении не создаются.
+При scale=1 создается около 2000 отборов кандидатов, 1000 интервью
+и 500 резюме с 10 навыками и 3 местами работы в каждом.
+"""
+
+import random
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from interviews.models import Interview, InterviewTaskItem
+from resumes.models import JobExperience, Resume, Skill
+from selections.models import CompanySelection
+from tasks.models import CodeQuestion, MultipleChoiceQuestion, OpenQuestion, TaskItem
+from test_tasks.models import TestTask, TestTaskItem
+from users.models import Candidate, Company, Interviewer, User
+
+CITIES = ["Москва", "Санкт-Петербург", "Казань", "Новосибирск", "Екатеринбург"]
+POSITIONS = ["Backend-разработчик", "Frontend-разработчик", "Аналитик", "QA-инженер", "DevOps"]
+
+
+def _volumes(scale):
+    return {
+        "companies": 20 * scale,
+        "interviewers": 50 * scale,
+        "candidates": 500 * scale,
+        "skills": 100,
+        "skills_per_resume": 10,
+        "jobs_per_candidate": 3,
+        "selections": 2000 * scale,
+        "interviews": 1000 * scale,
+        "task_items": 200,
+        "interviews_with_tasks": 100 * scale,
+        "tasks_per_interview": 10,
+        "test_tasks": 200 * scale,
+        "items_per_test_task": 5,
+    }
+
+
+def seed(scale=1, random_seed=0):
+    """
+    Создает данные для бенчмарков. Возвращает словарь с количеством
+    созданных объектов по типам.
+    """
+    rnd = random.Random(random_seed)
+    volumes = _volumes(scale)
+    now = timezone.now()
+    password = make_password("benchmark")
+
+    companies = Company.objects.bulk_create(
+        Company(name=f"Компания {i}", location=rnd.choice(CITIES))
+        for i in range(volumes["companies"])
+    )
+
+    users = User.objects.bulk_create(
+        User(
+            username=f"bench_user_{i}",
+            email=f"bench_user_{i}@example.com",
+            first_name=f"Имя{i}",
+            last_name=f"Фамилия{i}",
+            password=password,
+        )
+        for i in range(volumes["interviewers"] + volumes["candidates"])
+    )
+    interviewer_users = users[: volumes["interviewers"]]
+    candidate_users = users[volumes["interviewers"]:]
+
+    interviewers = Interviewer.objects.bulk_create(
+        Interviewer(user=user, company=rnd.choice(companies), position=rnd.choice(POSITIONS))
+        for user in interviewer_users
+    )
+    candidates = Candidate.objects.bulk_create(
+        Candidate(user=user, city=rnd.choice(CITIES)) for user in candidate_users
+    )
+
+    skills = Skill.objects.bulk_create(
+        Skill(name=f"Навык {i}") for i in range(volumes["skills"])
+    )
+    jobs = JobExperience.objects.bulk_create(
+        JobExperience(
+            company=f"Работодатель {rnd.randrange(100)}",
+            position=rnd.choice(POSITIONS),
+            start_date=date(2015, 1, 1) + timedelta(days=rnd.randrange(3000)),
+            responsibilities="Разработка и сопровождение сервисов",
+            candidate=candidate,
+        )
+        for candidate in candidates
+        for _ in range(volumes["jobs_per_candidate"])
+    )
+    resumes = Resume.objects.bulk_create(
+        Resume(
+            candidate=candidate,
+            desired_position=rnd.choice(POSITIONS),
+            desired_salary=rnd.randrange(50, 500) * 1000,
+        )
+        for candidate in candidates
+    )
+    Resume.skills.through.objects.bulk_create(
+        Resume.skills.through(resume_id=resume.pk, skill_id=skill.pk)
+        for resume in resumes
+        for skill in rnd.sample(skills, volumes["skills_per_resume"])
+    )
+    jobs_by_candidate = {}
+    for job in jobs:
+        jobs_by_candidate.setdefault(job.candidate_id, []).append(job)
+    Resume.job_experiences.through.objects.bulk_create(
+        Resume.job_experiences.through(resume_id=resume.pk, jobexperience_id=job.pk)
+        for resume in resumes
+        for job in jobs_by_candidate[resume.candidate_id]
+    )
+
+    statuses = [choice for choice, _ in CompanySelection.selection_status_choices]
+    selections = []
+    for _ in range(volumes["selections"]):
+        interviewer, resume = rnd.choice(interviewers), rnd.choice(resumes)
+        selections.append(
+            CompanySelection(
+                interviewer=interviewer,
+                resume=resume,
+                status=rnd.choice(statuses),
+                # bulk_create не вызывает сигналы, поля поиска заполняются здесь
+                candidate_email=resume.candidate.user.email.lower(),
+                interviewer_email=interviewer.user.email.lower(),
+            )
+        )
+    selections = CompanySelection.objects.bulk_create(selections)
+
+    interview_statuses = [choice for choice, _ in Interview.interview_status_choices]
+    interviews = []
+    for selection in selections[: volumes["interviews"]]:
+        start_time = now + timedelta(hours=rnd.randrange(-24 * 60, 24 * 30))
+        interviews.append(
+            Interview(
+                selection=selection,
+                start_time=start_time,
+                end_time=start_time + timedelta(minutes=60),
+                duration=60,
+                type="Техническое",
+                status=rnd.choice(interview_statuses),
+                candidate_email=selection.candidate_email,
+                interviewer_email=selection.interviewer_email,
+            )
+        )
+    interviews = Interview.objects.bulk_create(interviews)
+
+    task_items = TaskItem.objects.bulk_create(
+        TaskItem(
+            title=f"Задание {i}",
+            complexity=rnd.randrange(1, 6),
+            task_condition=f"Условие задания {i}: реализуйте функцию обработки данных",
+        )
+        for i in range(volumes["task_items"])
+    )
+    OpenQuestion.objects.bulk_create(
+        OpenQuestion(task_item=task_item, correct_answer=f"Ответ {task_item.pk}")
+        for task_item in task_items
+    )
+    MultipleChoiceQuestion.objects.bulk_create(
+        MultipleChoiceQuestion(task_item=task_item, answer_text=f"Вариант {k}", is_correct_answer=k == 0)
+        for task_item in task_items
+        for k in range(4)
+    )
+    CodeQuestion.objects.bulk_create(
+        CodeQuestion(task_item=task_item, input_data="1 2", output_data="3")
+        for task_item in task_items
+    )
+    InterviewTaskItem.objects.bulk_create(
+        InterviewTaskItem(interview=interview, task_item=task_item, candidate_answer="Ответ кандидата")
+        for interview in interviews[: volumes["interviews_with_tasks"]]
+        for task_item in rnd.sample(task_items, volumes["tasks_per_interview"])
+    )
+
+    test_tasks = []
+    for selection in selections[: volumes["test_tasks"]]:
+        start_time = now - timedelta(days=rnd.randrange(30))
+        test_tasks.append(
+            TestTask(
+                selection=selection,
+                start_time=start_time,
+                end_time=start_time + timedelta(minutes=90),
+                duration=90,
+            )
+        )
+    test_tasks = TestTask.objects.bulk_create(test_tasks)
+    TestTaskItem.objects.bulk_create(
+        TestTaskItem(test_task=test_task, task_item=task_item, candidate_answer="Ответ кандидата")
+        for test_task in test_tasks
+        for task_item in rnd.sample(task_items, volumes["items_per_test_task"])
+    )
+
+    return {
+        "companies": len(companies),
+        "interviewers": len(interviewers),
+        "candidates": len(candidates),
+        "resumes": len(resumes),
+        "selections": len(selections),
+        "interviews": len(interviews),
+        "task_items": len(task_items),
+        "test_tasks": len(test_tasks),
+    }
@@ -0,0 +1,52 @@
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from users.models import User
+
+from . import scenarios, seed
+from .management.commands.benchmark_queries import DEFAULT_BASELINE, REDIS_MIDDLEWARE
+
+BASELINE = json.loads(DEFAULT_BASELINE.read_text(encoding="utf-8"))
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    MIDDLEWARE=[name for name in settings.MIDDLEWARE if name not in REDIS_MIDDLEWARE],
+    REQUEST_METRICS_ENABLED=False,
+)
+class QueryCountTests(TestCase):
+    """
+    Количество SQL-запросов сценариев не превышает базовый уровень.
+    Время ответа здесь не проверяется: для него есть команда benchmark_queries.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        seed.seed(scale=BASELINE["scale"])
+        cls.user = User.objects.create_superuser(
+            username="benchmark", email="benchmark@example.com", password="benchmark"
+        )
+
+    def test_queries_within_baseline(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        for scenario in scenarios.SCENARIOS:
+            base = BASELINE["scenarios"].get(scenario.name)
+            if base is None:
+                continue
+            with self.subTest(scenario=scenario.name):
+                url = scenarios.resolve_url(scenario)
+                # Прогревочный запрос, как в команде: разовая инициализация не считается
+                cache.clear()
+                client.get(url, scenario.params)
+                cache.clear()
+                with CaptureQueriesContext(connection) as captured:
+                    response = client.get(url, scenario.params)
+                self.assertLess(response.status_code, 400)
+                self.assertLessEqual(len(captured), base["queries"])
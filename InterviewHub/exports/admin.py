@@ -0,0 +1,161 @@
+import os
+
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import path, reverse
+from django.utils.html import format_html
+from django.utils.timezone import now
+
+from .models import ExportJob
+from .streaming import export_response
+from .tasks import run_export_job
+
+
+class StreamingExportMixin:
+    """
+    Действия админки для выгрузки выбранных объектов. CSV и JSONL отдаются
+    потоково в ответе (exports.streaming), XLSX и большие CSV - через фоновую
+    задачу выгрузки (ExportJob), чтобы не занимать веб-воркер. Кнопка
+    "Экспорт" ImportExportModelAdmin, собирающая файл в памяти, тоже ставит
+    фоновую задачу выгрузки в XLSX: форма выбора формата не показывается,
+    CSV и JSONL выгружаются действиями списка.
+    Используется ресурс resource_class и выборка get_export_queryset админки.
+    """
+
+    actions = ["stream_export_csv", "stream_export_jsonl", "background_export_csv", "background_export_xlsx"]
+
+    def get_selected_ids(self, request):
+        """
+        Первичные ключи объектов, отмеченных на странице списка, или None, если
+        выбраны все объекты по фильтрам (select_across).
+        """
+        if request.POST.get("select_across", "0") == "1":
+            return None
+        return request.POST.getlist(helpers.ACTION_CHECKBOX_NAME)
+
+    def stream_export(self, request, queryset, file_format):
+        # Та же выборка, что у фоновой выгрузки: фильтры списка, ограничения
+        # get_export_queryset и отмеченные объекты
+        queryset = self.get_export_queryset(request)
+        selected_ids = self.get_selected_ids(request)
+        if selected_ids is not None:
+            queryset = queryset.filter(pk__in=selected_ids)
+        resource = self.resource_class()
+        filename = f"{self.model._meta.model_name}-{now():%Y%m%d-%H%M%S}"
+        return export_response(resource, queryset, file_format, filename)
+
+    def create_export_job(self, request, file_format, object_ids=None):
+        # Сохраняются параметры списка, а не первичные ключи: выборка строится
+        # заново в задаче, размер задачи не зависит от числа объектов
+        job = ExportJob.objects.create(
+            resource=f"{self.resource_class.__module__}.{self.resource_class.__qualname__}",
+            file_format=file_format,
+            filters=dict(request.GET.lists()),
+            object_ids=object_ids,
+            created_by=request.user,
+        )
+        transaction.on_commit(lambda: run_export_job.delay(job.pk))
+        url = reverse("admin:exports_exportjob_change", args=[job.pk])
+        self.message_user(
+            request,
+            format_html('Выгрузка поставлена в очередь: <a href="{}">{}</a>', url, job),
+            messages.SUCCESS,
+        )
+        return job
+
+    def background_export(self, request, queryset, file_format):
+        self.create_export_job(request, file_format, self.get_selected_ids(request))
+
+    def export_action(self, request):
+        if not self.has_export_permission(request):
+            raise PermissionDenied
+        self.create_export_job(request, "xlsx")
+        changelist_url = reverse(f"admin:{self.opts.app_label}_{self.opts.model_name}_changelist")
+        return redirect(f"{changelist_url}?{request.GET.urlencode()}" if request.GET else changelist_url)
+
+    @admin.action(description="Выгрузить выбранные в CSV (потоково)", permissions=["export"])
+    def stream_export_csv(self, request, queryset):
+        return self.stream_export(request, queryset, "csv")
+
+    @admin.action(description="Выгрузить выбранные в JSONL (потоково)", permissions=["export"])
+    def stream_export_jsonl(self, request, queryset):
+        return self.stream_export(request, queryset, "jsonl")
+
+    @admin.action(description="Выгрузить выбранные в CSV (в фоне)", permissions=["export"])
+    def background_export_csv(self, request, queryset):
+        return self.background_export(request, queryset, "csv")
+
+    @admin.action(description="Выгрузить выбранные в XLSX (в фоне)", permissions=["export"])
+    def background_export_xlsx(self, request, queryset):
+        return self.background_export(request, queryset, "xlsx")
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "resource",
+        "file_format",
+        "status",
+        "progress_display",
+        "download_link",
+        "created_by",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("status", "resource", "file_format")
+    readonly_fields = (
+        "status",
+        "total_rows",
+        "processed_rows",
+        "download_link",
+        "errors",
+        "created_by",
+        "created_at",
+        "finished_at",
+    )
+
+    def get_readonly_fields(self, request, obj=None):
+        # Тип данных и формат задаются только при создании задачи
+        if obj is not None:
+            return ("resource", "file_format") + self.readonly_fields
+        return self.readonly_fields
+
+    def get_urls(self):
+        return [
+            path(
+                "<int:pk>/download/",
+                self.admin_site.admin_view(self.download_view),
+                name="exports_exportjob_download",
+            ),
+        ] + super().get_urls()
+
+    def download_view(self, request, pk):
+        job = get_object_or_404(ExportJob, pk=pk)
+        if not self.has_view_permission(request, job):
+            raise PermissionDenied
+        if job.status != "done" or not job.file:
+            raise Http404("Файл выгрузки еще не готов")
+        return FileResponse(job.file.open("rb"), as_attachment=True, filename=os.path.basename(job.file.name))
+
+    @admin.display(description="Прогресс")
+    def progress_display(self, obj):
+        return f"{obj.progress}%"
+
+    @admin.display(description="Файл")
+    def download_link(self, obj):
+        if obj.status != "done" or not obj.file:
+            return "-"
+        return format_html('<a href="{}">Скачать</a>', reverse("admin:exports_exportjob_download", args=[obj.pk]))
+
+    def save_model(self, request, obj, form, change):
+        # Задача, созданная в админке, выгружает все объекты
+        if not change:
+            obj.created_by = request.user
+        super().save_model(request, obj, form, change)
+        if not change:
+            transaction.on_commit(lambda: run_export_job.delay(obj.pk))
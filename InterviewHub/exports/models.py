@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import AnonymousUser
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from django.http import HttpRequest, QueryDict
+from django.utils.module_loading import import_string
+
+
+def export_storage():
+    # Выгрузки содержат персональные данные и отдаются только через админку
+    return FileSystemStorage(location=settings.PRIVATE_MEDIA_ROOT)
+
+
+class ExportJob(models.Model):
+    resource_choices = [
+        ("interviews.resources.InterviewResource", "Интервью"),
+        ("interviews.resources.InterviewTaskItemResource", "Задания интервью"),
+        ("test_tasks.resources.TestTaskResource", "Тестовые задания"),
+        ("test_tasks.resources.TestTaskItemResource", "Элементы тестовых заданий"),
+    ]
+    file_format_choices = [("csv", "CSV"), ("jsonl", "JSONL"), ("xlsx", "XLSX")]
+    status_choices = [
+        ("pending", "В очереди"),
+        ("running", "Выполняется"),
+        ("done", "Завершен"),
+        ("failed", "Ошибка"),
+    ]
+
+    resource = models.CharField(max_length=100, choices=resource_choices, verbose_name="Данные")
+    file_format = models.CharField(max_length=10, choices=file_format_choices, default="xlsx", verbose_name="Формат")
+    # Параметры строки запроса списка в админке (фильтры, поиск), по которым объекты
+    # отбираются заново при выгрузке; пусто - выгружаются все объекты
+    filters = models.JSONField(default=dict, blank=True, editable=False, verbose_name="Фильтры списка")
+    # Первичные ключи объектов, отмеченных на одной странице списка (не больше
+    # list_max_show_all); пусто - выгружаются все объекты по фильтрам
+    object_ids = models.JSONField(null=True, blank=True, editable=False, verbose_name="Выбранные объекты")
+    file = models.FileField(
+        upload_to="exports/%Y/%m/", storage=export_storage, blank=True, editable=False, verbose_name="Файл"
+    )
+    status = models.CharField(max_length=20, choices=status_choices, default="pending", verbose_name="Статус")
+    total_rows = models.PositiveIntegerField(default=0, verbose_name="Всего строк")
+    processed_rows = models.PositiveIntegerField(default=0, verbose_name="Выгружено строк")
+    errors = models.TextField(blank=True, default="", verbose_name="Ошибки")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        verbose_name="Автор",
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Создан")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Завершен")
+
+    class Meta:
+        verbose_name = "Задача выгрузки"
+        verbose_name_plural = "Задачи выгрузки"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.get_resource_display()} #{self.pk}"
+
+    @property
+    def progress(self):
+        if not self.total_rows:
+            return 0
+        return round(self.processed_rows * 100 / self.total_rows)
+
+    def get_resource(self):
+        return import_string(self.resource)()
+
+    def get_queryset(self, resource):
+        """
+        Объекты выгрузки: get_export_queryset админки модели (фильтры списка и
+        ограничения выгрузки) по сохраненным параметрам запроса.
+        """
+        request = HttpRequest()
+        request.method = "GET"
+        request.GET = QueryDict(mutable=True)
+        for key, values in self.filters.items():
+            request.GET.setlist(key, values)
+        request.user = self.created_by or AnonymousUser()
+        queryset = admin.site.get_model_admin(resource._meta.model).get_export_queryset(request)
+        if self.object_ids is not None:
+            queryset = queryset.filter(pk__in=self.object_ids)
+        return queryset.order_by("pk")
@@ -0,0 +1,68 @@
+import logging
+import tempfile
+import time
+
+from celery import shared_task
+from django.conf import settings
+from django.core.files import File
+from django.utils.timezone import now, timedelta
+
+from .models import ExportJob
+from .streaming import write_export
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def run_export_job(job_id):
+    """
+    Формирует файл выгрузки во временном файле (exports.streaming, память не
+    зависит от числа строк) и сохраняет его в хранилище задачи. Прогресс
+    сохраняется после каждых EXPORT_CHUNK_SIZE строк.
+    """
+    job = ExportJob.objects.get(pk=job_id)
+    jobs = ExportJob.objects.filter(pk=job_id)
+    jobs.update(status="running")
+    started = time.monotonic()
+
+    def progress(count):
+        jobs.update(processed_rows=count)
+        elapsed = time.monotonic() - started
+        logger.info(
+            "Выгрузка #%s: %s из %s строк (%.0f в секунду)",
+            job_id,
+            count,
+            total,
+            count / elapsed if elapsed else 0,
+        )
+
+    try:
+        resource = job.get_resource()
+        queryset = job.get_queryset(resource)
+        total = queryset.count()
+        jobs.update(total_rows=total)
+        with tempfile.TemporaryFile() as f:
+            write_export(resource, queryset, job.file_format, f, progress)
+            f.seek(0)
+            name = f"{job.resource.rsplit('.', 1)[-1].lower()}-{job.pk}.{job.file_format}"
+            job.file.save(name, File(f), save=False)
+    except Exception as e:
+        logger.exception("Выгрузка #%s завершилась с ошибкой", job_id)
+        jobs.update(status="failed", errors=str(e), finished_at=now())
+        return {"status": "failed"}
+
+    jobs.update(status="done", file=job.file.name, processed_rows=total, finished_at=now())
+    return {"status": "done", "rows": total}
+
+
+@shared_task
+def delete_expired_export_jobs():
+    """Удаляет задачи выгрузки старше EXPORT_KEEP_DAYS дней вместе с файлами."""
+    expired = ExportJob.objects.filter(created_at__lt=now() - timedelta(days=settings.EXPORT_KEEP_DAYS))
+    deleted = 0
+    for job in expired:
+        if job.file:
+            job.file.delete(save=False)
+        job.delete()
+        deleted += 1
+    return {"deleted": deleted}
@@ -0,0 +1,52 @@
+from django.contrib import admin
+from django.db import transaction
+
+from .models import ImportJob
+from .tasks import run_import_job
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "resource",
+        "status",
+        "progress_display",
+        "new_rows",
+        "updated_rows",
+        "error_rows",
+        "created_by",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("status", "resource")
+    readonly_fields = (
+        "status",
+        "total_rows",
+        "processed_rows",
+        "new_rows",
+        "updated_rows",
+        "skipped_rows",
+        "error_rows",
+        "errors",
+        "created_by",
+        "created_at",
+        "finished_at",
+    )
+
+    def get_readonly_fields(self, request, obj=None):
+        # Файл и тип данных задаются только при создании задачи
+        if obj is not None:
+            return ("resource", "file") + self.readonly_fields
+        return self.readonly_fields
+
+    @admin.display(description="Прогресс")
+    def progress_display(self, obj):
+        return f"{obj.progress}%"
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            obj.created_by = request.user
+        super().save_model(request, obj, form, change)
+        if not change:
+            transaction.on_commit(lambda: run_import_job.delay(obj.pk))
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+
+
+def import_storage():
+    # Загруженные файлы содержат персональные данные и не раздаются через MEDIA_URL
+    return FileSystemStorage(location=settings.PRIVATE_MEDIA_ROOT)
+
+
+class ImportJob(models.Model):
+    resource_choices = [
+        ("interviews.resources.InterviewResource", "Интервью"),
+        ("interviews.resources.InterviewTaskItemResource", "Задания интервью"),
+        ("test_tasks.resources.TestTaskResource", "Тестовые задания"),
+        ("test_tasks.resources.TestTaskItemResource", "Элементы тестовых заданий"),
+    ]
+    status_choices = [
+        ("pending", "В очереди"),
+        ("running", "Выполняется"),
+        ("done", "Завершен"),
+        ("failed", "Ошибка"),
+    ]
+
+    resource = models.CharField(max_length=100, choices=resource_choices, verbose_name="Данные")
+    file = models.FileField(
+        upload_to="imports/%Y/%m/", storage=import_storage, verbose_name="Файл (CSV, XLSX или JSON)"
+    )
+    status = models.CharField(max_length=20, choices=status_choices, default="pending", verbose_name="Статус")
+    total_rows = models.PositiveIntegerField(default=0, verbose_name="Всего строк")
+    processed_rows = models.PositiveIntegerField(default=0, verbose_name="Обработано строк")
+    new_rows = models.PositiveIntegerField(default=0, verbose_name="Создано")
+    updated_rows = models.PositiveIntegerField(default=0, verbose_name="Обновлено")
+    skipped_rows = models.PositiveIntegerField(default=0, verbose_name="Пропущено")
+    error_rows = models.PositiveIntegerField(default=0, verbose_name="С ошибками")
+    errors = models.TextField(blank=True, default="", verbose_name="Ошибки")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        verbose_name="Автор",
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Создан")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Завершен")
+
+    class Meta:
+        verbose_name = "Задача импорта"
+        verbose_name_plural = "Задачи импорта"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.get_resource_display()} #{self.pk}"
+
+    @property
+    def progress(self):
+        if not self.total_rows:
+            return 0
+        return round(self.processed_rows * 100 / self.total_rows)
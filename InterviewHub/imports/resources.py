@@ -0,0 +1,151 @@
+"""
+Пакетный режим импорта для ресурсов django-import-export.
+
+Ресурс с BulkImportMixin, созданный с bulk=True, сохраняет строки через
+bulk_create/bulk_update пакетами по IMPORT_BATCH_SIZE вместе с записями
+истории (bulk_history_create) и загружает существующие объекты одним
+запросом на набор данных. Связанные объекты внешних ключей подгружаются
+одним in_bulk на пакет. Без bulk=True ресурс работает как обычно (импорт
+в админке с предпросмотром изменений).
+"""
+
+import copy
+import functools
+
+from django.conf import settings
+from django.db import transaction
+from import_export.instance_loaders import CachedInstanceLoader
+from import_export.results import RowResult
+from import_export.widgets import ForeignKeyWidget
+from simple_history.utils import bulk_create_with_history, bulk_update_with_history
+
+from InterviewHub.caching import invalidate
+
+
+class CachedForeignKeyWidget(ForeignKeyWidget):
+    """
+    ForeignKeyWidget, который берет связанные объекты из кэша, заполненного
+    prefetch(). Значения, которых нет в кэше, ищутся отдельным запросом.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache = {}
+
+    def lookup_field(self):
+        return self.model._meta.pk if self.field == "pk" else self.model._meta.get_field(self.field)
+
+    def to_key(self, value):
+        return self.lookup_field().to_python(value)
+
+    def prefetch(self, values):
+        """Заменяет кэш объектами для values, загруженными одним in_bulk."""
+        keys = {self.to_key(value) for value in values if value not in (None, "")}
+        field_name = "pk" if self.field == "pk" else self.field
+        self.cache = self.get_queryset(None, None).in_bulk(keys, field_name=field_name) if keys else {}
+
+    def clean(self, value, row=None, **kwargs):
+        if self.use_natural_foreign_keys or value in (None, ""):
+            return super().clean(value, row, **kwargs)
+        obj = self.cache.get(self.to_key(value))
+        if obj is None:
+            return super().clean(value, row, **kwargs)
+        return obj.pk if self.key_is_id else obj
+
+
+class BulkRowResult(RowResult):
+    """
+    Результат строки без строкового представления объекта: в пакетном режиме
+    предпросмотра нет, а __str__ моделей проекта обходит связи и стоит запросов.
+    """
+
+    def add_instance_info(self, instance):
+        if instance is not None:
+            self.object_id = getattr(instance, "pk", None)
+
+
+class BulkImportMixin:
+    """
+    Примесь к ModelResource. Пакетный режим включается аргументом bulk=True,
+    history_user задает автора записей истории при пакетном сохранении.
+    """
+
+    def __init__(self, bulk=False, history_user=None, **kwargs):
+        super().__init__(**kwargs)
+        self.history_user = history_user
+        if bulk:
+            # Опции меняются только для этого экземпляра, импорт в админке остается построчным
+            self._meta = copy.copy(self._meta)
+            self._meta.use_bulk = True
+            self._meta.batch_size = settings.IMPORT_BATCH_SIZE
+            self._meta.skip_diff = True
+            self._meta.instance_loader_class = CachedInstanceLoader
+
+    def get_row_result_class(self):
+        return BulkRowResult if self._meta.use_bulk else super().get_row_result_class()
+
+    @classmethod
+    def get_fk_widget(cls, field):
+        widget = super().get_fk_widget(field)
+        return functools.partial(CachedForeignKeyWidget, *widget.args, **widget.keywords)
+
+    def before_import(self, dataset, **kwargs):
+        super().before_import(dataset, **kwargs)
+        for field in self.get_import_fields():
+            if isinstance(field.widget, CachedForeignKeyWidget) and field.column_name in dataset.headers:
+                field.widget.prefetch(dataset[field.column_name])
+
+    def before_save_instance(self, instance, row, **kwargs):
+        super().before_save_instance(instance, row, **kwargs)
+        if self._meta.use_bulk:
+            # bulk_create и bulk_update не вызывают save() и сигналы: денормализованные
+            # поля, которые заполняют обработчики pre_save, ресурс заполняет сам
+            self.attach_related(instance)
+
+    def attach_related(self, instance):
+        """
+        Поля внешних ключей импортируются как <поле>_id. Связанные объекты из кэша
+        виджетов присваиваются экземпляру, чтобы ресурс не загружал их по одному.
+        """
+        for field in self.get_import_fields():
+            widget = field.widget
+            if isinstance(widget, CachedForeignKeyWidget) and widget.key_is_id and field.attribute.endswith("_id"):
+                obj = widget.cache.get(getattr(instance, field.attribute, None))
+                if obj is not None:
+                    setattr(instance, field.attribute[:-3], obj)
+
+    def get_bulk_update_fields(self):
+        # Обновляются все поля модели: часть из них заполняется не из файла, а в before_save_instance
+        return [field.name for field in self._meta.model._meta.concrete_fields if not field.primary_key]
+
+    def bulk_create(self, using_transactions, dry_run, raise_errors, batch_size=None, result=None):
+        try:
+            if self.create_instances and (using_transactions or not dry_run):
+                bulk_create_with_history(
+                    self.create_instances,
+                    self._meta.model,
+                    batch_size=batch_size,
+                    default_user=self.history_user,
+                )
+                # bulk_create не отправляет post_save, кэш ответов API сбрасывается явно
+                transaction.on_commit(functools.partial(invalidate, self._meta.model))
+        except Exception as e:
+            self.handle_import_error(result, e, raise_errors)
+        finally:
+            self.create_instances.clear()
+
+    def bulk_update(self, using_transactions, dry_run, raise_errors, batch_size=None, result=None):
+        try:
+            if self.update_instances and (using_transactions or not dry_run):
+                bulk_update_with_history(
+                    self.update_instances,
+                    self._meta.model,
+                    self.get_bulk_update_fields(),
+                    batch_size=batch_size,
+                    default_user=self.history_user,
+                )
+                transaction.on_commit(functools.partial(invalidate, self._meta.model))
+        except Exception as e:
+            self.handle_import_error(result, e, raise_errors)
+        finally:
+            self.update_instances.clear()
@@ -0,0 +1,98 @@
+import logging
+import os
+import time
+
+import tablib
+from celery import shared_task
+from django.conf import settings
+from django.utils.module_loading import import_string
+from django.utils.timezone import now
+from import_export.formats.base_formats import CSV, JSON, XLSX
+
+from .models import ImportJob
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {".csv": CSV, ".xlsx": XLSX, ".json": JSON}
+# Сколько сообщений об ошибках строк сохраняется в задаче
+MAX_REPORTED_ERRORS = 100
+
+
+def read_dataset(job):
+    extension = os.path.splitext(job.file.name)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Неподдерживаемый формат файла: {extension}")
+    file_format = FORMATS[extension]()
+    with job.file.open("rb") as f:
+        data = f.read()
+    if not file_format.is_binary():
+        data = data.decode("utf-8-sig")
+    return file_format.create_dataset(data)
+
+
+def describe_errors(result, offset):
+    """Сообщения об ошибках пакета с номерами строк относительно всего файла."""
+    messages = [f"Пакет со строки {offset + 1}: {error.error}" for error in result.base_errors]
+    for number, errors in result.row_errors():
+        messages.extend(f"Строка {offset + number}: {error.error}" for error in errors)
+    for invalid in result.invalid_rows:
+        messages.append(f"Строка {offset + invalid.number}: {invalid.error_dict}")
+    return messages
+
+
+@shared_task
+def run_import_job(job_id):
+    """
+    Импортирует файл задачи пакетами по IMPORT_BATCH_SIZE строк, каждый пакет -
+    отдельная транзакция с bulk_create/bulk_update и пакетной записью истории.
+    Прогресс сохраняется в задаче после каждого пакета.
+    """
+    job = ImportJob.objects.select_related("created_by").get(pk=job_id)
+    jobs = ImportJob.objects.filter(pk=job_id)
+    jobs.update(status="running")
+    started = time.monotonic()
+    try:
+        dataset = read_dataset(job)
+        resource = import_string(job.resource)(bulk=True, history_user=job.created_by)
+        total = len(dataset)
+        jobs.update(total_rows=total)
+
+        counters = {"new": 0, "update": 0, "skip": 0, "error": 0}
+        errors = []
+        batch_size = settings.IMPORT_BATCH_SIZE
+        for offset in range(0, total, batch_size):
+            batch = tablib.Dataset(*dataset[offset:offset + batch_size], headers=dataset.headers)
+            result = resource.import_data(batch, dry_run=False, raise_errors=False, use_transactions=True)
+            if result.has_errors():
+                # При ошибке пакет откатывается целиком
+                counters["error"] += len(batch)
+            else:
+                for import_type in ("new", "update", "skip"):
+                    counters[import_type] += result.totals[import_type]
+                # Строки с ошибками валидации пропускаются, остальные строки пакета сохраняются
+                counters["error"] += result.totals["invalid"]
+            errors.extend(describe_errors(result, offset))
+            processed = min(offset + batch_size, total)
+            jobs.update(
+                processed_rows=processed,
+                new_rows=counters["new"],
+                updated_rows=counters["update"],
+                skipped_rows=counters["skip"],
+                error_rows=counters["error"],
+                errors="\n".join(errors[:MAX_REPORTED_ERRORS]),
+            )
+            elapsed = time.monotonic() - started
+            logger.info(
+                "Импорт #%s: %s из %s строк (%.0f в секунду)",
+                job_id,
+                processed,
+                total,
+                processed / elapsed if elapsed else 0,
+            )
+    except Exception as e:
+        logger.exception("Импорт #%s завершился с ошибкой", job_id)
+        jobs.update(status="failed", errors=str(e), finished_at=now())
+        return {"status": "failed"}
+
+    jobs.update(status="done", finished_at=now())
+    return {"status": "done", **counters}
@@ -1,19 +1,15 @@
 from django.contrib import admin
 from import_export.admin import ImportExportModelAdmin
-from import_export.formats.base_formats import XLSX, CSV, JSON
-from .models import Interview, InterviewTaskItem
+from exports.admin import StreamingExportMixin
+from .models import Interview, InterviewTaskItem, InterviewWeeklyStats
 from .resources import InterviewResource, InterviewTaskItemResource
 
 
 # Админка для Interview
 @admin.register(Interview)
-class InterviewAdmin(ImportExportModelAdmin):
+class InterviewAdmin(StreamingExportMixin, ImportExportModelAdmin):
     resource_class = InterviewResource
 
-    # Форматы экспорта
-    def get_export_formats(self):
-        return [XLSX, CSV, JSON]
-
     def get_export_queryset(self, request):
         """
         Отбор интревью, имеющих статус 'На рассмотрении'"
@@ -43,13 +39,9 @@ class InterviewAdmin(ImportExportModelAdmin):
 
 # Админка для InterviewTaskItem
 @admin.register(InterviewTaskItem)
-class InterviewTaskItemAdmin(ImportExportModelAdmin):
+class InterviewTaskItemAdmin(StreamingExportMixin, ImportExportModelAdmin):
     resource_class = InterviewTaskItemResource
 
-    # Форматы экспорта
-    def get_export_formats(self):
-        return [XLSX, CSV, JSON]
-
     def get_export_queryset(self, request):
         """
         Метод для кастомизации выборки данных для задания интервью.
@@ -73,3 +65,22 @@ class InterviewTaskItemAdmin(ImportExportModelAdmin):
         return (
             obj.candidate_answer[:50] if obj.candidate_answer else "No answer provided"
         )
+
+
+@admin.register(InterviewWeeklyStats)
+class InterviewWeeklyStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        "week",
+        "company",
+        "interviewer",
+        "status",
+        "interviews_count",
+        "total_duration",
+        "accepted_count",
+        "rejected_count",
+    )
+    list_filter = ("status", "company", "week")
+    list_select_related = ("company", "interviewer__user")
+    raw_id_fields = ("interviewer",)
+    ordering = ("-week",)
+    date_hierarchy = "week"
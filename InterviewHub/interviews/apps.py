@@ -5,3 +5,9 @@ class InterviewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'interviews'
     verbose_name = "Собеседования"
+
+    def ready(self):
+        from InterviewHub.caching import register
+        from . import signals  # noqa: F401
+
+        register(self.get_model("Interview"), self.get_model("InterviewTaskItem"))
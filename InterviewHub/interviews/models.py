@@ -1,7 +1,7 @@
 from django.db import models
 from selections.models import CompanySelection
 from tasks.models import TaskItem
-from simple_history.models import HistoricalRecords
+from audit.history import HistoricalRecords
 
 
 class Interview(models.Model):
@@ -32,7 +32,19 @@ class Interview(models.Model):
     soft_skills_rate = models.IntegerField(
         null=True, blank=True, verbose_name="Оценка софт скиллов"
     )
-    history = HistoricalRecords()
+    # Денормализованные email кандидата и интервьюера в нижнем регистре для поиска,
+    # заполняются сигналами из interviews.signals
+    candidate_email = models.CharField(
+        max_length=254, blank=True, default="", editable=False, verbose_name="Email кандидата"
+    )
+    interviewer_email = models.CharField(
+        max_length=254, blank=True, default="", editable=False, verbose_name="Email интервьюера"
+    )
+    # Время отправки напоминания кандидату (interviews.tasks), сбрасывается при переносе интервью
+    reminder_sent_at = models.DateTimeField(
+        null=True, blank=True, editable=False, verbose_name="Напоминание отправлено"
+    )
+    history = HistoricalRecords(excluded_fields=["candidate_email", "interviewer_email", "reminder_sent_at"])
 
     result_choices = [("Принято", "Принято"), ("Отклонено", "Отклонено")]
     result = models.CharField(
@@ -48,15 +60,45 @@ class Interview(models.Model):
         verbose_name = "Интервью"  # Название таблицы в единственном числе
         verbose_name_plural = "Интервью"  # Название таблицы во множественном числе
         ordering = ["-start_time"]
+        indexes = [
+            # Списки интервью по статусу (get_by_status) в порядке -start_time
+            models.Index(fields=["status", "-start_time"], name="interview_status_start_idx"),
+            # Лента ?cursor= по (-start_time, -id)
+            models.Index(fields=["start_time", "id"], name="interview_start_id_idx"),
+            # Очередь напоминаний: только интервью, по которым напоминание еще не отправлено
+            models.Index(
+                fields=["start_time"],
+                condition=models.Q(reminder_sent_at__isnull=True),
+                name="interview_reminder_due_idx",
+            ),
+            # Поиск по началу email (EmailSearchFilter): LIKE 'prefix%' по индексу
+            models.Index(
+                fields=["candidate_email"], opclasses=["varchar_pattern_ops"], name="interview_cand_email_idx"
+            ),
+            models.Index(
+                fields=["interviewer_email"], opclasses=["varchar_pattern_ops"], name="interview_intv_email_idx"
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Время начала при загрузке: после переноса сбрасывается напоминание
+        # и пересчитывается статистика прежней недели (interviews.signals)
+        instance._loaded_start_time = instance.__dict__.get("start_time")
+        return instance
 
     def save(self, *args, **kwargs):
+        self.update_duration()
+        super().save(*args, **kwargs)
+
+    def update_duration(self):
         # Calculate the duration before saving
         if self.start_time and self.end_time:
             delta = self.end_time - self.start_time
             self.duration = int(
                 delta.total_seconds() // 60
             )  # Convert seconds to minutes
-        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.selection.resume.candidate.user.email} - {self.start_time.strftime('%d.%m.%Y %H:%M')}"
@@ -79,3 +121,52 @@ class InterviewTaskItem(models.Model):
         verbose_name_plural = (
             "Элементы задания к интервью"  # Название таблицы во множественном числе
         )
+
+
+class InterviewWeeklyStats(models.Model):
+    """
+    Недельный агрегат интервью по компании, интервьюеру и статусу для аналитики.
+    Неделя определяется по времени начала интервью. Заполняется задачами
+    interviews.tasks.refresh_interview_stats и rebuild_interview_stats.
+    Суммы и количества оценок хранятся отдельно, чтобы средние значения
+    при объединении групп считались точно.
+    """
+
+    week = models.DateField(verbose_name="Неделя (понедельник)")
+    company = models.ForeignKey(
+        "users.Company",
+        null=True,
+        blank=True,
+        db_index=False,
+        on_delete=models.SET_NULL,
+        verbose_name="Компания",
+    )
+    interviewer = models.ForeignKey(
+        "users.Interviewer",
+        null=True,
+        blank=True,
+        db_index=False,
+        on_delete=models.SET_NULL,
+        verbose_name="Интервьюер",
+    )
+    status = models.CharField(max_length=20, verbose_name="Статус")
+    interviews_count = models.PositiveIntegerField(default=0, verbose_name="Количество интервью")
+    total_duration = models.IntegerField(default=0, verbose_name="Суммарная продолжительность (мин)")
+    accepted_count = models.PositiveIntegerField(default=0, verbose_name="Принято")
+    rejected_count = models.PositiveIntegerField(default=0, verbose_name="Отклонено")
+    hard_skills_total = models.IntegerField(default=0, verbose_name="Сумма оценок хард скиллов")
+    hard_skills_count = models.PositiveIntegerField(default=0, verbose_name="Количество оценок хард скиллов")
+    soft_skills_total = models.IntegerField(default=0, verbose_name="Сумма оценок софт скиллов")
+    soft_skills_count = models.PositiveIntegerField(default=0, verbose_name="Количество оценок софт скиллов")
+
+    class Meta:
+        verbose_name = "Статистика интервью по неделям"  # Название таблицы в единственном числе
+        verbose_name_plural = "Статистика интервью по неделям"  # Название таблицы во множественном числе
+        indexes = [
+            models.Index(fields=["week"], name="interviewstats_week_idx"),
+            models.Index(fields=["company", "week"], name="interviewstats_company_idx"),
+            models.Index(fields=["interviewer", "week"], name="interviewstats_interviewer_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.week} - {self.company_id}/{self.interviewer_id} ({self.status}): {self.interviews_count}"
@@ -1,15 +1,17 @@
+from django.db import transaction
 from import_export import resources
 from import_export.fields import Field
+from imports.resources import BulkImportMixin
 from .models import Interview, InterviewTaskItem
+from .stats import week_start
+from .tasks import refresh_interview_stats
 
 
-class InterviewResource(resources.ModelResource):
+class InterviewResource(BulkImportMixin, resources.ModelResource):
     # Пример кастомизации поля, для вывода статуса интервью в строковом формате
-    status_display = Field(
-        attribute="status",
-        column_name="Статус",
-        widget=resources.widgets.ForeignKeyWidget(Interview, "status"),
-    )
+    status_display = Field(attribute="status", column_name="Статус")
+    # При экспорте выводится в виде "X ч. Y мин.", при импорте вычисляется из времени начала и окончания
+    duration = Field(attribute="duration", column_name="duration", readonly=True)
 
     class Meta:
         model = Interview
@@ -44,6 +46,15 @@ class InterviewResource(resources.ModelResource):
             "recording_url",
         )
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Недели, статистику которых нужно пересчитать после пакетного импорта
+        self.stats_weeks = set()
+
+    def filter_export(self, queryset, **kwargs):
+        # Связи, которые читают поля ресурса, загружаются тем же запросом
+        return queryset.select_related("selection")
+
     def dehydrate_status_display(self, interview):
         """
         Метод для кастомизации поля 'status' при экспорте.
@@ -51,6 +62,39 @@ class InterviewResource(resources.ModelResource):
         """
         return interview.get_status_display()
 
+    def before_import(self, dataset, **kwargs):
+        super().before_import(dataset, **kwargs)
+        self.stats_weeks = set()
+
+    def before_save_instance(self, instance, row, **kwargs):
+        # В пакетном режиме Interview.save() не вызывается
+        instance.update_duration()
+        super().before_save_instance(instance, row, **kwargs)
+        if self._meta.use_bulk:
+            self.prepare_bulk_instance(instance)
+
+    def prepare_bulk_instance(self, instance):
+        """
+        То, что при save() делают обработчики interviews.signals: email для
+        поиска из отбора, сброс напоминания при переносе, недели для пересчета
+        статистики.
+        """
+        instance.candidate_email = instance.selection.candidate_email
+        instance.interviewer_email = instance.selection.interviewer_email
+        loaded_start_time = getattr(instance, "_loaded_start_time", None)
+        if loaded_start_time is not None and loaded_start_time != instance.start_time:
+            # Напоминание о перенесенном собеседовании отправит обход send_interview_reminder
+            instance.reminder_sent_at = None
+            self.stats_weeks.add(week_start(loaded_start_time))
+        self.stats_weeks.add(week_start(instance.start_time))
+
+    def after_import(self, dataset, result, **kwargs):
+        super().after_import(dataset, result, **kwargs)
+        if self._meta.use_bulk and self.stats_weeks:
+            weeks = [week.isoformat() for week in self.stats_weeks]
+            # При откате пакета (ошибки, dry_run) задача не ставится
+            transaction.on_commit(lambda: refresh_interview_stats.delay(weeks), robust=True)
+
     def dehydrate_duration(self, interview):
         """
         Метод для кастомизации поля 'duration'. Например, форматировать продолжительность
@@ -62,7 +106,7 @@ class InterviewResource(resources.ModelResource):
         return f"{hours} ч. {minutes} мин."
 
 
-class InterviewTaskItemResource(resources.ModelResource):
+class InterviewTaskItemResource(BulkImportMixin, resources.ModelResource):
     # Пример кастомизации поля, для вывода текста ответа кандидата
     candidate_answer_display = Field(
         attribute="candidate_answer", column_name="Ответ кандидата"
@@ -73,6 +117,10 @@ class InterviewTaskItemResource(resources.ModelResource):
         fields = ("id", "interview", "task_item", "candidate_answer_display")
         export_order = ("id", "interview", "task_item", "candidate_answer_display")
 
+    def filter_export(self, queryset, **kwargs):
+        # Связи, которые читают поля ресурса, загружаются тем же запросом
+        return queryset.select_related("interview", "task_item")
+
     def dehydrate_candidate_answer_display(self, item):
         """
         Кастомизация поля 'candidate_answer' при экспорте.
@@ -1,6 +1,6 @@
 from rest_framework import serializers
-from ..models import Interview, InterviewTaskItem
-from tasks.models import OpenQuestion, MultipleChoiceQuestion, CodeQuestion
+from tasks.answer_keys import empty_answer_key, get_answer_keys
+from ..models import InterviewTaskItem
 
 
 class InterviewTaskItemSerializer(serializers.ModelSerializer):
@@ -35,36 +35,11 @@ class InterviewTaskItemDetailSerializer(serializers.ModelSerializer):
     def get_correct_answers(self, obj):
         """
         Извлекает правильные ответы для задачи.
-        """
-        task_item = (
-            obj.task_item
-        )  # Убедитесь, что вы работаете с task_item из InterviewTaskItem
-        correct_answers = {
-            "open_question": None,
-            "multiple_choice": [],
-            "code_question": None,
-        }
 
-        # Извлечение правильных ответов для открытого вопроса
-        open_question = OpenQuestion.objects.filter(task_item=task_item).first()
-        if open_question:
-            correct_answers["open_question"] = open_question.correct_answer
-
-        # Извлечение правильных ответов для вопросов с выбором ответа
-        multiple_choice_questions = MultipleChoiceQuestion.objects.filter(
-            task_item=task_item, is_correct_answer=True
-        )
-        if multiple_choice_questions.exists():
-            correct_answers["multiple_choice"] = [
-                mc.answer_text for mc in multiple_choice_questions
-            ]
-
-        # Извлечение правильных ответов для задания с написанием кода
-        code_question = CodeQuestion.objects.filter(task_item=task_item).first()
-        if code_question:
-            correct_answers["code_question"] = {
-                "language": code_question.language,
-                "code_snippet": code_question.code_snippet,
-            }
-
-        return correct_answers
+        Ключи ответов передаются view в контексте ("answer_keys"), иначе
+        читаются из кэша по одному заданию.
+        """
+        answer_keys = self.context.get("answer_keys")
+        if answer_keys is None:
+            answer_keys = get_answer_keys([obj.task_item_id])
+        return answer_keys.get(obj.task_item_id) or empty_answer_key()
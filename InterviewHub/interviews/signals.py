@@ -0,0 +1,96 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from InterviewHub.filters import normalize_email
+from resumes.models import Resume
+from selections.models import CompanySelection
+from users.models import Interviewer, User
+from .models import Interview
+from .stats import week_start
+from .tasks import refresh_interview_stats
+
+
+@receiver(pre_save, sender=Interview)
+def fill_search_emails(sender, instance, **kwargs):
+    """Копирует email кандидата и интервьюера из отбора для поиска по интервью."""
+    # Значения читаются из БД: закэшированный instance.selection мог устареть
+    emails = (
+        CompanySelection.objects.filter(pk=instance.selection_id)
+        .values_list("candidate_email", "interviewer_email")
+        .first()
+    )
+    if emails is not None:
+        instance.candidate_email, instance.interviewer_email = emails
+
+
+@receiver(pre_save, sender=Interview)
+def reset_reminder(sender, instance, **kwargs):
+    """При переносе собеседования напоминание нужно отправить заново."""
+    if instance.pk is None or instance.reminder_sent_at is None:
+        return
+    # Время начала при загрузке (Interview.from_db); запрос к БД - только для
+    # объектов, созданных не из выборки или загруженных без start_time
+    start_time = getattr(instance, "_loaded_start_time", None)
+    if start_time is None:
+        start_time = Interview.objects.filter(pk=instance.pk).values_list("start_time", flat=True).first()
+    if start_time != instance.start_time:
+        instance.reminder_sent_at = None
+
+
+@receiver(post_save, sender=Interview)
+@receiver(post_delete, sender=Interview)
+def refresh_stats(sender, instance, **kwargs):
+    """Пересчитывает статистику недели интервью, а после переноса - и прежней недели."""
+    weeks = {week_start(instance.start_time)}
+    loaded_start_time = getattr(instance, "_loaded_start_time", None)
+    if loaded_start_time is not None:
+        weeks.add(week_start(loaded_start_time))
+    instance._loaded_start_time = instance.start_time
+    weeks = [week.isoformat() for week in weeks]
+    # Ошибка постановки в очередь не должна влиять на сохранение интервью:
+    # агрегаты исправит ежедневный rebuild_interview_stats
+    transaction.on_commit(lambda: refresh_interview_stats.delay(weeks), robust=True)
+
+
+@receiver(post_save, sender=CompanySelection)
+def sync_selection(sender, instance, created, **kwargs):
+    if created:
+        return
+    Interview.objects.filter(selection=instance).exclude(
+        candidate_email=instance.candidate_email, interviewer_email=instance.interviewer_email
+    ).update(candidate_email=instance.candidate_email, interviewer_email=instance.interviewer_email)
+
+
+@receiver(post_save, sender=User)
+def sync_user_email(sender, instance, update_fields=None, **kwargs):
+    """Обновляет email в интервью пользователя при его изменении."""
+    if update_fields is not None and "email" not in update_fields:
+        return
+    email = normalize_email(instance.email)
+    Interview.objects.filter(selection__resume__candidate__user=instance).exclude(
+        candidate_email=email
+    ).update(candidate_email=email)
+    Interview.objects.filter(selection__interviewer__user=instance).exclude(
+        interviewer_email=email
+    ).update(interviewer_email=email)
+
+
+@receiver(post_save, sender=Interviewer)
+def sync_interviewer(sender, instance, created, **kwargs):
+    if created:
+        return
+    email = normalize_email(instance.user.email)
+    Interview.objects.filter(selection__interviewer=instance).exclude(
+        interviewer_email=email
+    ).update(interviewer_email=email)
+
+
+@receiver(post_save, sender=Resume)
+def sync_resume(sender, instance, created, **kwargs):
+    if created:
+        return
+    email = normalize_email(instance.candidate.user.email)
+    Interview.objects.filter(selection__resume=instance).exclude(
+        candidate_email=email
+    ).update(candidate_email=email)
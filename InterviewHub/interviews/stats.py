@@ -0,0 +1,107 @@
+"""
+Недельная статистика интервью (InterviewWeeklyStats).
+
+Агрегаты недели пересчитываются целиком по интервью, начинающимся в эту
+неделю, поэтому пересчет идемпотентен. Аналитика читает только агрегаты и
+не обращается к Interview и связанным таблицам.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, DateField, F, Q, Sum
+from django.db.models.functions import Coalesce, TruncWeek
+from django.utils.timezone import localtime, make_aware
+
+from .models import Interview, InterviewWeeklyStats
+
+# Допустимые значения параметра group_by
+STATS_GROUPS = ("week", "company", "interviewer", "status")
+
+
+def week_start(value):
+    """Понедельник недели для даты или даты-времени (в часовом поясе проекта)."""
+    if isinstance(value, datetime):
+        value = localtime(value).date()
+    return value - timedelta(days=value.weekday())
+
+
+def rebuild_weekly_stats(start, end=None):
+    """
+    Пересчитывает агрегаты недель с start (понедельник) до end (не включая;
+    None - все последующие недели). Возвращает число строк агрегатов.
+    """
+    interviews = Interview.objects.filter(start_time__gte=make_aware(datetime.combine(start, time.min)))
+    stats = InterviewWeeklyStats.objects.filter(week__gte=start)
+    if end is not None:
+        interviews = interviews.filter(start_time__lt=make_aware(datetime.combine(end, time.min)))
+        stats = stats.filter(week__lt=end)
+
+    rows = (
+        interviews.annotate(week=TruncWeek("start_time", output_field=DateField()))
+        .values(
+            "week",
+            "status",
+            company_id=F("selection__interviewer__company_id"),
+            interviewer_id=F("selection__interviewer_id"),
+        )
+        .annotate(
+            interviews_count=Count("id"),
+            total_duration=Coalesce(Sum("duration"), 0),
+            accepted_count=Count("id", filter=Q(result="Принято")),
+            rejected_count=Count("id", filter=Q(result="Отклонено")),
+            hard_skills_total=Coalesce(Sum("hard_skills_rate"), 0),
+            hard_skills_count=Count("hard_skills_rate"),
+            soft_skills_total=Coalesce(Sum("soft_skills_rate"), 0),
+            soft_skills_count=Count("soft_skills_rate"),
+        )
+        .order_by()
+    )
+    rollups = [InterviewWeeklyStats(**row) for row in rows]
+
+    # Период пересчитывается целиком, поэтому старые агрегаты за него заменяются новыми
+    with transaction.atomic():
+        stats.delete()
+        InterviewWeeklyStats.objects.bulk_create(rollups, batch_size=1000)
+    return len(rollups)
+
+
+def average(total, count, digits=2):
+    return round(total / count, digits) if count else None
+
+
+def query_weekly_stats(group_by, **filters):
+    """
+    Статистика из агрегатов, сгруппированная по полям group_by (из
+    STATS_GROUPS): количество и продолжительность интервью, доля принятых
+    среди интервью с результатом и средние оценки.
+    """
+    rows = (
+        InterviewWeeklyStats.objects.filter(**filters)
+        .values(*group_by)
+        .annotate(
+            interviews=Sum("interviews_count"),
+            duration=Sum("total_duration"),
+            accepted=Sum("accepted_count"),
+            rejected=Sum("rejected_count"),
+            hard_total=Sum("hard_skills_total"),
+            hard_count=Sum("hard_skills_count"),
+            soft_total=Sum("soft_skills_total"),
+            soft_count=Sum("soft_skills_count"),
+        )
+        .order_by(*group_by)
+    )
+    return [
+        {
+            **{name: row[name] for name in group_by},
+            "interviews_count": row["interviews"],
+            "total_duration": row["duration"],
+            "avg_duration": average(row["duration"], row["interviews"], 1),
+            "accepted_count": row["accepted"],
+            "rejected_count": row["rejected"],
+            "pass_rate": average(row["accepted"], row["accepted"] + row["rejected"], 3),
+            "avg_hard_skills_rate": average(row["hard_total"], row["hard_count"]),
+            "avg_soft_skills_rate": average(row["soft_total"], row["soft_count"]),
+        }
+        for row in rows
+    ]
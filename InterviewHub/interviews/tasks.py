@@ -1,25 +1,149 @@
+from datetime import date
+
 from celery import shared_task
-from django.core.mail import send_mail
+from django.conf import settings
+from django.core.mail import get_connection, send_mass_mail
+from django.db import transaction
 from django.utils.timezone import now, timedelta
 from .models import Interview
+from .stats import rebuild_weekly_stats, week_start
+
+REMINDER_SUBJECT = 'Напоминание о собеседовании'
+REMINDER_FROM_EMAIL = 'admin@inteviewhub.ru'
+# За сколько до начала собеседования отправляется напоминание
+REMINDER_LEAD = timedelta(hours=1)
+
+
+def due_interviews(current_time):
+    """
+    Собеседования без отправленного напоминания, до начала которых остался час
+    или меньше. Опоздание больше INTERVIEW_REMINDER_GRACE_MINUTES не догоняется:
+    напоминание "через 1 час" о собеседовании, которое вот-вот начнется, бесполезно.
+    """
+    grace = timedelta(minutes=settings.INTERVIEW_REMINDER_GRACE_MINUTES)
+    return Interview.objects.filter(
+        reminder_sent_at__isnull=True,
+        start_time__gt=current_time + REMINDER_LEAD - grace,
+        start_time__lte=current_time + REMINDER_LEAD,
+    )
+
+
+def claim_reminders(queryset, current_time, limit):
+    """
+    Забирает до limit собеседований из queryset вместе с кандидатом и компанией
+    и отмечает их reminder_sent_at.
+
+    Строки блокируются SELECT ... FOR UPDATE SKIP LOCKED, поэтому параллельные
+    воркеры разбирают разные собеседования и каждое напоминание отправляется один раз.
+    """
+    with transaction.atomic():
+        interviews = list(
+            queryset.select_related('selection__resume__candidate__user', 'selection__interviewer__company')
+            .only(
+                'id',
+                'selection__resume__candidate__user__first_name',
+                'selection__resume__candidate__user__email',
+                'selection__interviewer__company__name',
+            )
+            .order_by('start_time', 'id')
+            .select_for_update(skip_locked=True, of=('self',))[:limit]
+        )
+        Interview.objects.filter(pk__in=[interview.pk for interview in interviews]).update(
+            reminder_sent_at=current_time
+        )
+    return interviews
+
+
+def render_reminder(interview):
+    """Письмо-напоминание в формате кортежа для send_mass_mail."""
+    candidate_user = interview.selection.resume.candidate.user
+    return (
+        REMINDER_SUBJECT,
+        (
+            f'Здравствуйте, {candidate_user.first_name}! '
+            f'Напоминаем, что ваше собеседование в компанию '
+            f'"{interview.selection.interviewer.company.name}" начнется через 1 час.'
+        ),
+        REMINDER_FROM_EMAIL,
+        [candidate_user.email],
+    )
+
+
+def send_reminders(interviews, current_time):
+    """Отправляет напоминания по забранным собеседованиям через одно SMTP-соединение."""
+    messages = [
+        render_reminder(interview)
+        for interview in interviews
+        if interview.selection.resume.candidate.user.email
+    ]
+    if not messages:
+        return 0
+    try:
+        return send_mass_mail(messages, connection=get_connection())
+    except Exception:
+        # Снимаем отметку, чтобы напоминания отправил следующий обход
+        Interview.objects.filter(
+            pk__in=[interview.pk for interview in interviews], reminder_sent_at=current_time
+        ).update(reminder_sent_at=None)
+        raise
+
 
 @shared_task
 def send_interview_reminder():
-    # Получаем текущее время
+    """
+    Обход по расписанию beat: отправляет напоминания, которые не отправила
+    send_interview_reminder_for (собеседования, созданные не через API, потерянные
+    задачи с ETA). Если порция заполнена целиком, сразу ставится следующий запуск,
+    и пик разбирается несколькими воркерами параллельно.
+    """
     current_time = now()
-    # Фильтруем собеседования, которые начинаются в пределах следующего часа
-    upcoming_interviews = Interview.objects.filter(
-        start_time__gte=current_time + timedelta(hours=1),  # Собеседования, которые начинаются через час или позже
-        start_time__lt=current_time + timedelta(hours=1, minutes=1)  # И которые начинаются в пределах следующего часа и одной минуты
-    )
-    for interview in upcoming_interviews:
-        send_mail(
-            subject='Напоминание о собеседовании',
-            message=(
-                f'Здравствуйте, {interview.selection.resume.candidate.user.first_name}! '
-                f'Напоминаем, что ваше собеседование в компанию '
-                f'"{interview.selection.interviewer.company.name}" начнется через 1 час.'
-            ),
-            from_email='admin@inteviewhub.ru',
-            recipient_list=[interview.selection.resume.candidate.user.email],
-        )
+    batch_size = settings.INTERVIEW_REMINDER_BATCH_SIZE
+    interviews = claim_reminders(due_interviews(current_time), current_time, batch_size)
+    if len(interviews) == batch_size:
+        send_interview_reminder.delay()
+    return send_reminders(interviews, current_time)
+
+
+@shared_task
+def send_interview_reminder_for(interview_id):
+    """
+    Напоминание по одному собеседованию, ставится с ETA при создании или переносе.
+    Повторная доставка задачи брокером или устаревшая ETA после переноса ничего
+    не отправляют: собеседование уже отмечено или еще не подошло по времени.
+    """
+    current_time = now()
+    interviews = claim_reminders(due_interviews(current_time).filter(pk=interview_id), current_time, 1)
+    return send_reminders(interviews, current_time)
+
+
+def schedule_reminder(interview):
+    """Ставит send_interview_reminder_for на момент за REMINDER_LEAD до начала собеседования."""
+    if interview.reminder_sent_at is not None:
+        return
+    current_time = now()
+    eta = interview.start_time - REMINDER_LEAD
+    if eta + timedelta(minutes=settings.INTERVIEW_REMINDER_GRACE_MINUTES) <= current_time:
+        return
+    send_interview_reminder_for.apply_async((interview.pk,), eta=max(eta, current_time))
+
+
+@shared_task
+def refresh_interview_stats(weeks):
+    """Пересчитывает недельную статистику для недель weeks (ISO-даты понедельников)."""
+    rows = 0
+    for week in sorted(set(weeks)):
+        start = date.fromisoformat(week)
+        rows += rebuild_weekly_stats(start, start + timedelta(weeks=1))
+    return {"rows": rows}
+
+
+@shared_task
+def rebuild_interview_stats():
+    """
+    Ежедневный пересчет статистики с недели INTERVIEW_STATS_REBUILD_WEEKS недель
+    назад, включая будущие недели. Исправляет агрегаты после изменений без
+    сигналов: смены интервьюера отбора, потерянного пересчета после архивации
+    отборов. Более старые недели не пересчитываются.
+    """
+    start = week_start(now()) - timedelta(weeks=settings.INTERVIEW_STATS_REBUILD_WEEKS)
+    return {"rows": rebuild_weekly_stats(start)}
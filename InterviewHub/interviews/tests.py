@@ -1,3 +1,285 @@
-from django.test import TestCase
+import base64
+import json
+from datetime import date, datetime, timedelta
+from smtplib import SMTPException
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils.timezone import make_aware, now
+from rest_framework.test import APIClient
+
+from resumes.models import Resume
+from tasks.models import OpenQuestion, TaskItem
+from selections.models import CompanySelection
+from users.models import Candidate, Company, Interviewer, User
+
+from .models import Interview, InterviewTaskItem, InterviewWeeklyStats
+from .stats import query_weekly_stats, rebuild_weekly_stats
+from .tasks import REMINDER_LEAD, due_interviews, send_interview_reminder, send_interview_reminder_for
+from .views.interview_viewset import InterviewViewSet
+
+# Понедельники двух соседних недель
+WEEK = date(2024, 5, 13)
+NEXT_WEEK = date(2024, 5, 20)
+
+
+class InterviewTestCase(TestCase):
+    def setUp(self):
+        self.company = Company.objects.create(name="Компания", location="Москва")
+        self.interviewer = Interviewer.objects.create(
+            user=User.objects.create_user(username="interviewer", email="interviewer@example.com"),
+            company=self.company,
+            position="Разработчик",
+        )
+        candidate = Candidate.objects.create(
+            user=User.objects.create_user(username="candidate", email="candidate@example.com"),
+            city="Москва",
+        )
+        resume = Resume.objects.create(candidate=candidate, desired_position="Разработчик", desired_salary=100)
+        self.selection = CompanySelection.objects.create(
+            interviewer=self.interviewer, resume=resume, status="На рассмотрении"
+        )
+
+    def create_interview(self, day, minutes=60, status="Завершено", **kwargs):
+        start_time = make_aware(datetime.combine(day, datetime.min.time()).replace(hour=12))
+        return Interview.objects.create(
+            selection=self.selection,
+            start_time=start_time,
+            end_time=start_time + timedelta(minutes=minutes),
+            type="Техническое",
+            status=status,
+            **kwargs,
+        )
+
+
+class InterviewWeeklyStatsTests(InterviewTestCase):
+    def test_rebuild_weekly_stats_aggregates_by_week(self):
+        self.create_interview(WEEK + timedelta(days=2), result="Принято", hard_skills_rate=8, soft_skills_rate=6)
+        self.create_interview(WEEK + timedelta(days=6), minutes=30, result="Отклонено", hard_skills_rate=4)
+        self.create_interview(NEXT_WEEK, minutes=90)
+
+        self.assertEqual(rebuild_weekly_stats(WEEK), 2)
+
+        stats = InterviewWeeklyStats.objects.get(week=WEEK)
+        self.assertEqual(stats.company_id, self.company.pk)
+        self.assertEqual(stats.interviewer_id, self.interviewer.pk)
+        self.assertEqual(stats.interviews_count, 2)
+        self.assertEqual(stats.total_duration, 90)
+        self.assertEqual((stats.accepted_count, stats.rejected_count), (1, 1))
+        self.assertEqual((stats.hard_skills_total, stats.hard_skills_count), (12, 2))
+        self.assertEqual((stats.soft_skills_total, stats.soft_skills_count), (6, 1))
+        self.assertEqual(InterviewWeeklyStats.objects.get(week=NEXT_WEEK).interviews_count, 1)
+
+    def test_rebuild_weekly_stats_replaces_only_given_period(self):
+        interview = self.create_interview(WEEK)
+        self.create_interview(NEXT_WEEK)
+        rebuild_weekly_stats(WEEK)
+
+        interview.delete()
+        rebuild_weekly_stats(WEEK, NEXT_WEEK)
+
+        self.assertFalse(InterviewWeeklyStats.objects.filter(week=WEEK).exists())
+        self.assertEqual(InterviewWeeklyStats.objects.get(week=NEXT_WEEK).interviews_count, 1)
+
+    def test_query_weekly_stats(self):
+        self.create_interview(WEEK, result="Принято", hard_skills_rate=8)
+        self.create_interview(WEEK, minutes=30, result="Отклонено", hard_skills_rate=5)
+        self.create_interview(WEEK, minutes=30, status="Запланировано")
+        rebuild_weekly_stats(WEEK)
+
+        (row,) = query_weekly_stats(["week"])
+        self.assertEqual(row["week"], WEEK)
+        self.assertEqual(row["interviews_count"], 3)
+        self.assertEqual(row["total_duration"], 120)
+        self.assertEqual(row["avg_duration"], 40.0)
+        self.assertEqual(row["pass_rate"], 0.5)
+        self.assertEqual(row["avg_hard_skills_rate"], 6.5)
+        self.assertIsNone(row["avg_soft_skills_rate"])
+
+        by_status = {row["status"]: row["interviews_count"] for row in query_weekly_stats(["status"])}
+        self.assertEqual(by_status, {"Завершено": 2, "Запланировано": 1})
+
+    def test_analytics_period_snaps_to_weeks(self):
+        self.create_interview(WEEK + timedelta(days=4))
+        self.create_interview(NEXT_WEEK)
+        rebuild_weekly_stats(WEEK)
+        client = APIClient()
+        client.force_authenticate(self.interviewer.user)
+
+        def weeks(**params):
+            response = client.get("/api/interviews/analytics/", params)
+            self.assertEqual(response.status_code, 200)
+            return [row["week"] for row in response.json()]
+
+        # date_to в середине недели включает всю неделю, в которую попадает
+        self.assertEqual(weeks(date_to="2024-05-15"), [WEEK.isoformat()])
+        # Воскресенье перед неделей ее не включает
+        self.assertEqual(weeks(date_to="2024-05-12"), [])
+        # date_from в воскресенье включает неделю, которой оно принадлежит
+        self.assertEqual(weeks(date_from="2024-05-19"), [WEEK.isoformat(), NEXT_WEEK.isoformat()])
+        self.assertEqual(weeks(date_from="2024-05-20", date_to="2024-05-26"), [NEXT_WEEK.isoformat()])
+
+    def test_analytics_rejects_invalid_params(self):
+        client = APIClient()
+        client.force_authenticate(self.interviewer.user)
+        self.assertEqual(client.get("/api/interviews/analytics/", {"group_by": "candidate"}).status_code, 400)
+        self.assertEqual(client.get("/api/interviews/analytics/", {"date_to": "15.05.2024"}).status_code, 400)
+
+
+class InterviewCursorPaginationTests(InterviewTestCase):
+    def setUp(self):
+        super().setUp()
+        # Три собеседования с одинаковым start_time: порядок внутри них задает id
+        for day in (WEEK, WEEK, WEEK, NEXT_WEEK, NEXT_WEEK + timedelta(days=1)):
+            self.create_interview(day)
+        self.expected = list(Interview.objects.order_by("-start_time", "-id").values_list("id", flat=True))
+        self.client = APIClient()
+        self.client.force_authenticate(self.interviewer.user)
+
+    def get_page(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cursor_round_trip(self):
+        page = self.get_page("/api/interviews/", {"cursor": "", "page_size": 2})
+        self.assertNotIn("count", page)
+        self.assertIsNone(page["previous"])
+        ids = []
+        while True:
+            ids.extend(row["id"] for row in page["results"])
+            if not page["next"]:
+                break
+            page = self.get_page(page["next"])
+        self.assertEqual(ids, self.expected)
+
+    def test_backward_paging(self):
+        forward = []
+        page = self.get_page("/api/interviews/", {"cursor": "", "page_size": 2})
+        while page["next"]:
+            page = self.get_page(page["next"])
+            forward.append([row["id"] for row in page["results"]])
+
+        backward = []
+        while page["previous"]:
+            page = self.get_page(page["previous"])
+            backward.append([row["id"] for row in page["results"]])
+
+        # Назад проходятся те же страницы в обратном порядке, включая первую
+        self.assertEqual(backward[::-1], [self.expected[:2], *forward[:-1]])
+        self.assertIsNone(page["previous"])
+
+    def test_malformed_cursor(self):
+        position = base64.urlsafe_b64encode(json.dumps({"v": "не дата", "id": 1}).encode()).decode()
+        for cursor in ("не-base64", base64.urlsafe_b64encode(b"{}").decode(), position):
+            with self.subTest(cursor=cursor):
+                response = self.client.get("/api/interviews/", {"cursor": cursor})
+                self.assertEqual(response.status_code, 404)
+
+
+@override_settings(INTERVIEW_REMINDER_BATCH_SIZE=10)
+class InterviewReminderTests(InterviewTestCase):
+    def create_due_interview(self):
+        # До начала чуть меньше часа: напоминание пора отправлять
+        start_time = now() + REMINDER_LEAD - timedelta(minutes=1)
+        return Interview.objects.create(
+            selection=self.selection,
+            start_time=start_time,
+            end_time=start_time + timedelta(hours=1),
+            type="Техническое",
+            status="Запланировано",
+        )
+
+    def test_claimed_interview_is_not_sent_twice(self):
+        interview = self.create_due_interview()
+
+        self.assertEqual(send_interview_reminder(), 1)
+        self.assertEqual(send_interview_reminder(), 0)
+        self.assertEqual(send_interview_reminder_for(interview.pk), 0)
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["candidate@example.com"])
+        interview.refresh_from_db()
+        self.assertIsNotNone(interview.reminder_sent_at)
+
+    def test_reschedule_clears_reminder_sent_at(self):
+        interview = self.create_due_interview()
+        send_interview_reminder_for(interview.pk)
+        interview.refresh_from_db()
+
+        interview.notes = "Без переноса"
+        interview.save()
+        interview.refresh_from_db()
+        self.assertIsNotNone(interview.reminder_sent_at)
+
+        interview.start_time += timedelta(days=1)
+        interview.end_time += timedelta(days=1)
+        interview.save()
+        interview.refresh_from_db()
+        self.assertIsNone(interview.reminder_sent_at)
+
+    def test_smtp_failure_unmarks_interviews(self):
+        interview = self.create_due_interview()
+
+        with mock.patch("interviews.tasks.send_mass_mail", side_effect=SMTPException), self.assertRaises(
+            SMTPException
+        ):
+            send_interview_reminder()
+
+        interview.refresh_from_db()
+        self.assertIsNone(interview.reminder_sent_at)
+        # Следующий обход отправляет напоминание
+        self.assertEqual(send_interview_reminder(), 1)
+
+    @override_settings(INTERVIEW_REMINDER_BATCH_SIZE=1)
+    def test_full_batch_enqueues_next_run(self):
+        self.create_due_interview()
+        self.create_due_interview()
+
+        with mock.patch.object(send_interview_reminder, "delay") as delay:
+            self.assertEqual(send_interview_reminder(), 1)
+        delay.assert_called_once_with()
+        self.assertEqual(due_interviews(now()).count(), 1)
+
+        with mock.patch.object(send_interview_reminder, "delay") as delay:
+            self.assertEqual(send_interview_reminder(), 1)
+        delay.assert_called_once_with()
+
+        with mock.patch.object(send_interview_reminder, "delay") as delay:
+            self.assertEqual(send_interview_reminder(), 0)
+        delay.assert_not_called()
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class InterviewConditionalResponseTests(InterviewTestCase):
+    def setUp(self):
+        super().setUp()
+        self.interview = self.create_interview(WEEK)
+        self.client = APIClient()
+        self.client.force_authenticate(self.interviewer.user)
+
+    def test_if_none_match_returns_304_without_serialization(self):
+        response = self.client.get("/api/interviews/")
+        self.assertEqual(response.status_code, 200)
+
+        with mock.patch.object(InterviewViewSet, "get_serializer") as get_serializer:
+            response = self.client.get("/api/interviews/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+        get_serializer.assert_not_called()
+
+    def test_get_tasks_etag_changes_with_answer_key(self):
+        task_item = TaskItem.objects.create(title="Сумма", complexity=1, task_condition="Сложите два числа")
+        question = OpenQuestion.objects.create(task_item=task_item, correct_answer="3")
+        InterviewTaskItem.objects.create(interview=self.interview, task_item=task_item, candidate_answer="3")
+        url = f"/api/interviews/{self.interview.pk}/tasks/"
+        etag = self.client.get(url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            question.correct_answer = "4"
+            question.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["tasks"][0]["correct_answers"]["open_question"], "4")
@@ -1,29 +1,49 @@
+from datetime import date
+
+from django.db import transaction
 from django.db.models import Q, Sum
 from rest_framework import viewsets, status
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.decorators import action
-from rest_framework.filters import SearchFilter
-from rest_framework.pagination import PageNumberPagination
+from InterviewHub.caching import ConditionalViewSetMixin
+from InterviewHub.filters import EmailSearchFilter
+from InterviewHub.pagination import FeedPagination
 from rest_framework.response import Response
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
+from tasks.answer_keys import get_answer_keys
+from tasks.models import CodeQuestion, MultipleChoiceQuestion, OpenQuestion, TaskItem
 from ..models import Interview, InterviewTaskItem
 from ..serializers.interview_serializer import InterviewSerializer
 from ..serializers.interview_task_serializer import InterviewTaskItemDetailSerializer
+from ..stats import STATS_GROUPS, query_weekly_stats, week_start
+from ..tasks import schedule_reminder
 
 
-class StandardResultsSetPagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = "page_size"
-    max_page_size = 100
-
-
-class InterviewViewSet(viewsets.ModelViewSet):
+class InterviewViewSet(ConditionalViewSetMixin, viewsets.ModelViewSet):
     queryset = Interview.objects.all()
     serializer_class = InterviewSerializer
-    pagination_class = StandardResultsSetPagination
-    filter_backends = [SearchFilter]
-    search_fields = ["selection__resume__candidate__user__email", "selection__interviewer__user__email"]
+    pagination_class = FeedPagination
+    # Модели, из которых собирается список (ETag и Last-Modified)
+    conditional_models = [Interview]
+    # Модели, из которых собирается ответ get_tasks
+    tasks_conditional_models = [
+        Interview,
+        InterviewTaskItem,
+        TaskItem,
+        OpenQuestion,
+        MultipleChoiceQuestion,
+        CodeQuestion,
+    ]
+    # Порядок ленты для режима ?cursor=
+    cursor_ordering = ("-start_time", "-id")
+    filter_backends = [EmailSearchFilter]
+    search_fields = ["candidate_email", "interviewer_email"]
+
+    def get_conditional_models(self):
+        if self.action == "get_tasks":
+            return self.tasks_conditional_models
+        return super().get_conditional_models()
 
     @swagger_auto_schema(
         operation_summary="Получить список интервью",
@@ -124,7 +144,7 @@ class InterviewViewSet(viewsets.ModelViewSet):
             openapi.Parameter(
                 name="search",
                 in_=openapi.IN_QUERY,
-                description="Поиск отбора кандидата по электронной почте интервьюера или кандидата",
+                description="Поиск по началу электронной почты интервьюера или кандидата",
                 type=openapi.TYPE_STRING,
             ),
             openapi.Parameter(
@@ -141,6 +161,23 @@ class InterviewViewSet(viewsets.ModelViewSet):
                 description="Количество элементов на странице",
                 default=10
             ),
+            openapi.Parameter(
+                name="cursor",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description=(
+                    "Курсор ленты. При наличии параметра (пустое значение - первая страница) "
+                    "используется keyset-пагинация: ссылки next/previous содержат курсор, "
+                    "а page не учитывается"
+                ),
+            ),
+            openapi.Parameter(
+                name="count",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=["exact", "approx"],
+                description="Подсчет общего количества в режиме курсора: точный или оценка (PostgreSQL)",
+            ),
         ],
     )
     def list(self, request, *args, **kwargs):
@@ -279,6 +316,12 @@ class InterviewViewSet(viewsets.ModelViewSet):
         """Создает новое интервью, связанное с указанным отбором."""
         return super().create(request, *args, **kwargs)
 
+    def perform_create(self, serializer):
+        interview = serializer.save()
+        # Задача с ETA ставится после коммита, чтобы воркер увидел созданное интервью
+        # Ошибка брокера не должна ломать ответ: напоминание отправит ежеминутный обход send_interview_reminder
+        transaction.on_commit(lambda: schedule_reminder(interview), robust=True)
+
     @swagger_auto_schema(
         operation_summary="Получить интервью по ID",
         operation_description="Возвращает данные интервью по указанному ID.",
@@ -589,6 +632,12 @@ class InterviewViewSet(viewsets.ModelViewSet):
         """Полное обновление интервью (PUT)."""
         return super().update(request, *args, **kwargs)
 
+    def perform_update(self, serializer):
+        start_time = serializer.instance.start_time
+        interview = serializer.save()
+        if interview.start_time != start_time:
+            transaction.on_commit(lambda: schedule_reminder(interview), robust=True)
+
     @swagger_auto_schema(
         operation_summary="Удалить интервью",
         operation_description="Удаляет интервью по указанному ID.",
@@ -670,13 +719,13 @@ class InterviewViewSet(viewsets.ModelViewSet):
                                             "code_question": openapi.Schema(
                                                 type=openapi.TYPE_OBJECT,
                                                 properties={
-                                                    "language": openapi.Schema(
+                                                    "input_data": openapi.Schema(
                                                         type=openapi.TYPE_STRING,
-                                                        description="Язык программирования",
+                                                        description="Входные данные",
                                                     ),
-                                                    "code_snippet": openapi.Schema(
+                                                    "output_data": openapi.Schema(
                                                         type=openapi.TYPE_STRING,
-                                                        description="Правильный код",
+                                                        description="Ожидаемые выходные данные",
                                                     ),
                                                 },
                                                 nullable=True,
@@ -704,7 +753,11 @@ class InterviewViewSet(viewsets.ModelViewSet):
     def get_tasks(self, request, pk=None):
         """
         Возвращает задания, связанные с интервью.
+        Поддерживает условные запросы (ETag и Last-Modified).
         """
+        return self.conditional_response(self.build_tasks_response, request, pk=pk)
+
+    def build_tasks_response(self, request, pk=None):
         try:
             interview = self.get_object()
         except Interview.DoesNotExist:
@@ -713,12 +766,17 @@ class InterviewViewSet(viewsets.ModelViewSet):
             )
 
         # Получение всех заданий, связанных с интервью
-        tasks = InterviewTaskItem.objects.filter(interview=interview).select_related(
-            "task_item"
+        tasks = list(
+            InterviewTaskItem.objects.filter(interview=interview).select_related("task_item")
         )
 
+        # Ключи ответов читаются из кэша одним запросом для всех заданий
+        answer_keys = get_answer_keys(task.task_item_id for task in tasks)
+
         # Использование сериализатора для формирования ответа
-        serializer = InterviewTaskItemDetailSerializer(tasks, many=True)
+        serializer = InterviewTaskItemDetailSerializer(
+            tasks, many=True, context={"answer_keys": answer_keys}
+        )
 
         return Response(
             {
@@ -745,7 +803,7 @@ class InterviewViewSet(viewsets.ModelViewSet):
             openapi.Parameter(
                 name="search",
                 in_=openapi.IN_QUERY,
-                description="Поиск отбора кандидата по электронной почте интервьюера или кандидата",
+                description="Поиск по началу электронной почты интервьюера или кандидата",
                 type=openapi.TYPE_STRING,
             ),
             openapi.Parameter(
@@ -821,14 +879,8 @@ class InterviewViewSet(viewsets.ModelViewSet):
             status_q = Q(status=status)  # Фильтрация по переданному статусу
             q_filter &= status_q  # Логика AND с другими фильтрами
 
-        # Фильтрация по поисковому запросу, если есть
-        search = request.query_params.get("search", None)
-        if search:
-            search_q = Q(selection__interviewer__email__icontains=search) | Q(selection__resume__candidate__email__icontains=search)
-            q_filter &= search_q  # Логика AND с другими фильтрами
-
-        # Применяем фильтрацию на queryset
-        selections = self.get_queryset().filter(q_filter)
+        # Применяем фильтрацию на queryset, поиск ?search= выполняет EmailSearchFilter
+        selections = self.filter_queryset(self.get_queryset()).filter(q_filter)
         page = self.paginate_queryset(selections)
 
         if page is not None:
@@ -874,4 +926,129 @@ class InterviewViewSet(viewsets.ModelViewSet):
             .order_by("status")
         )
 
-        return Response(data)
\ No newline at end of file
+        return Response(data)
+
+    @swagger_auto_schema(
+        operation_summary="Аналитика интервью по неделям",
+        operation_description=(
+            "Возвращает количество и продолжительность интервью, долю принятых кандидатов "
+            "и средние оценки из недельных агрегатов (InterviewWeeklyStats), с группировкой "
+            "по неделе, компании, интервьюеру и статусу. Период задается с точностью до недели: "
+            "учитываются недели, в которые попадают date_from и date_to."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                name="group_by",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description=f"Поля группировки через запятую: {', '.join(STATS_GROUPS)}. По умолчанию week",
+            ),
+            openapi.Parameter(
+                name="date_from",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                format="date",
+                description="Начало периода (YYYY-MM-DD)",
+            ),
+            openapi.Parameter(
+                name="date_to",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                format="date",
+                description="Конец периода (YYYY-MM-DD)",
+            ),
+            openapi.Parameter(
+                name="company",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                description="ID компании",
+            ),
+            openapi.Parameter(
+                name="interviewer",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                description="ID интервьюера",
+            ),
+        ],
+        responses={
+            200: openapi.Response(
+                description="Статистика по группам",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        properties={
+                            "week": openapi.Schema(
+                                type=openapi.TYPE_STRING, format="date", description="Понедельник недели"
+                            ),
+                            "company": openapi.Schema(type=openapi.TYPE_INTEGER, description="ID компании"),
+                            "interviewer": openapi.Schema(type=openapi.TYPE_INTEGER, description="ID интервьюера"),
+                            "status": openapi.Schema(type=openapi.TYPE_STRING, description="Статус интервью"),
+                            "interviews_count": openapi.Schema(
+                                type=openapi.TYPE_INTEGER, description="Количество интервью"
+                            ),
+                            "total_duration": openapi.Schema(
+                                type=openapi.TYPE_INTEGER, description="Суммарная продолжительность в минутах"
+                            ),
+                            "avg_duration": openapi.Schema(
+                                type=openapi.TYPE_NUMBER, description="Средняя продолжительность в минутах"
+                            ),
+                            "accepted_count": openapi.Schema(type=openapi.TYPE_INTEGER, description="Принято"),
+                            "rejected_count": openapi.Schema(type=openapi.TYPE_INTEGER, description="Отклонено"),
+                            "pass_rate": openapi.Schema(
+                                type=openapi.TYPE_NUMBER,
+                                description="Доля принятых среди интервью с результатом",
+                            ),
+                            "avg_hard_skills_rate": openapi.Schema(
+                                type=openapi.TYPE_NUMBER, description="Средняя оценка хард скиллов"
+                            ),
+                            "avg_soft_skills_rate": openapi.Schema(
+                                type=openapi.TYPE_NUMBER, description="Средняя оценка софт скиллов"
+                            ),
+                        },
+                    ),
+                ),
+            ),
+            400: "Недопустимые параметры",
+        },
+    )
+    @action(detail=False, methods=["get"], url_path="analytics")
+    def analytics(self, request):
+        """
+        Возвращает статистику интервью из недельных агрегатов без обращения к Interview.
+        """
+        group_by = request.query_params.get("group_by", "week").split(",")
+        unknown = [name for name in group_by if name not in STATS_GROUPS]
+        if unknown:
+            return Response(
+                {
+                    "detail": f"Недопустимая группировка: {', '.join(unknown)}. "
+                    f"Доступные значения: {', '.join(STATS_GROUPS)}."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        filters = {}
+        for param, lookup in (("date_from", "week__gte"), ("date_to", "week__lte")):
+            value = request.query_params.get(param)
+            if not value:
+                continue
+            try:
+                filters[lookup] = week_start(date.fromisoformat(value))
+            except ValueError:
+                return Response(
+                    {"detail": f"Параметр '{param}' должен быть датой в формате YYYY-MM-DD."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        for param in ("company", "interviewer"):
+            value = request.query_params.get(param)
+            if not value:
+                continue
+            if not value.isdigit():
+                return Response(
+                    {"detail": f"Параметр '{param}' должен быть целым числом."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            filters[f"{param}_id"] = int(value)
+
+        return Response(query_weekly_stats(group_by, **filters))
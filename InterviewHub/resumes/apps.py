@@ -5,3 +5,8 @@ class ResumesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "resumes"
     verbose_name = "Резюме"
+
+    def ready(self):
+        from InterviewHub.caching import register
+
+        register(self.get_model("Resume"))
@@ -2,7 +2,7 @@ from django.db import models
 from django.utils.timezone import now
 from users.models import Candidate
 from django.core.exceptions import ValidationError
-from simple_history.models import HistoricalRecords
+from audit.history import HistoricalRecords
 
 
 class Skill(models.Model):
@@ -79,6 +79,12 @@ class Resume(models.Model):
     class Meta:
         verbose_name = "Резюме"
         verbose_name_plural = "Резюме"
+        indexes = [
+            # Диапазоны дат в filter_by_date и filter_by_salary_and_experience
+            models.Index(fields=["created_at"], name="resume_created_at_idx"),
+            # Фильтры по зарплате в ResumeFilter
+            models.Index(fields=["desired_salary"], name="resume_desired_salary_idx"),
+        ]
 
     # Валидация на уровне модели
     def clean(self):
@@ -5,3 +5,9 @@ class SelectionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'selections'
     verbose_name = "Отбор кандидатов"
+
+    def ready(self):
+        from InterviewHub.caching import register
+        from . import signals  # noqa: F401
+
+        register(self.get_model("CompanySelection"))
@@ -0,0 +1,155 @@
+"""
+Архивация отклоненных отборов кандидатов.
+
+Отборы обрабатываются порциями по диапазонам id, каждая порция - в отдельной
+короткой транзакции. Зависимые записи (интервью, тестовые задания и их
+элементы) удаляются явно снизу вверх одним DELETE на таблицу, без сборщика
+каскадного удаления Django: он загружает каждую строку в память и вызывает
+сигналы simple_history для каждой из них.
+
+В режиме "jsonl" строки порции перед удалением дописываются в сжатый файл
+в SELECTION_ARCHIVE_DIR, этот файл и служит записью об удалении вместо
+исторических записей simple_history.
+
+Так как сигналов при удалении нет, недельная статистика интервью для недель
+удаленных интервью пересчитывается явно после коммита порции.
+"""
+
+import functools
+import gzip
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.timezone import now, timedelta
+
+from InterviewHub.caching import invalidate
+from interviews.models import Interview, InterviewTaskItem
+from interviews.stats import week_start
+from interviews.tasks import refresh_interview_stats
+from test_tasks.models import TestTask, TestTaskItem
+from .models import CompanySelection
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_MODES = ("jsonl", "delete")
+
+# Модель и фильтр, связывающий ее строки с id отборов порции. Порядок - порядок
+# выгрузки; удаление идет в обратном порядке, от зависимых записей к отборам.
+ARCHIVED_MODELS = [
+    (CompanySelection, "id__in"),
+    (Interview, "selection_id__in"),
+    (InterviewTaskItem, "interview__selection_id__in"),
+    (TestTask, "selection_id__in"),
+    (TestTaskItem, "test_task__selection_id__in"),
+]
+
+
+def rejected_selections(cutoff):
+    return CompanySelection.objects.filter(status="Отклонен", created_at__lt=cutoff)
+
+
+def write_chunk(archive, selection_ids):
+    """Дописывает в архив строки всех архивируемых моделей для порции отборов."""
+    for model, lookup in ARCHIVED_MODELS:
+        label = model._meta.label_lower
+        for row in model.objects.filter(**{lookup: selection_ids}).order_by("pk").values().iterator():
+            archive.write(json.dumps({"model": label, "fields": row}, cls=DjangoJSONEncoder, ensure_ascii=False))
+            archive.write("\n")
+    # Сбрасываем буфер, чтобы до удаления порции ее строки были в файле
+    archive.flush()
+
+
+def delete_chunk(selection_ids):
+    """Удаляет порцию отборов с зависимыми записями. Возвращает {метка модели: удалено строк}."""
+    deleted = {}
+    # Недели удаляемых интервью, статистику которых нужно пересчитать
+    weeks = {
+        week_start(start_time).isoformat()
+        for start_time in Interview.objects.filter(selection_id__in=selection_ids).values_list(
+            "start_time", flat=True
+        )
+    }
+    for model, lookup in reversed(ARCHIVED_MODELS):
+        queryset = model.objects.filter(**{lookup: selection_ids})
+        # _raw_delete выполняет DELETE без загрузки строк и без сигналов
+        deleted[model._meta.label_lower] = queryset._raw_delete(queryset.db)
+        if deleted[model._meta.label_lower]:
+            # Сигналов нет, поэтому кэш и ETag ответов API сбрасываются явно
+            transaction.on_commit(functools.partial(invalidate, model))
+    if weeks:
+        # Ошибка постановки в очередь не откатывает порцию: агрегаты недель
+        # в пределах INTERVIEW_STATS_REBUILD_WEEKS исправит rebuild_interview_stats
+        transaction.on_commit(lambda: refresh_interview_stats.delay(sorted(weeks)), robust=True)
+    return deleted
+
+
+def archive_path(started_at):
+    directory = settings.SELECTION_ARCHIVE_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / f"rejected-selections-{started_at:%Y%m%dT%H%M%S}.jsonl.gz"
+
+
+def archive_rejected_selections(cutoff=None, chunk_size=None, mode=None):
+    """
+    Архивирует отклоненные отборы, созданные раньше cutoff (по умолчанию
+    SELECTION_ARCHIVE_AFTER_DAYS дней назад). Возвращает сводку с числом
+    обработанных отборов, удаленных строк по моделям и скоростью.
+    """
+    started_at = now()
+    cutoff = cutoff or started_at - timedelta(days=settings.SELECTION_ARCHIVE_AFTER_DAYS)
+    chunk_size = chunk_size or settings.SELECTION_ARCHIVE_CHUNK_SIZE
+    mode = mode or settings.SELECTION_ARCHIVE_MODE
+    if mode not in ARCHIVE_MODES:
+        raise ValueError(f"Неизвестный режим архивации: {mode}")
+
+    path = archive_path(started_at) if mode == "jsonl" else None
+    archive = gzip.open(path, "wt", encoding="utf-8") if path else None
+    queryset = rejected_selections(cutoff)
+    selections = 0
+    deleted = {model._meta.label_lower: 0 for model, _ in ARCHIVED_MODELS}
+    started = time.monotonic()
+    last_id = 0
+    try:
+        while True:
+            with transaction.atomic():
+                # Блокируем порцию, чтобы отбор не изменили между выгрузкой и удалением
+                selection_ids = list(
+                    queryset.filter(id__gt=last_id)
+                    .order_by("id")
+                    .select_for_update(skip_locked=True)
+                    .values_list("id", flat=True)[:chunk_size]
+                )
+                if not selection_ids:
+                    break
+                if archive:
+                    write_chunk(archive, selection_ids)
+                for label, count in delete_chunk(selection_ids).items():
+                    deleted[label] += count
+            last_id = selection_ids[-1]
+            selections += len(selection_ids)
+            elapsed = time.monotonic() - started
+            logger.info(
+                "Архивация отборов: обработано %s (%.0f в секунду), последний id %s",
+                selections,
+                selections / elapsed if elapsed else 0,
+                last_id,
+            )
+    finally:
+        if archive:
+            archive.close()
+
+    elapsed = time.monotonic() - started
+    if path and not selections:
+        path.unlink()
+        path = None
+    return {
+        "selections": selections,
+        "deleted": deleted,
+        "archive": str(path) if path else None,
+        "seconds": round(elapsed, 2),
+        "per_second": round(selections / elapsed, 1) if elapsed else 0,
+    }
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Lower, Trim
+
+from interviews.models import Interview
+from selections.models import CompanySelection
+from users.models import User
+
+
+def backfill(queryset, chunk_size, **values):
+    """Обновляет поля порциями по диапазонам id коррелированным подзапросом."""
+    updated = 0
+    last_id = 0
+    while True:
+        ids = list(queryset.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:chunk_size])
+        if not ids:
+            return updated
+        updated += queryset.filter(id__gte=ids[0], id__lte=ids[-1]).update(**values)
+        last_id = ids[-1]
+
+
+class Command(BaseCommand):
+    help = "Заполняет email кандидата и интервьюера для поиска в отборах и интервью"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Размер порции при обновлении")
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+
+        selections = backfill(
+            CompanySelection.objects.all(),
+            chunk_size,
+            # Lower(Trim(...)) - то же, что normalize_email в сигналах
+            candidate_email=Lower(
+                Trim(Subquery(User.objects.filter(candidate__resume=OuterRef("resume_id")).values("email")[:1]))
+            ),
+            interviewer_email=Lower(
+                Trim(Subquery(User.objects.filter(interviewer=OuterRef("interviewer_id")).values("email")[:1]))
+            ),
+        )
+        self.stdout.write(f"Обновлено отборов: {selections}")
+
+        # Интервью копируют значения из уже заполненных отборов
+        selection = CompanySelection.objects.filter(pk=OuterRef("selection_id"))
+        interviews = backfill(
+            Interview.objects.all(),
+            chunk_size,
+            candidate_email=Subquery(selection.values("candidate_email")[:1]),
+            interviewer_email=Subquery(selection.values("interviewer_email")[:1]),
+        )
+        self.stdout.write(self.style.SUCCESS(f"Обновлено интервью: {interviews}"))
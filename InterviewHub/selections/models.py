@@ -1,6 +1,6 @@
 from django.db import models
 from resumes.models import Resume
-from simple_history.models import HistoricalRecords
+from audit.history import HistoricalRecords
 from users.models import Interviewer
 
 
@@ -24,7 +24,15 @@ class CompanySelection(models.Model):
     updated_at = models.DateTimeField(
         auto_now=True, verbose_name="Дата обновления"
     )
-    history = HistoricalRecords()
+    # Денормализованные email кандидата и интервьюера в нижнем регистре для поиска,
+    # заполняются сигналами из selections.signals
+    candidate_email = models.CharField(
+        max_length=254, blank=True, default="", editable=False, verbose_name="Email кандидата"
+    )
+    interviewer_email = models.CharField(
+        max_length=254, blank=True, default="", editable=False, verbose_name="Email интервьюера"
+    )
+    history = HistoricalRecords(excluded_fields=["candidate_email", "interviewer_email"])
 
     def __str__(self):
         return f"{self.resume.candidate.user.email} - {self.status}"
@@ -34,3 +42,22 @@ class CompanySelection(models.Model):
         verbose_name_plural = (
             "Отборы кандидатов"  # Название таблицы во множественном числе
         )
+        indexes = [
+            # Фильтрация по статусу (practical_filter, exclude_by_status) с сортировкой по дате
+            models.Index(fields=["status", "-created_at"], name="selection_status_created_idx"),
+            # Лента отборов: list и ?cursor= по (-created_at, -id)
+            models.Index(fields=["created_at", "id"], name="selection_created_id_idx"),
+            # Архивация отклоненных отборов порциями по id (selections.archive)
+            models.Index(
+                fields=["id", "created_at"],
+                condition=models.Q(status="Отклонен"),
+                name="selection_rejected_id_idx",
+            ),
+            # Поиск по началу email (EmailSearchFilter): LIKE 'prefix%' по индексу
+            models.Index(
+                fields=["candidate_email"], opclasses=["varchar_pattern_ops"], name="selection_cand_email_idx"
+            ),
+            models.Index(
+                fields=["interviewer_email"], opclasses=["varchar_pattern_ops"], name="selection_intv_email_idx"
+            ),
+        ]
@@ -63,3 +63,38 @@ class CompanySelectionSerializer(serializers.ModelSerializer):
         instance.save()
 
         return instance
+
+
+class CompanySelectionListSerializer(serializers.ModelSerializer):
+    """
+    Плоское представление отбора для списков. Все поля доступны через
+    select_related("interviewer__user", "interviewer__company", "resume__candidate__user").
+    """
+
+    interviewer_email = serializers.EmailField(
+        source="interviewer.user.email", read_only=True
+    )
+    interviewer_company = serializers.CharField(
+        source="interviewer.company.name", read_only=True
+    )
+    resume_candidate_email = serializers.EmailField(
+        source="resume.candidate.user.email", read_only=True
+    )
+    resume_desired_position = serializers.CharField(
+        source="resume.desired_position", read_only=True
+    )
+
+    class Meta:
+        model = CompanySelection
+        fields = [
+            "id",
+            "interviewer",
+            "resume",
+            "status",
+            "created_at",
+            "interviewer_email",
+            "interviewer_company",
+            "resume_candidate_email",
+            "resume_desired_position",
+        ]
+        read_only_fields = fields
@@ -0,0 +1,48 @@
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from InterviewHub.filters import normalize_email
+from resumes.models import Resume
+from users.models import Interviewer, User
+from .models import CompanySelection
+
+
+@receiver(pre_save, sender=CompanySelection)
+def fill_search_emails(sender, instance, **kwargs):
+    """Заполняет email кандидата и интервьюера для поиска по отборам."""
+    instance.candidate_email = normalize_email(instance.resume.candidate.user.email)
+    instance.interviewer_email = normalize_email(instance.interviewer.user.email)
+
+
+@receiver(post_save, sender=User)
+def sync_user_email(sender, instance, update_fields=None, **kwargs):
+    """Обновляет email в отборах пользователя при его изменении."""
+    if update_fields is not None and "email" not in update_fields:
+        return
+    email = normalize_email(instance.email)
+    CompanySelection.objects.filter(resume__candidate__user=instance).exclude(
+        candidate_email=email
+    ).update(candidate_email=email)
+    CompanySelection.objects.filter(interviewer__user=instance).exclude(
+        interviewer_email=email
+    ).update(interviewer_email=email)
+
+
+@receiver(post_save, sender=Interviewer)
+def sync_interviewer(sender, instance, created, **kwargs):
+    if created:
+        return
+    email = normalize_email(instance.user.email)
+    CompanySelection.objects.filter(interviewer=instance).exclude(
+        interviewer_email=email
+    ).update(interviewer_email=email)
+
+
+@receiver(post_save, sender=Resume)
+def sync_resume(sender, instance, created, **kwargs):
+    if created:
+        return
+    email = normalize_email(instance.candidate.user.email)
+    CompanySelection.objects.filter(resume=instance).exclude(
+        candidate_email=email
+    ).update(candidate_email=email)
@@ -1,3 +1,117 @@
-from django.test import TestCase
+import gzip
+import json
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.utils.timezone import make_aware
+
+from interviews.models import Interview, InterviewWeeklyStats
+from interviews.stats import rebuild_weekly_stats, week_start
+from interviews.tasks import refresh_interview_stats
+from resumes.models import Resume
+from test_tasks.models import TestTask
+from users.models import Candidate, Company, Interviewer, User
+
+from .archive import archive_rejected_selections
+from .models import CompanySelection
+
+
+@override_settings(HISTORY_SKIP_UNCHANGED=True, HISTORY_ASYNC=False)
+class CompanySelectionHistoryTests(TestCase):
+    def setUp(self):
+        company = Company.objects.create(name="Компания", location="Москва")
+        interviewer = Interviewer.objects.create(
+            user=User.objects.create_user(username="interviewer", email="interviewer@example.com"),
+            company=company,
+            position="Разработчик",
+        )
+        candidate = Candidate.objects.create(
+            user=User.objects.create_user(username="candidate", email="candidate@example.com"),
+            city="Москва",
+        )
+        resume = Resume.objects.create(candidate=candidate, desired_position="Разработчик", desired_salary=100)
+        self.selection = CompanySelection.objects.create(
+            interviewer=interviewer, resume=resume, status="На рассмотрении"
+        )
+
+    def test_save_without_changes_creates_no_history(self):
+        # updated_at (auto_now) меняется при каждом сохранении, но изменением не считается
+        self.selection.save()
+        self.assertEqual(self.selection.history.count(), 1)
+
+    def test_save_with_changes_creates_history(self):
+        self.selection.status = "Принят"
+        self.selection.save()
+        self.assertEqual(self.selection.history.count(), 2)
+
+
+class ArchiveRejectedSelectionsTests(TestCase):
+    def setUp(self):
+        company = Company.objects.create(name="Компания", location="Москва")
+        interviewer = Interviewer.objects.create(
+            user=User.objects.create_user(username="interviewer", email="interviewer@example.com"),
+            company=company,
+            position="Разработчик",
+        )
+        candidate = Candidate.objects.create(
+            user=User.objects.create_user(username="candidate", email="candidate@example.com"),
+            city="Москва",
+        )
+        resume = Resume.objects.create(candidate=candidate, desired_position="Разработчик", desired_salary=100)
+        self.rejected = CompanySelection.objects.create(interviewer=interviewer, resume=resume, status="Отклонен")
+        self.active = CompanySelection.objects.create(
+            interviewer=interviewer, resume=resume, status="На рассмотрении"
+        )
+        self.start_time = make_aware(datetime(2024, 5, 15, 12))
+        for selection in (self.rejected, self.active):
+            Interview.objects.create(
+                selection=selection,
+                start_time=self.start_time,
+                end_time=self.start_time + timedelta(hours=1),
+                type="Техническое",
+                status="Завершено",
+            )
+            TestTask.objects.create(
+                selection=selection,
+                start_time=self.start_time,
+                end_time=self.start_time + timedelta(hours=1),
+                duration=60,
+            )
+        rebuild_weekly_stats(week_start(self.start_time))
+        self.archive_dir = Path(self.enterContext(tempfile.TemporaryDirectory()))
+
+    def test_archive_removes_cascaded_rows_and_writes_jsonl(self):
+        cutoff = self.rejected.created_at + timedelta(seconds=1)
+        CompanySelection.objects.filter(pk=self.active.pk).update(created_at=cutoff)
+
+        with (
+            override_settings(SELECTION_ARCHIVE_DIR=self.archive_dir),
+            mock.patch.object(refresh_interview_stats, "delay", side_effect=refresh_interview_stats) as delay,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            summary = archive_rejected_selections(cutoff=cutoff, mode="jsonl")
+
+        self.assertEqual(summary["selections"], 1)
+        self.assertFalse(CompanySelection.objects.filter(pk=self.rejected.pk).exists())
+        self.assertFalse(Interview.objects.filter(selection_id=self.rejected.pk).exists())
+        self.assertFalse(TestTask.objects.filter(selection_id=self.rejected.pk).exists())
+        self.assertEqual(Interview.objects.filter(selection=self.active).count(), 1)
+        self.assertEqual(TestTask.objects.filter(selection=self.active).count(), 1)
+
+        with gzip.open(summary["archive"], "rt", encoding="utf-8") as archive:
+            rows = [json.loads(line) for line in archive]
+        self.assertEqual(
+            sorted(row["model"] for row in rows),
+            ["interviews.interview", "selections.companyselection", "test_tasks.testtask"],
+        )
+        self.assertTrue(all(row["fields"]["id"] for row in rows))
+
+        # Статистика недели пересчитана без удаленного интервью
+        week = week_start(self.start_time)
+        delay.assert_called_once_with([week.isoformat()])
+        self.assertEqual(
+            sum(InterviewWeeklyStats.objects.filter(week=week).values_list("interviews_count", flat=True)), 1
+        )
@@ -1,7 +1,8 @@
 from rest_framework import viewsets
-from rest_framework.filters import SearchFilter
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.pagination import PageNumberPagination
+from InterviewHub.caching import ConditionalViewSetMixin
+from InterviewHub.filters import EmailSearchFilter
+from InterviewHub.pagination import FeedPagination
 
 from django.db.models import Q
 from datetime import timedelta
@@ -12,22 +13,53 @@ from rest_framework import status
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
+from resumes.models import Resume
+from users.models import Candidate, Company, Interviewer, User
 from ..models import CompanySelection
-from ..serializers.company_selection_serializers import CompanySelectionSerializer
+from ..serializers.company_selection_serializers import (
+    CompanySelectionListSerializer,
+    CompanySelectionSerializer,
+)
 
 
-class StandardResultsSetPagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = "page_size"
-    max_page_size = 100
-
-
-class CompanySelectionViewSet(viewsets.ModelViewSet):
+class CompanySelectionViewSet(ConditionalViewSetMixin, viewsets.ModelViewSet):
     queryset = CompanySelection.objects.all()
     serializer_class = CompanySelectionSerializer
-    pagination_class = StandardResultsSetPagination
-    filter_backends = [SearchFilter]
-    search_fields = ["resume__candidate__user__email", "interviewer__user__email"]
+    pagination_class = FeedPagination
+    # Модели, из которых собирается список (ETag и Last-Modified)
+    conditional_models = [CompanySelection, Interviewer, User, Company, Resume, Candidate]
+    # Порядок ленты для режима ?cursor=
+    cursor_ordering = ("-created_at", "-id")
+    filter_backends = [EmailSearchFilter]
+    search_fields = ["candidate_email", "interviewer_email"]
+
+    # Действия, возвращающие списки отборов в плоском представлении
+    list_actions = ("list", "practical_filter", "exclude_by_status")
+
+    def get_queryset(self):
+        """
+        Подгружает связанные объекты одним запросом, чтобы количество
+        запросов не зависело от количества отборов на странице.
+        """
+        queryset = super().get_queryset().select_related(
+            "interviewer__user", "interviewer__company", "resume__candidate__user"
+        )
+        if self.action not in self.list_actions:
+            # Полное вложенное представление также включает навыки и опыт работы резюме
+            queryset = queryset.prefetch_related(
+                "resume__skills",
+                "resume__job_experiences",
+                "interviewer__user__groups",
+                "interviewer__user__user_permissions",
+                "resume__candidate__user__groups",
+                "resume__candidate__user__user_permissions",
+            )
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action in self.list_actions:
+            return CompanySelectionListSerializer
+        return super().get_serializer_class()
 
     @swagger_auto_schema(
         operation_summary="Получить список отборов кандидатов",
@@ -36,7 +68,7 @@ class CompanySelectionViewSet(viewsets.ModelViewSet):
             openapi.Parameter(
                 name="search",
                 in_=openapi.IN_QUERY,
-                description="Поиск отбора кандидата по электронной почте интервьюера или кандидата",
+                description="Поиск по началу электронной почты интервьюера или кандидата",
                 type=openapi.TYPE_STRING,
             ),
             openapi.Parameter(
@@ -53,6 +85,23 @@ class CompanySelectionViewSet(viewsets.ModelViewSet):
                 description="Количество элементов на странице",
                 default=10
             ),
+            openapi.Parameter(
+                name="cursor",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description=(
+                    "Курсор ленты. При наличии параметра (пустое значение - первая страница) "
+                    "используется keyset-пагинация: ссылки next/previous содержат курсор, "
+                    "а page не учитывается"
+                ),
+            ),
+            openapi.Parameter(
+                name="count",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=["exact", "approx"],
+                description="Подсчет общего количества в режиме курсора: точный или оценка (PostgreSQL)",
+            ),
         ],
         responses={
             200: openapi.Response(
@@ -93,6 +142,27 @@ class CompanySelectionViewSet(viewsets.ModelViewSet):
                                         type=openapi.TYPE_STRING,
                                         description="Статус отбора",
                                     ),
+                                    "created_at": openapi.Schema(
+                                        type=openapi.TYPE_STRING,
+                                        format=openapi.FORMAT_DATETIME,
+                                        description="Дата создания",
+                                    ),
+                                    "interviewer_email": openapi.Schema(
+                                        type=openapi.TYPE_STRING,
+                                        description="Email интервьюера",
+                                    ),
+                                    "interviewer_company": openapi.Schema(
+                                        type=openapi.TYPE_STRING,
+                                        description="Компания интервьюера",
+                                    ),
+                                    "resume_candidate_email": openapi.Schema(
+                                        type=openapi.TYPE_STRING,
+                                        description="Email кандидата",
+                                    ),
+                                    "resume_desired_position": openapi.Schema(
+                                        type=openapi.TYPE_STRING,
+                                        description="Желаемая должность из резюме",
+                                    ),
                                 },
                             ),
                         ),
@@ -388,7 +458,7 @@ class CompanySelectionViewSet(viewsets.ModelViewSet):
             openapi.Parameter(
                 name="search",
                 in_=openapi.IN_QUERY,
-                description="Поиск отбора кандидата по электронной почте интервьюера или кандидата",
+                description="Поиск по началу электронной почты интервьюера или кандидата",
                 type=openapi.TYPE_STRING,
             ),
             openapi.Parameter(
@@ -445,6 +515,27 @@ class CompanySelectionViewSet(viewsets.ModelViewSet):
                                         type=openapi.TYPE_STRING,
                                         description="Статус отбора",
                                     ),
+                                    "created_at": openapi.Schema(
+                                        type=openapi.TYPE_STRING,
+                                        format=openapi.FORMAT_DATETIME,
+                                        description="Дата создания",
+                                    ),
+                                    "interviewer_email": openapi.Schema(
+                                        type=openapi.TYPE_STRING,
+                                        description="Email интервьюера",
+                                    ),
+                                    "interviewer_company": openapi.Schema(
+                                        type=openapi.TYPE_STRING,
+                                        description="Компания интервьюера",
+                                    ),
+                                    "resume_candidate_email": openapi.Schema(
+                                        type=openapi.TYPE_STRING,
+                                        description="Email кандидата",
+                                    ),
+                                    "resume_desired_position": openapi.Schema(
+                                        type=openapi.TYPE_STRING,
+                                        description="Желаемая должность из резюме",
+                                    ),
                                 },
                             ),
                         ),
@@ -480,7 +571,7 @@ class CompanySelectionViewSet(viewsets.ModelViewSet):
         q_filter &= Q(interviewer__isnull=False)  # Логика AND для наличия интервьюера
 
         # Применяем фильтрацию на queryset
-        selections = self.get_queryset().filter(q_filter)
+        selections = self.filter_queryset(self.get_queryset()).filter(q_filter)
         page = self.paginate_queryset(selections)
 
         if page is not None:
@@ -647,6 +738,27 @@ class CompanySelectionViewSet(viewsets.ModelViewSet):
                                         type=openapi.TYPE_STRING,
                                         description="Статус отбора",
                                     ),
+                                    "created_at": openapi.Schema(
+                                        type=openapi.TYPE_STRING,
+                                        format=openapi.FORMAT_DATETIME,
+                                        description="Дата создания",
+                                    ),
+                                    "interviewer_email": openapi.Schema(
+                                        type=openapi.TYPE_STRING,
+                                        description="Email интервьюера",
+                                    ),
+                                    "interviewer_company": openapi.Schema(
+                                        type=openapi.TYPE_STRING,
+                                        description="Компания интервьюера",
+                                    ),
+                                    "resume_candidate_email": openapi.Schema(
+                                        type=openapi.TYPE_STRING,
+                                        description="Email кандидата",
+                                    ),
+                                    "resume_desired_position": openapi.Schema(
+                                        type=openapi.TYPE_STRING,
+                                        description="Желаемая должность из резюме",
+                                    ),
                                 },
                             ),
                         ),
@@ -672,7 +784,7 @@ class CompanySelectionViewSet(viewsets.ModelViewSet):
 
         # Разделяем статусы по запятой и формируем фильтр
         exclude_statuses = exclude_statuses.split(",")
-        queryset = self.get_queryset().exclude(status__in=exclude_statuses)
+        queryset = self.filter_queryset(self.get_queryset()).exclude(status__in=exclude_statuses)
 
         # Пагинация
         page = self.paginate_queryset(queryset)
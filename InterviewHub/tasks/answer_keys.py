@@ -0,0 +1,90 @@
+"""
+Ключи ответов для элементов задания.
+
+Ключ ответов TaskItem собирается из OpenQuestion, MultipleChoiceQuestion и
+CodeQuestion и хранится в кэше под отдельным ключом для каждого задания.
+Кэш сбрасывается сигналами из tasks.signals при изменении вопросов.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import CodeQuestion, MultipleChoiceQuestion, OpenQuestion
+
+
+def cache_key(task_item_id):
+    return f"task_answer_key_{task_item_id}"
+
+
+def empty_answer_key():
+    return {
+        "open_question": None,
+        "multiple_choice": [],
+        "code_question": None,
+    }
+
+
+def build_answer_keys(task_item_ids):
+    """
+    Собирает ключи ответов для набора заданий тремя запросами,
+    независимо от количества заданий.
+    """
+    answer_keys = {task_item_id: empty_answer_key() for task_item_id in task_item_ids}
+
+    # Для открытого вопроса и задания с кодом берется первый по id объект
+    open_questions = (
+        OpenQuestion.objects.filter(task_item_id__in=answer_keys)
+        .order_by("-id")
+        .values_list("task_item_id", "correct_answer")
+    )
+    for task_item_id, correct_answer in open_questions:
+        answer_keys[task_item_id]["open_question"] = correct_answer
+
+    choices = (
+        MultipleChoiceQuestion.objects.filter(task_item_id__in=answer_keys, is_correct_answer=True)
+        .order_by("id")
+        .values_list("task_item_id", "answer_text")
+    )
+    for task_item_id, answer_text in choices:
+        answer_keys[task_item_id]["multiple_choice"].append(answer_text)
+
+    code_questions = (
+        CodeQuestion.objects.filter(task_item_id__in=answer_keys)
+        .order_by("-id")
+        .values_list("task_item_id", "input_data", "output_data")
+    )
+    for task_item_id, input_data, output_data in code_questions:
+        answer_keys[task_item_id]["code_question"] = {
+            "input_data": input_data,
+            "output_data": output_data,
+        }
+
+    return answer_keys
+
+
+def get_answer_keys(task_item_ids):
+    """
+    Возвращает словарь {id задания: ключ ответов}. Ключи читаются из кэша
+    одним запросом, недостающие собираются из БД и сохраняются в кэш.
+    """
+    task_item_ids = set(task_item_ids)
+    cached = cache.get_many([cache_key(task_item_id) for task_item_id in task_item_ids])
+    answer_keys = {
+        task_item_id: cached[cache_key(task_item_id)]
+        for task_item_id in task_item_ids
+        if cache_key(task_item_id) in cached
+    }
+
+    missing = task_item_ids - answer_keys.keys()
+    if missing:
+        built = build_answer_keys(missing)
+        cache.set_many(
+            {cache_key(task_item_id): answer_key for task_item_id, answer_key in built.items()},
+            timeout=settings.TASK_ANSWER_KEY_TIMEOUT,
+        )
+        answer_keys.update(built)
+    return answer_keys
+
+
+def invalidate_answer_key(task_item_id):
+    cache.delete(cache_key(task_item_id))
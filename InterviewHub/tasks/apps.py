@@ -5,3 +5,14 @@ class TasksConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "tasks"
     verbose_name = "Задания"
+
+    def ready(self):
+        from InterviewHub.caching import register
+        from . import signals  # noqa: F401
+
+        register(
+            self.get_model("TaskItem"),
+            self.get_model("OpenQuestion"),
+            self.get_model("MultipleChoiceQuestion"),
+            self.get_model("CodeQuestion"),
+        )
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from tasks.models import TaskItem
+from tasks.search import inverted_index, update_search_vector, uses_postgres
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает поисковый индекс элементов задания (search_vector или индекс в памяти)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Размер порции при обновлении")
+
+    def handle(self, *args, **options):
+        queryset = TaskItem.objects.all()
+        if not uses_postgres(queryset):
+            inverted_index.reset()
+            inverted_index.ensure_loaded()
+            self.stdout.write("Индекс в памяти перестроен.")
+            return
+
+        # Порции по диапазонам id, чтобы не держать блокировку всей таблицы
+        chunk_size = options["chunk_size"]
+        updated = 0
+        last_id = 0
+        while True:
+            ids = list(
+                queryset.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+            updated += update_search_vector(TaskItem.objects.filter(id__gte=ids[0], id__lte=ids[-1]))
+            last_id = ids[-1]
+        self.stdout.write(self.style.SUCCESS(f"Обновлено заданий: {updated}"))
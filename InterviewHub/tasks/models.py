@@ -1,5 +1,7 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
-from simple_history.models import HistoricalRecords
+from audit.history import HistoricalRecords
 
 
 # Кастомный QuerySet
@@ -9,8 +11,10 @@ class TaskItemQuerySet(models.QuerySet):
         return self.filter(complexity=level)
 
     def contains_keyword(self, keyword):
-        """Ищет задания, содержащие ключевое слово в названии или условии."""
-        return self.filter(models.Q(title__icontains=keyword) | models.Q(task_condition__icontains=keyword))
+        """Ищет задания по ключевым словам в названии или условии, с сортировкой по релевантности."""
+        from .search import search_task_items
+
+        return search_task_items(keyword, self)
 
 # Кастомный менеджер
 class TaskItemManager(models.Manager):
@@ -27,7 +31,9 @@ class TaskItem(models.Model):
     title = models.CharField(max_length=255, verbose_name="Название задания")
     complexity = models.IntegerField(verbose_name="Сложность")
     task_condition = models.TextField(verbose_name="Условие задания")
-    history = HistoricalRecords()
+    # Полнотекстовый индекс названия и условия, обновляется в tasks.signals (PostgreSQL)
+    search_vector = SearchVectorField(null=True, editable=False)
+    history = HistoricalRecords(excluded_fields=["search_vector"])
 
     # Подключаем кастомный менеджер
     objects = TaskItemManager()
@@ -40,9 +46,24 @@ class TaskItem(models.Model):
         verbose_name_plural = (
             "Элементы задания"  # Название таблицы во множественном числе
         )
+        indexes = [GinIndex(fields=["search_vector"], name="taskitem_search_vector_idx")]
+
+
+class TaskQuestion(models.Model):
+    """Вопрос элемента задания (базовый класс без полей)."""
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Задание при загрузке: при переносе вопроса сбрасывается ключ ответов и прежнего задания
+        instance._loaded_task_item_id = instance.__dict__.get("task_item_id")
+        return instance
 
 
-class OpenQuestion(models.Model):
+class OpenQuestion(TaskQuestion):
     task_item = models.ForeignKey(
         TaskItem, on_delete=models.CASCADE, verbose_name="Элемент задания"
     )
@@ -58,7 +79,7 @@ class OpenQuestion(models.Model):
         )
 
 
-class MultipleChoiceQuestion(models.Model):
+class MultipleChoiceQuestion(TaskQuestion):
     task_item = models.ForeignKey(
         TaskItem, on_delete=models.CASCADE, verbose_name="Элемент задания"
     )
@@ -75,7 +96,7 @@ class MultipleChoiceQuestion(models.Model):
         )
 
 
-class CodeQuestion(models.Model):
+class CodeQuestion(TaskQuestion):
 
     task_item = models.ForeignKey(
         TaskItem, on_delete=models.CASCADE, verbose_name="Элемент задания"
@@ -0,0 +1,204 @@
+"""
+Поиск элементов задания по ключевым словам.
+
+На PostgreSQL используется полнотекстовый поиск по колонке
+TaskItem.search_vector (GIN-индекс) с ранжированием SearchRank. Колонка
+заполняется сигналами из tasks.signals при сохранении задания и командой
+rebuild_task_search для существующих данных.
+
+На остальных СУБД (локальная разработка на SQLite) используется
+инвертированный индекс в памяти процесса. Он строится при первом поиске
+и обновляется сигналами в текущем процессе.
+"""
+
+import bisect
+import re
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import CharField, F, Value
+from django.db.models.functions import Cast, Concat, StrIndex
+from rest_framework.filters import SearchFilter
+
+from .models import TaskItem
+
+# Вес совпадения в названии выше, чем в условии задания
+TITLE_WEIGHT = 2.0
+CONDITION_WEIGHT = 1.0
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text):
+    return [token.replace("ё", "е") for token in TOKEN_RE.findall((text or "").lower())]
+
+
+def search_vector():
+    """Выражение для заполнения TaskItem.search_vector: название с весом A, условие с весом B."""
+    config = settings.TASK_SEARCH_CONFIG
+    return SearchVector("title", weight="A", config=config) + SearchVector(
+        "task_condition", weight="B", config=config
+    )
+
+
+def update_search_vector(queryset):
+    """Пересчитывает search_vector для заданий из queryset одним UPDATE (PostgreSQL)."""
+    return queryset.update(search_vector=search_vector())
+
+
+def uses_postgres(queryset):
+    return connections[queryset.db].vendor == "postgresql"
+
+
+class InvertedIndex:
+    """
+    Инвертированный индекс заданий в памяти: токен -> {id задания: вес}.
+
+    Запрос разбивается на токены, каждый из которых должен совпасть с
+    началом хотя бы одного токена задания. Релевантность - сумма весов
+    совпадений (название весомее условия).
+    """
+
+    def __init__(self):
+        self._postings = defaultdict(dict)
+        self._tokens_by_item = {}
+        self._sorted_tokens = []
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def ensure_loaded(self):
+        with self._lock:
+            if self._loaded:
+                return
+            rows = TaskItem.objects.values_list("id", "title", "task_condition").iterator(chunk_size=2000)
+            for task_item_id, title, task_condition in rows:
+                self._add(task_item_id, title, task_condition)
+            self._sorted_tokens = sorted(self._postings)
+            self._loaded = True
+
+    def _add(self, task_item_id, title, task_condition):
+        """Добавляет задание в индекс. Возвращает токены, которых в индексе не было."""
+        weights = defaultdict(float)
+        for token in tokenize(title):
+            weights[token] += TITLE_WEIGHT
+        for token in tokenize(task_condition):
+            weights[token] += CONDITION_WEIGHT
+        new_tokens = set()
+        for token, weight in weights.items():
+            if token not in self._postings:
+                new_tokens.add(token)
+            self._postings[token][task_item_id] = weight
+        self._tokens_by_item[task_item_id] = set(weights)
+        return new_tokens
+
+    def _remove(self, task_item_id):
+        """Удаляет задание из индекса. Возвращает токены, которые больше не встречаются."""
+        removed_tokens = set()
+        for token in self._tokens_by_item.pop(task_item_id, ()):
+            postings = self._postings[token]
+            postings.pop(task_item_id, None)
+            if not postings:
+                del self._postings[token]
+                removed_tokens.add(token)
+        return removed_tokens
+
+    def _update_sorted_tokens(self, removed_tokens, new_tokens):
+        # Меняются только добавленные и исчезнувшие токены, без пересортировки всего списка
+        for token in removed_tokens - new_tokens:
+            del self._sorted_tokens[bisect.bisect_left(self._sorted_tokens, token)]
+        for token in new_tokens - removed_tokens:
+            bisect.insort(self._sorted_tokens, token)
+
+    def update(self, task_item):
+        with self._lock:
+            if not self._loaded:
+                return
+            removed_tokens = self._remove(task_item.pk)
+            new_tokens = self._add(task_item.pk, task_item.title, task_item.task_condition)
+            self._update_sorted_tokens(removed_tokens, new_tokens)
+
+    def remove(self, task_item_id):
+        with self._lock:
+            if not self._loaded:
+                return
+            self._update_sorted_tokens(self._remove(task_item_id), set())
+
+    def reset(self):
+        """Сбрасывает индекс, он будет построен заново при следующем поиске."""
+        with self._lock:
+            self._postings = defaultdict(dict)
+            self._tokens_by_item = {}
+            self._sorted_tokens = []
+            self._loaded = False
+
+    def search(self, query):
+        """Возвращает список id заданий, отсортированный по убыванию релевантности."""
+        self.ensure_loaded()
+        scores = None
+        with self._lock:
+            for term in set(tokenize(query)):
+                term_scores = defaultdict(float)
+                start = bisect.bisect_left(self._sorted_tokens, term)
+                for token in self._sorted_tokens[start:]:
+                    if not token.startswith(term):
+                        break
+                    for task_item_id, weight in self._postings[token].items():
+                        term_scores[task_item_id] += weight
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {
+                        task_item_id: score + term_scores[task_item_id]
+                        for task_item_id, score in scores.items()
+                        if task_item_id in term_scores
+                    }
+                if not scores:
+                    return []
+        if scores is None:
+            return []
+        return sorted(scores, key=lambda task_item_id: (-scores[task_item_id], task_item_id))
+
+
+inverted_index = InvertedIndex()
+
+
+def search_task_items(query, queryset=None):
+    """
+    Возвращает задания из queryset, подходящие под запрос, в порядке
+    убывания релевантности.
+    """
+    if queryset is None:
+        queryset = TaskItem.objects.all()
+
+    if uses_postgres(queryset):
+        search_query = SearchQuery(query, search_type="websearch", config=settings.TASK_SEARCH_CONFIG)
+        return (
+            queryset.filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F("search_vector"), search_query))
+            .order_by("-rank", "id")
+        )
+
+    ids = inverted_index.search(query)
+    if not ids:
+        return queryset.none()
+    # Порядок релевантности задается позицией id в строке ",12,5,40,": одна функция
+    # на строку вместо CASE с отдельной веткой для каждого найденного задания
+    positions = Value("," + ",".join(map(str, ids)) + ",")
+    ordering = StrIndex(positions, Concat(Value(","), Cast("id", CharField()), Value(",")))
+    return queryset.filter(pk__in=ids).order_by(ordering)
+
+
+class TaskItemSearchFilter(SearchFilter):
+    """
+    Фильтр ?search= для списка заданий через search_task_items вместо icontains
+    по полям search_fields.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+        return search_task_items(query, queryset)
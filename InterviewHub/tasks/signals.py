@@ -0,0 +1,52 @@
+import functools
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .answer_keys import invalidate_answer_key
+from .models import CodeQuestion, MultipleChoiceQuestion, OpenQuestion, TaskItem
+from .search import inverted_index, update_search_vector, uses_postgres
+
+
+@receiver(post_save, sender=OpenQuestion)
+@receiver(post_delete, sender=OpenQuestion)
+@receiver(post_save, sender=MultipleChoiceQuestion)
+@receiver(post_delete, sender=MultipleChoiceQuestion)
+@receiver(post_save, sender=CodeQuestion)
+@receiver(post_delete, sender=CodeQuestion)
+def reset_answer_key(sender, instance, **kwargs):
+    """
+    Сбрасывает ключ ответов задания при изменении любого из его вопросов,
+    а при переносе вопроса в другое задание - и ключ прежнего задания.
+    Сброс выполняется после коммита, чтобы параллельный запрос не закэшировал
+    ответы, прочитанные до завершения транзакции.
+    """
+    task_item_ids = {instance.task_item_id}
+    loaded_task_item_id = getattr(instance, "_loaded_task_item_id", None)
+    if loaded_task_item_id is not None:
+        task_item_ids.add(loaded_task_item_id)
+    instance._loaded_task_item_id = instance.task_item_id
+    for task_item_id in task_item_ids:
+        transaction.on_commit(functools.partial(invalidate_answer_key, task_item_id))
+
+
+@receiver(post_delete, sender=TaskItem)
+def drop_answer_key(sender, instance, **kwargs):
+    task_item_id = instance.pk
+    transaction.on_commit(lambda: invalidate_answer_key(task_item_id))
+
+
+@receiver(post_save, sender=TaskItem)
+def index_task_item(sender, instance, **kwargs):
+    """Обновляет поисковый индекс задания: search_vector на PostgreSQL, иначе индекс в памяти."""
+    queryset = TaskItem.objects.filter(pk=instance.pk)
+    if uses_postgres(queryset):
+        update_search_vector(queryset)
+    else:
+        inverted_index.update(instance)
+
+
+@receiver(post_delete, sender=TaskItem)
+def unindex_task_item(sender, instance, **kwargs):
+    inverted_index.remove(instance.pk)
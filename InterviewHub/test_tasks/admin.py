@@ -1,18 +1,14 @@
 from django.contrib import admin
 from import_export.admin import ImportExportModelAdmin
-from import_export.formats.base_formats import XLSX, CSV, JSON
+from exports.admin import StreamingExportMixin
 from .models import TestTask, TestTaskItem
 from .resources import TestTaskResource, TestTaskItemResource
 
 
 @admin.register(TestTask)
-class TestTaskAdmin(ImportExportModelAdmin):
+class TestTaskAdmin(StreamingExportMixin, ImportExportModelAdmin):
     resource_class = TestTaskResource
 
-    # Используем классы форматов из `import_export.formats.base_formats`
-    def get_export_formats(self):
-        return [XLSX, CSV, JSON]
-
     list_display = ("selection", "start_time", "end_time", "result", "duration")
     list_filter = (
         "result",
@@ -24,13 +20,9 @@ class TestTaskAdmin(ImportExportModelAdmin):
 
 
 @admin.register(TestTaskItem)
-class TestTaskItemAdmin(ImportExportModelAdmin):
+class TestTaskItemAdmin(StreamingExportMixin, ImportExportModelAdmin):
     resource_class = TestTaskItemResource
 
-    # Используем классы форматов из `import_export.formats.base_formats`
-    def get_export_formats(self):
-        return [XLSX, CSV, JSON]
-
     list_display = ("test_task", "task_item", "candidate_answer", "short_test_task")
     list_filter = ("test_task__selection__status",)  # Фильтр по статусу отбора
     search_fields = (
@@ -1,5 +1,5 @@
 from django.db import models
-from simple_history.models import HistoricalRecords
+from audit.history import HistoricalRecords
 
 
 class TestTask(models.Model):
@@ -1,13 +1,14 @@
 import io
 
 from import_export import resources, fields
+from imports.resources import BulkImportMixin
 from openpyxl.reader.excel import load_workbook
 from openpyxl.styles import PatternFill
 
 from .models import TestTask, TestTaskItem
 
 
-class TestTaskResource(resources.ModelResource):
+class TestTaskResource(BulkImportMixin, resources.ModelResource):
     candidate_email = fields.Field(
         column_name="Candidate Email", attribute="get_candidate_email"
     )
@@ -36,6 +37,10 @@ class TestTaskResource(resources.ModelResource):
             "status",
         )
 
+    def filter_export(self, queryset, **kwargs):
+        # Связи, которые читают поля и dehydrate-методы ресурса, загружаются тем же запросом
+        return queryset.select_related("selection__resume__candidate__user")
+
     def dehydrate_candidate_email(self, obj):
         return obj.selection.resume.candidate.user.email
 
@@ -52,7 +57,7 @@ class TestTaskResource(resources.ModelResource):
             return "Не завершено"
 
 
-class TestTaskItemResource(resources.ModelResource):
+class TestTaskItemResource(BulkImportMixin, resources.ModelResource):
     candidate_email = fields.Field(
         column_name="Candidate Email", attribute="get_candidate_email"
     )
@@ -77,6 +82,10 @@ class TestTaskItemResource(resources.ModelResource):
             "interviewer_comment",
         )
 
+    def filter_export(self, queryset, **kwargs):
+        # Связи, которые читают поля и dehydrate-методы ресурса, загружаются тем же запросом
+        return queryset.select_related("task_item", "test_task__selection__resume__candidate__user")
+
     def dehydrate_candidate_email(self, obj):
         return obj.test_task.selection.resume.candidate.user.email
 
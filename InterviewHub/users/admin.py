@@ -1,7 +1,15 @@
 from django.contrib import admin
 from django.utils.html import format_html
 
-from .models import User, Candidate, Company, Interviewer, UserActivity
+from .models import (
+    User,
+    Candidate,
+    Company,
+    Interviewer,
+    ActivityRoute,
+    UserActivity,
+    UserActivityHourly,
+)
 
 
 @admin.register(User)
@@ -62,8 +70,27 @@ class InterviewerAdmin(admin.ModelAdmin):
 
 @admin.register(UserActivity)
 class UserActivityAdmin(admin.ModelAdmin):
-    list_display = ('user', 'path', 'method', 'timestamp')  # Поля для отображения в списке
-    list_filter = ('method', 'timestamp')  # Фильтры в правой панели
-    search_fields = ('user', 'path', 'method')  # Поля для поиска
+    list_display = ('user', 'route', 'method', 'timestamp')  # Поля для отображения в списке
+    list_filter = ('method', 'route', 'timestamp')  # Фильтры в правой панели
+    search_fields = ('user__email',)  # Поля для поиска
+    list_select_related = ('user', 'route')
+    raw_id_fields = ('user',)
     ordering = ('-timestamp',)  # Сортировка по умолчанию (по дате, от нового к старому)
-    date_hierarchy = 'timestamp'  # Иерархия по дате
+    show_full_result_count = False  # Без COUNT(*) по всей таблице при поиске и фильтрации
+
+
+@admin.register(UserActivityHourly)
+class UserActivityHourlyAdmin(admin.ModelAdmin):
+    list_display = ('hour', 'user', 'route', 'method', 'requests_count')
+    list_filter = ('method', 'route', 'hour')
+    search_fields = ('user__email',)
+    list_select_related = ('user', 'route')
+    raw_id_fields = ('user',)
+    ordering = ('-hour',)
+    date_hierarchy = 'hour'
+
+
+@admin.register(ActivityRoute)
+class ActivityRouteAdmin(admin.ModelAdmin):
+    list_display = ('view_name', 'route')
+    search_fields = ('view_name', 'route')
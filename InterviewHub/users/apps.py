@@ -5,3 +5,17 @@ class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
     verbose_name = "Пользователи и кандидаты"
+
+    def ready(self):
+        from InterviewHub.caching import register
+        from .serializers.user_serializer import UserSerializer
+
+        # Модели, из которых собираются кэшированные ответы API пользователей
+        register(
+            self.get_model("Candidate"),
+            self.get_model("Company"),
+            self.get_model("Interviewer"),
+        )
+        # Пользователь выводится во вложенном UserSerializer: обновление last_login
+        # при входе (save(update_fields=["last_login"])) кэш не сбрасывает
+        register(self.get_model("User"), fields=UserSerializer.Meta.fields)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from users import partitions
+
+
+class Command(BaseCommand):
+    help = "Переводит таблицу активности пользователей в помесячно партиционированную (PostgreSQL)"
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Партиционирование поддерживается только для PostgreSQL.")
+
+        if partitions.is_partitioned():
+            created = partitions.ensure_partitions()
+            self.stdout.write("Таблица уже партиционирована.")
+        else:
+            created = partitions.convert_to_partitioned()
+            self.stdout.write(self.style.SUCCESS("Таблица переведена в партиционированную."))
+
+        for name in created:
+            self.stdout.write(f"Создана секция {name}")
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.3 on 2026-10-18 20:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserActivityHourly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField(verbose_name='Час')),
+                ('user', models.CharField(max_length=255, verbose_name='Пользователь')),
+                ('path', models.TextField(verbose_name='Путь')),
+                ('method', models.CharField(max_length=10, verbose_name='Метод')),
+                ('requests_count', models.PositiveIntegerField(default=0, verbose_name='Количество запросов')),
+            ],
+            options={
+                'verbose_name': 'Активность пользователей по часам',
+                'verbose_name_plural': 'Активность пользователей по часам',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='useractivity',
+            index=models.Index(fields=['timestamp'], name='useractivity_timestamp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useractivityhourly',
+            index=models.Index(fields=['path', 'hour'], name='activityhourly_path_hour_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='useractivityhourly',
+            constraint=models.UniqueConstraint(fields=('hour', 'user', 'path', 'method'), name='unique_user_activity_hour'),
+        ),
+    ]
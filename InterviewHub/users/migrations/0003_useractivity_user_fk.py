@@ -0,0 +1,146 @@
+"""
+Перевод UserActivity и UserActivityHourly со строк на внешние ключи.
+
+Раньше user хранил строку вида "Иван Иванов (ivan)", а path - полный путь
+запроса. AlterField со строки на внешний ключ привел бы к приведению
+"Иван Иванов (ivan)" к bigint и упал бы, поэтому переход выполняется явно:
+1. добавляется новый столбец user_ref (внешний ключ на пользователя);
+2. он заполняется по username в скобках в конце старой строки
+   ("Анонимус" и удаленные пользователи остаются с NULL);
+3. старые столбцы user и path удаляются, user_ref переименовывается в user.
+
+Маршрут (route) для старых записей не восстанавливается: полный путь
+содержит идентификаторы, а сопоставление с шаблонами URL зависит от
+текущего URLconf. У старых записей route остается NULL.
+
+Откат восстанавливает столбцы user и path пустыми: исходные строки
+после удаления не восстановить, поэтому обратная операция данных - noop.
+"""
+
+import re
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Размер диапазона id, обрабатываемого одним набором UPDATE
+BACKFILL_CHUNK_SIZE = 10000
+
+USERNAME_RE = re.compile(r"\(([^()]*)\)$")
+
+
+def backfill_model(model, user_ids):
+    labels = {}
+    last_id = model.objects.aggregate(models.Max("id"))["id__max"] or 0
+    for start in range(0, last_id + 1, BACKFILL_CHUNK_SIZE):
+        chunk = model.objects.filter(id__gte=start, id__lt=start + BACKFILL_CHUNK_SIZE)
+        for label in chunk.values_list("user", flat=True).distinct():
+            if label not in labels:
+                match = USERNAME_RE.search(label)
+                labels[label] = user_ids.get(match.group(1)) if match else None
+            if labels[label] is not None:
+                chunk.filter(user=label).update(user_ref_id=labels[label])
+
+
+def backfill_users(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    user_ids = dict(User.objects.values_list("username", "id"))
+    for model_name in ("UserActivity", "UserActivityHourly"):
+        backfill_model(apps.get_model("users", model_name), user_ids)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_useractivityhourly_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityRoute',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('route', models.CharField(max_length=255, unique=True, verbose_name='Шаблон маршрута')),
+                ('view_name', models.CharField(blank=True, max_length=255, verbose_name='Имя маршрута')),
+            ],
+            options={
+                'verbose_name': 'Маршрут',
+                'verbose_name_plural': 'Маршруты',
+            },
+        ),
+        migrations.RemoveConstraint(
+            model_name='useractivityhourly',
+            name='unique_user_activity_hour',
+        ),
+        migrations.RemoveIndex(
+            model_name='useractivityhourly',
+            name='activityhourly_path_hour_idx',
+        ),
+        migrations.AddField(
+            model_name='useractivity',
+            name='user_ref',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Пользователь'),
+        ),
+        migrations.AddField(
+            model_name='useractivityhourly',
+            name='user_ref',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Пользователь'),
+        ),
+        migrations.RunPython(backfill_users, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='useractivity',
+            name='user',
+        ),
+        migrations.RemoveField(
+            model_name='useractivity',
+            name='path',
+        ),
+        migrations.RemoveField(
+            model_name='useractivityhourly',
+            name='user',
+        ),
+        migrations.RemoveField(
+            model_name='useractivityhourly',
+            name='path',
+        ),
+        migrations.RenameField(
+            model_name='useractivity',
+            old_name='user_ref',
+            new_name='user',
+        ),
+        migrations.RenameField(
+            model_name='useractivityhourly',
+            old_name='user_ref',
+            new_name='user',
+        ),
+        migrations.AddField(
+            model_name='useractivity',
+            name='route',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, to='users.activityroute', verbose_name='Маршрут'),
+        ),
+        migrations.AddField(
+            model_name='useractivityhourly',
+            name='route',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, to='users.activityroute', verbose_name='Маршрут'),
+        ),
+        migrations.AddIndex(
+            model_name='useractivity',
+            index=models.Index(fields=['user', 'timestamp'], name='useractivity_user_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useractivity',
+            index=models.Index(fields=['route', 'timestamp'], name='useractivity_route_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useractivityhourly',
+            index=models.Index(fields=['hour'], name='activityhourly_hour_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useractivityhourly',
+            index=models.Index(fields=['route', 'hour'], name='activityhourly_route_hour_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useractivityhourly',
+            index=models.Index(fields=['user', 'hour'], name='activityhourly_user_hour_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.3 on 2026-10-18 20:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_useractivity_user_fk'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['city'], name='candidate_city_idx'),
+        ),
+    ]
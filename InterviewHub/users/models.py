@@ -44,6 +44,10 @@ class Candidate(models.Model):
     class Meta:
         verbose_name = "Кандидат"  # Название таблицы в единственном числе
         verbose_name_plural = "Кандидаты"  # Название таблицы во множественном числе
+        indexes = [
+            # Подсчет кандидатов по городу (count_by_city)
+            models.Index(fields=["city"], name="candidate_city_idx"),
+        ]
 
 
 class Company(models.Model):
@@ -92,15 +96,92 @@ class Interviewer(models.Model):
     def __str__(self):
         return f"{self.user.first_name} {self.user.last_name}"
 
+class ActivityRoute(models.Model):
+    """
+    Шаблон URL (маршрут), по которому был обработан запрос.
+    Записи активности ссылаются на маршрут по id вместо хранения полного пути.
+    """
+
+    route = models.CharField(max_length=255, unique=True, verbose_name="Шаблон маршрута")
+    view_name = models.CharField(max_length=255, blank=True, verbose_name="Имя маршрута")
+
+    class Meta:
+        verbose_name = "Маршрут"  # Название в единственном числе
+        verbose_name_plural = "Маршруты"  # Название во множественном числе
+
+    def __str__(self):
+        return self.view_name or self.route
+
+
 class UserActivity(models.Model):
-    user = models.CharField(max_length=255,  verbose_name="Пользователь")
-    path = models.TextField( verbose_name="Путь")
+    user = models.ForeignKey(
+        User,
+        null=True,
+        blank=True,
+        db_index=False,
+        on_delete=models.SET_NULL,
+        verbose_name="Пользователь",
+    )
+    route = models.ForeignKey(
+        ActivityRoute,
+        null=True,
+        blank=True,
+        db_index=False,
+        on_delete=models.PROTECT,
+        verbose_name="Маршрут",
+    )
     method = models.CharField(max_length=10,  verbose_name="Метод")
     timestamp = models.DateTimeField( verbose_name="Дата и время")
 
     class Meta:
         verbose_name = "Активность пользователей"  # Название в единственном числе
         verbose_name_plural = "Активности пользователей"  # Название во множественном числе
+        indexes = [
+            # Сортировка в админке и выборки по диапазону времени (ключ партиционирования)
+            models.Index(fields=["timestamp"], name="useractivity_timestamp_idx"),
+            # Аналитика по пользователю и по маршруту за период
+            models.Index(fields=["user", "timestamp"], name="useractivity_user_ts_idx"),
+            models.Index(fields=["route", "timestamp"], name="useractivity_route_ts_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.route_id} ({self.method}) at {self.timestamp}"
+
+
+class UserActivityHourly(models.Model):
+    """
+    Почасовой агрегат активности: количество запросов по пользователю, маршруту и методу.
+    Заполняется задачей users.tasks.rollup_user_activity.
+    """
+
+    hour = models.DateTimeField(verbose_name="Час")
+    user = models.ForeignKey(
+        User,
+        null=True,
+        blank=True,
+        db_index=False,
+        on_delete=models.SET_NULL,
+        verbose_name="Пользователь",
+    )
+    route = models.ForeignKey(
+        ActivityRoute,
+        null=True,
+        blank=True,
+        db_index=False,
+        on_delete=models.PROTECT,
+        verbose_name="Маршрут",
+    )
+    method = models.CharField(max_length=10, verbose_name="Метод")
+    requests_count = models.PositiveIntegerField(default=0, verbose_name="Количество запросов")
+
+    class Meta:
+        verbose_name = "Активность пользователей по часам"  # Название в единственном числе
+        verbose_name_plural = "Активность пользователей по часам"  # Название во множественном числе
+        indexes = [
+            models.Index(fields=["hour"], name="activityhourly_hour_idx"),
+            models.Index(fields=["route", "hour"], name="activityhourly_route_hour_idx"),
+            models.Index(fields=["user", "hour"], name="activityhourly_user_hour_idx"),
+        ]
 
     def __str__(self):
-        return f"{self.user} - {self.path} ({self.method}) at {self.timestamp}"
+        return f"{self.user_id} - {self.route_id} ({self.method}) {self.hour}: {self.requests_count}"
@@ -0,0 +1,190 @@
+"""
+Помесячное партиционирование таблицы UserActivity в PostgreSQL.
+
+Таблица переводится в партиционированную командой
+`python manage.py partition_user_activity`. После этого новые месячные
+секции создаются заранее, а устаревшие удаляются целиком (DROP TABLE)
+задачей users.tasks.purge_user_activity вместо построчного DELETE.
+"""
+
+import re
+from datetime import datetime
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import UserActivity
+
+TABLE = UserActivity._meta.db_table
+
+_BOUND_RE = re.compile(r"FROM \((?P<lower>.+?)\) TO \((?P<upper>.+?)\)")
+
+
+def month_start(value):
+    """Начало месяца (в текущей временной зоне) для указанного момента времени."""
+    value = timezone.localtime(value)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value, months):
+    """Сдвигает начало месяца на указанное количество месяцев."""
+    month_index = value.month - 1 + months
+    return value.replace(year=value.year + month_index // 12, month=month_index % 12 + 1)
+
+
+def is_partitioned():
+    """Проверяет, что таблица активности уже переведена в партиционированную."""
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = %s",
+            [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def _parse_bound(value):
+    if value in ("MINVALUE", "MAXVALUE"):
+        return None
+    return datetime.fromisoformat(value.strip("'"))
+
+
+def list_partitions():
+    """
+    Возвращает секции таблицы в виде списка (имя, нижняя граница, верхняя граница).
+    Для MINVALUE/MAXVALUE граница равна None, для секции DEFAULT обе границы None.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = %s",
+            [TABLE],
+        )
+        rows = cursor.fetchall()
+
+    partitions = []
+    for name, bound in rows:
+        match = _BOUND_RE.search(bound)
+        if match is None:
+            partitions.append((name, None, None))
+            continue
+        partitions.append(
+            (name, _parse_bound(match.group("lower")), _parse_bound(match.group("upper")))
+        )
+    return partitions
+
+
+def _overlaps(start, end, partitions):
+    for _, lower, upper in partitions:
+        if lower is None and upper is None:
+            continue  # секция DEFAULT
+        if (lower is None or lower < end) and (upper is None or start < upper):
+            return True
+    return False
+
+
+def ensure_partitions(months_ahead=2):
+    """
+    Создает месячные секции с текущего месяца на months_ahead месяцев вперед
+    и секцию DEFAULT для записей вне диапазонов. Возвращает имена созданных секций.
+    """
+    partitions = list_partitions()
+    created = []
+    with connection.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE IF NOT EXISTS "{TABLE}_default" PARTITION OF "{TABLE}" DEFAULT')
+
+        start = month_start(timezone.now())
+        for _ in range(months_ahead + 1):
+            end = add_months(start, 1)
+            if not _overlaps(start, end, partitions):
+                name = f"{TABLE}_p{start:%Y%m}"
+                cursor.execute(
+                    f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{TABLE}" '
+                    "FOR VALUES FROM (%s) TO (%s)",
+                    [start, end],
+                )
+                created.append(name)
+            start = end
+    return created
+
+
+def drop_partitions_before(cutoff):
+    """
+    Удаляет секции, все записи которых старше cutoff. Возвращает имена удаленных секций.
+    """
+    dropped = []
+    with connection.cursor() as cursor:
+        for name, _, upper in list_partitions():
+            if upper is not None and upper <= cutoff:
+                cursor.execute(f'DROP TABLE "{name}"')
+                dropped.append(name)
+    return dropped
+
+
+def convert_to_partitioned():
+    """
+    Переводит обычную таблицу активности в партиционированную по "timestamp".
+
+    Существующая таблица переименовывается в секцию {TABLE}_legacy, которая
+    покрывает все накопленные записи до конца месяца последней записи.
+    Новые записи попадают в месячные секции, созданные ensure_partitions.
+    Индексы, внешние ключи и последовательность id переносятся на новую таблицу.
+    """
+    legacy = f"{TABLE}_legacy"
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE "{TABLE}" IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(f'SELECT MAX(id), MAX("timestamp") FROM "{TABLE}"')
+        max_id, max_timestamp = cursor.fetchone()
+        boundary = add_months(month_start(max_timestamp or timezone.now()), 1)
+
+        # Индексы остаются у старой таблицы, поэтому освобождаем их имена для новой
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE tablename = %s AND indexname NOT LIKE %s",
+            [TABLE, "%_pkey"],
+        )
+        indexes = cursor.fetchall()
+        # LIKE не копирует внешние ключи: они пересоздаются на новой таблице,
+        # откуда наследуются секциями (в том числе будущими месячными)
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [TABLE],
+        )
+        foreign_keys = cursor.fetchall()
+        for index_name, _ in indexes:
+            cursor.execute(f'ALTER INDEX "{index_name}" RENAME TO "{index_name[:56]}_legacy"')
+
+        cursor.execute(f'ALTER TABLE "{TABLE}" RENAME TO "{legacy}"')
+        # Секция не может иметь собственный identity-столбец
+        cursor.execute(f'ALTER TABLE "{legacy}" ALTER COLUMN id DROP IDENTITY IF EXISTS')
+        cursor.execute(
+            f'CREATE TABLE "{TABLE}" (LIKE "{legacy}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+            'PARTITION BY RANGE ("timestamp")'
+        )
+        # Первичный ключ партиционированной таблицы обязан включать ключ секционирования
+        cursor.execute(f'ALTER TABLE "{TABLE}" ADD PRIMARY KEY (id, "timestamp")')
+        cursor.execute(f'CREATE SEQUENCE "{TABLE}_id_seq" OWNED BY "{TABLE}".id')
+        cursor.execute(f"ALTER TABLE \"{TABLE}\" ALTER COLUMN id SET DEFAULT nextval('\"{TABLE}_id_seq\"')")
+        if max_id is not None:
+            cursor.execute(f"SELECT setval('\"{TABLE}_id_seq\"', %s)", [max_id])
+
+        for _, index_def in indexes:
+            cursor.execute(index_def)
+        for constraint_name, constraint_def in foreign_keys:
+            # Определение берется из pg_get_constraintdef и включает
+            # DEFERRABLE INITIALLY DEFERRED, как у внешних ключей Django.
+            # При ATTACH PARTITION такой же ключ секции становится дочерним
+            cursor.execute(f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{constraint_name}" {constraint_def}')
+
+        cursor.execute(
+            f'ALTER TABLE "{TABLE}" ATTACH PARTITION "{legacy}" '
+            "FOR VALUES FROM (MINVALUE) TO (%s)",
+            [boundary],
+        )
+    return ensure_partitions()
@@ -1,27 +1,145 @@
 import json
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncHour
 from django.utils.dateparse import parse_datetime
+from django.utils.timezone import now
 from celery import shared_task
-from .models import UserActivity
+from . import partitions
+from .models import ActivityRoute, UserActivity, UserActivityHourly
 import redis
 
+logger = logging.getLogger('user_activity')
+
+# Кэш соответствия шаблон маршрута -> id в пределах процесса воркера
+_route_ids = {}
+
+
+def pop_activity_chunk(redis_client, key, size):
+    """
+    Атомарно забирает из хвоста списка до size самых старых записей.
+
+    LRANGE и LTRIM выполняются в одной транзакции MULTI/EXEC, поэтому
+    параллельные LPUSH из middleware не теряются и не читаются дважды.
+    Записи возвращаются в порядке поступления.
+    """
+    pipe = redis_client.pipeline(transaction=True)
+    pipe.lrange(key, -size, -1)
+    pipe.ltrim(key, 0, -size - 1)
+    chunk, _ = pipe.execute()
+    chunk.reverse()
+    return chunk
+
+
+def resolve_route_ids(visits):
+    """
+    Возвращает словарь {шаблон маршрута: id ActivityRoute} для маршрутов из порции,
+    создавая недостающие записи одним bulk_create.
+    """
+    routes = {
+        visit["route"]: visit.get("view_name") or ""
+        for visit in visits
+        if visit.get("route") and visit["route"] not in _route_ids
+    }
+    if routes:
+        ActivityRoute.objects.bulk_create(
+            [ActivityRoute(route=route, view_name=view_name) for route, view_name in routes.items()],
+            ignore_conflicts=True,
+        )
+        _route_ids.update(
+            ActivityRoute.objects.filter(route__in=routes).values_list("route", "id")
+        )
+    return _route_ids
+
 
 @shared_task
 def save_user_activity_to_db():
-    redis_client = redis.StrictRedis(host='redis', port=6379, db=0)
-    activities = []
+    redis_client = redis.StrictRedis.from_url(settings.REDIS_URL)
+    key = settings.USER_ACTIVITY_KEY
+    chunk_size = settings.USER_ACTIVITY_DRAIN_CHUNK_SIZE
+    saved = 0
+
+    # Разбираем очередь фиксированными порциями, ограничивая объем работы за запуск
+    for _ in range(settings.USER_ACTIVITY_DRAIN_MAX_CHUNKS):
+        chunk = pop_activity_chunk(redis_client, key, chunk_size)
+        if not chunk:
+            break
+
+        visits = [json.loads(visit_data) for visit_data in chunk]
+        route_ids = resolve_route_ids(visits)
+
+        activities = []
+        for visit in visits:
+            # Создаем объект UserActivity и добавляем его в список
+            activities.append(UserActivity(
+                user_id=visit.get("user_id"),
+                route_id=route_ids.get(visit.get("route")),
+                method=visit["method"],
+                timestamp=parse_datetime(visit["timestamp"]),
+            ))
+        UserActivity.objects.bulk_create(activities, batch_size=chunk_size)
+        saved += len(activities)
+
+        if len(chunk) < chunk_size:
+            break
+
+    backlog = redis_client.llen(key)
+    logger.info("Сохранено %s записей активности, в очереди осталось %s", saved, backlog)
+    return {"saved": saved, "backlog": backlog}
+
+
+@shared_task
+def rollup_user_activity():
+    """
+    Пересчитывает почасовые агрегаты активности за последние
+    USER_ACTIVITY_ROLLUP_WINDOW_HOURS часов, включая текущий час.
+    """
+    current_hour = now().replace(minute=0, second=0, microsecond=0)
+    window_start = current_hour - timedelta(hours=settings.USER_ACTIVITY_ROLLUP_WINDOW_HOURS)
+
+    rows = (
+        UserActivity.objects.filter(timestamp__gte=window_start)
+        .annotate(hour=TruncHour("timestamp"))
+        .values("hour", "user_id", "route_id", "method")
+        .annotate(requests_count=Count("id"))
+        .order_by()
+    )
+    rollups = [UserActivityHourly(**row) for row in rows]
+
+    # Окно пересчитывается целиком, поэтому старые агрегаты за него заменяются новыми
+    with transaction.atomic():
+        UserActivityHourly.objects.filter(hour__gte=window_start).delete()
+        UserActivityHourly.objects.bulk_create(rollups, batch_size=1000)
+    return {"rows": len(rollups)}
+
+
+@shared_task
+def purge_user_activity():
+    """
+    Удаляет активность старше USER_ACTIVITY_RETENTION_DAYS дней.
+
+    Для партиционированной таблицы заранее создаются следующие месячные секции,
+    а устаревшие удаляются целиком. Иначе записи удаляются порциями по id.
+    """
+    cutoff = now() - timedelta(days=settings.USER_ACTIVITY_RETENTION_DAYS)
+
+    if partitions.is_partitioned():
+        created = partitions.ensure_partitions()
+        dropped = partitions.drop_partitions_before(cutoff)
+        logger.info("Секции активности: создано %s, удалено %s", created, dropped)
+        return {"created": created, "dropped": dropped}
 
+    deleted = 0
     while True:
-        visit_data = redis_client.rpop("user_activity")
-        if not visit_data:
+        ids = list(
+            UserActivity.objects.filter(timestamp__lt=cutoff)
+            .values_list("id", flat=True)[:settings.USER_ACTIVITY_DRAIN_CHUNK_SIZE]
+        )
+        if not ids:
             break
-        visit = json.loads(visit_data)
-        # Создаем объект UserActivity и добавляем его в список
-        activities.append(UserActivity(
-            user=visit["user"],
-            path=visit["path"],
-            method=visit["method"],
-            timestamp=parse_datetime(visit["timestamp"]),
-        ))
-
-    if activities:
-        UserActivity.objects.bulk_create(activities)
+        deleted += UserActivity.objects.filter(id__in=ids).delete()[0]
+    logger.info("Удалено %s устаревших записей активности", deleted)
+    return {"deleted": deleted}
@@ -1,3 +1,50 @@
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.db import IntegrityError, connection, transaction
 from django.test import TestCase
+from django.utils.timezone import now
+
+from . import partitions
+from .models import ActivityRoute, User, UserActivity
+
+
+@skipUnless(connection.vendor == "postgresql", "Партиционирование поддерживается только в PostgreSQL")
+class PartitionUserActivityTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="ivan", email="ivan@example.com")
+        self.route = ActivityRoute.objects.create(route="api/interviews/", view_name="interview-list")
+
+    def create_activity(self, timestamp, **kwargs):
+        kwargs.setdefault("user", self.user)
+        return UserActivity.objects.create(route=self.route, method="GET", timestamp=timestamp, **kwargs)
+
+    def foreign_keys(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+                [table],
+            )
+            return cursor.fetchone()[0]
+
+    def test_convert_populated_table(self):
+        old = self.create_activity(now() - timedelta(days=40))
+        self.create_activity(now() - timedelta(days=1))
+
+        partitions.convert_to_partitioned()
+
+        self.assertTrue(partitions.is_partitioned())
+        # Последовательность id продолжается с максимального id старой таблицы
+        new = self.create_activity(now())
+        self.assertGreater(new.pk, old.pk)
+        self.assertEqual(UserActivity.objects.count(), 3)
+        self.assertEqual(UserActivity.objects.get(pk=old.pk).user, self.user)
+
+        # Внешние ключи на пользователя и маршрут есть у родителя и у секций
+        self.assertEqual(self.foreign_keys(partitions.TABLE), 2)
+        for partition, _, _ in partitions.list_partitions():
+            self.assertEqual(self.foreign_keys(partition), 2)
 
-# Create your tests here.
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            connection.cursor().execute("SET CONSTRAINTS ALL IMMEDIATE")
+            self.create_activity(now(), user_id=self.user.pk + 1000)
@@ -1,4 +1,3 @@
-from django.core.cache import cache
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter
@@ -7,9 +6,10 @@ from rest_framework.pagination import PageNumberPagination
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from rest_framework.response import Response
-from ..models import Candidate
+from InterviewHub.caching import CachedViewSetMixin
+from ..models import Candidate, User
 from ..serializers.candidate_serializer import CandidateSerializer
-from django.shortcuts import get_object_or_404
+from django.http import Http404
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -18,11 +18,14 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 100
 
 
-class CandidateViewSet(viewsets.ModelViewSet):
+class CandidateViewSet(CachedViewSetMixin, viewsets.ModelViewSet):
     """
     API для управления кандидатами.
     """
 
+    cache_prefix = "candidates"
+    cache_models = [Candidate, User]
+
     queryset = Candidate.objects.all()
     serializer_class = CandidateSerializer
     pagination_class = StandardResultsSetPagination
@@ -91,17 +94,7 @@ class CandidateViewSet(viewsets.ModelViewSet):
         """
         Получить список кандидатов с поддержкой кэширования.
         """
-        # Генерация ключа для кэша с учётом параметров запроса
-        cache_key = f"candidates_{request.query_params}"
-        cached_response = cache.get(cache_key)
-
-        if cached_response is not None:
-            return Response(cached_response)
-
-        # Получение данных через стандартный метод
-        response = super().list(request, *args, **kwargs)
-        cache.set(cache_key, response.data, timeout=60 * 15)  # Кэш на 15 минут
-        return response
+        return super().list(request, *args, **kwargs)
 
     @swagger_auto_schema(
         operation_summary="Создать нового кандидата",
@@ -151,12 +144,9 @@ class CandidateViewSet(viewsets.ModelViewSet):
     )
     def create(self, request, *args, **kwargs):
         """
-        Создать кандидата и очистить кэш списка.
+        Создать кандидата. Кэш списка сбрасывается сигналом post_save.
         """
-        response = super().create(request, *args, **kwargs)
-        if response.status_code == 201:
-            cache.delete_pattern("candidates_*")
-        return response
+        return super().create(request, *args, **kwargs)
 
     @swagger_auto_schema(
         operation_summary="Получить информацию о кандидате",
@@ -175,17 +165,7 @@ class CandidateViewSet(viewsets.ModelViewSet):
         """
         Получить информацию о кандидате с поддержкой кэширования.
         """
-        candidate_id = kwargs.get("pk")
-        cache_key = f"candidate_{candidate_id}"
-
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
-
-        response = super().retrieve(request, *args, **kwargs)
-        if response.status_code == 200:
-            cache.set(cache_key, response.data, timeout=60 * 15)
-        return response
+        return super().retrieve(request, *args, **kwargs)
 
     @swagger_auto_schema(
         operation_summary="Обновить информацию о кандидате",
@@ -233,14 +213,9 @@ class CandidateViewSet(viewsets.ModelViewSet):
     )
     def update(self, request, *args, **kwargs):
         """
-        Полностью обновить информацию о кандидате и очистить кэш.
+        Полностью обновить информацию о кандидате. Кэш сбрасывается сигналом post_save.
         """
-        candidate_id = kwargs.get("pk")
-        response = super().update(request, *args, **kwargs)
-        if response.status_code == 200:
-            cache.delete_pattern("candidates_*")
-            cache.delete(f"candidate_{candidate_id}")
-        return response
+        return super().update(request, *args, **kwargs)
 
     @swagger_auto_schema(
         operation_summary="Частично обновить информацию о кандидате",
@@ -288,14 +263,9 @@ class CandidateViewSet(viewsets.ModelViewSet):
     )
     def partial_update(self, request, *args, **kwargs):
         """
-        Частично обновить информацию о кандидате и очистить кэш.
+        Частично обновить информацию о кандидате. Кэш сбрасывается сигналом post_save.
         """
-        candidate_id = kwargs.get("pk")
-        response = super().partial_update(request, *args, **kwargs)
-        if response.status_code == 200:
-            cache.delete_pattern("candidates_*")
-            cache.delete(f"candidate_{candidate_id}")
-        return response
+        return super().partial_update(request, *args, **kwargs)
 
     @swagger_auto_schema(
         operation_summary="Удалить кандидата",
@@ -312,14 +282,9 @@ class CandidateViewSet(viewsets.ModelViewSet):
     )
     def destroy(self, request, *args, **kwargs):
         """
-        Удалить кандидата и очистить кэш.
+        Удалить кандидата. Кэш сбрасывается сигналом post_delete.
         """
-        candidate_id = kwargs.get("pk")
-        response = super().destroy(request, *args, **kwargs)
-        if response.status_code == 204:
-            cache.delete_pattern("candidates_*")
-            cache.delete(f"candidate_{candidate_id}")
-        return response
+        return super().destroy(request, *args, **kwargs)
 
     @swagger_auto_schema(
         operation_summary="Подсчитать кандидатов из города",
@@ -357,11 +322,10 @@ class CandidateViewSet(viewsets.ModelViewSet):
                 status=400,
             )
 
-        # Проверяем, существует ли хотя бы один кандидат в указанном городе
-        candidate = get_object_or_404(Candidate, city=city)
-
-        # Подсчитываем количество кандидатов
+        # Подсчитываем количество кандидатов, город без кандидатов считается ненайденным
         candidate_count = Candidate.objects.filter(city=city).count()
+        if not candidate_count:
+            raise Http404
 
         return Response({"city": city, "candidate_count": candidate_count})
 
@@ -1,4 +1,3 @@
-from django.core.cache import cache
 from rest_framework import viewsets, status
 from rest_framework.filters import SearchFilter
 from django_filters.rest_framework import DjangoFilterBackend
@@ -22,6 +21,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.pagination import PageNumberPagination
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
+from InterviewHub.caching import CachedViewSetMixin
 from ..models import Company
 from ..serializers.company_serializer import CompanySerializer
 
@@ -32,11 +32,14 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 100
 
 
-class CompanyViewSet(viewsets.ModelViewSet):
+class CompanyViewSet(CachedViewSetMixin, viewsets.ModelViewSet):
     """
     API для управления компаниями.
     """
 
+    cache_prefix = "companies"
+    cache_models = [Company]
+
     queryset = Company.objects.all()
     serializer_class = CompanySerializer
     pagination_class = StandardResultsSetPagination
@@ -103,21 +106,7 @@ class CompanyViewSet(viewsets.ModelViewSet):
         """
         Получить список компаний с поддержкой кэширования.
         """
-        # Создаём ключ для кэша на основе параметров запроса
-        cache_key = f"companies_{request.query_params.urlencode()}"
-        cached_data = cache.get(cache_key)
-
-        if cached_data:
-            # Возвращаем кэшированные данные
-            return Response(cached_data)
-
-        # Получаем данные через стандартный метод
-        response = super().list(request, *args, **kwargs)
-
-        # Сохраняем данные в кэш на 15 минут
-        cache.set(cache_key, response.data, timeout=60 * 15)
-
-        return response
+        return super().list(request, *args, **kwargs)
 
     @swagger_auto_schema(
         operation_summary="Создать новую компанию",
@@ -173,12 +162,9 @@ class CompanyViewSet(viewsets.ModelViewSet):
     )
     def create(self, request, *args, **kwargs):
         """
-        Создание компании и очистка кэша списка компаний.
+        Создание компании. Кэш списка сбрасывается сигналом post_save.
         """
-        response = super().create(request, *args, **kwargs)
-        if response.status_code == 201:
-            cache.delete_pattern("companies_*")
-        return response
+        return super().create(request, *args, **kwargs)
 
 
     @swagger_auto_schema(
@@ -198,18 +184,6 @@ class CompanyViewSet(viewsets.ModelViewSet):
         """
         Получение информации о компании с поддержкой кэширования.
         """
-        # Получаем ID компании из параметров
-        company_id = kwargs.get("pk")
-
-        # Формируем ключ для кэша
-        cache_key = f"company_{company_id}"
-
-        # Проверяем, есть ли данные в кэше
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
-
-        # Если данных нет в кэше, получаем через стандартный метод
         try:
             response = super().retrieve(request, *args, **kwargs)
             return response
@@ -228,14 +202,9 @@ class CompanyViewSet(viewsets.ModelViewSet):
     )
     def update(self, request, *args, **kwargs):
         """
-        Обновление компании и очистка кэша.
+        Обновление компании. Кэш сбрасывается сигналом post_save.
         """
-        company_id = kwargs.get("pk")
-        response = super().update(request, *args, **kwargs)
-        if response.status_code == 200:
-            cache.delete_pattern("companies_*")
-            cache.delete(f"company_{company_id}")
-        return response
+        return super().update(request, *args, **kwargs)
 
     @swagger_auto_schema(
         operation_summary="Частично обновить информацию о компании",
@@ -257,14 +226,9 @@ class CompanyViewSet(viewsets.ModelViewSet):
     )
     def partial_update(self, request, *args, **kwargs):
         """
-        Частичное обновление компании и очистка кэша.
+        Частичное обновление компании. Кэш сбрасывается сигналом post_save.
         """
-        company_id = kwargs.get("pk")
-        response = super().partial_update(request, *args, **kwargs)
-        if response.status_code == 200:
-            cache.delete_pattern("companies_*")
-            cache.delete(f"company_{company_id}")
-        return response
+        return super().partial_update(request, *args, **kwargs)
 
     @swagger_auto_schema(
         operation_summary="Удалить компанию",
@@ -281,22 +245,6 @@ class CompanyViewSet(viewsets.ModelViewSet):
     )
     def destroy(self, request, *args, **kwargs):
         """
-        Удаление компании и очистка кэша, связанного с компаниями.
+        Удаление компании. Кэш сбрасывается сигналом post_delete.
         """
-        # Получаем ID удаляемой компании
-        instance_id = kwargs.get("pk")
-
-        # Удаляем запись через стандартный метод
-        response = super().destroy(request, *args, **kwargs)
-
-        if response.status_code == 204:  # Удаление прошло успешно
-            # Удаляем кэш, связанный со списком компаний
-            cache_key_pattern = "companies_"
-            for key in cache.keys(f"{cache_key_pattern}*"):
-                cache.delete(key)
-
-            # Удаляем кэш, связанный с конкретной компанией (если используется)
-            specific_cache_key = f"company_{instance_id}"
-            cache.delete(specific_cache_key)
-
-        return response
+        return super().destroy(request, *args, **kwargs)
@@ -1,10 +1,8 @@
-from django.core.cache import cache
 from rest_framework import viewsets
 from rest_framework.filters import SearchFilter
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.pagination import PageNumberPagination
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework.response import Response
 
 from ..models import Interviewer
 from ..serializers.inteview_serializer import InterviewerSerializer
@@ -21,7 +19,8 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.pagination import PageNumberPagination
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from ..models import Interviewer
+from InterviewHub.caching import CachedViewSetMixin
+from ..models import Company, Interviewer, User
 from ..serializers.inteview_serializer import InterviewerSerializer
 
 
@@ -31,11 +30,15 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 100
 
 
-class InterviewerViewSet(viewsets.ModelViewSet):
+class InterviewerViewSet(CachedViewSetMixin, viewsets.ModelViewSet):
     """
     API для управления интервьюерами.
     """
 
+    cache_prefix = "interviewers"
+    cache_models = [Interviewer, User, Company]
+    cache_hit_status = 203
+
     queryset = Interviewer.objects.all()
     serializer_class = InterviewerSerializer
     pagination_class = StandardResultsSetPagination
@@ -99,21 +102,7 @@ class InterviewerViewSet(viewsets.ModelViewSet):
         """
         Получить список интервьюеров с поддержкой кэширования.
         """
-        # Генерация ключа для кэша на основе параметров запроса
-        cache_key = f"interviewers_{request.query_params.urlencode()}"
-        cached_data = cache.get(cache_key)
-
-        if cached_data:
-            # Возвращаем кэшированные данные
-            return Response(cached_data, status=203)
-
-        # Получаем данные через стандартный метод
-        response = super().list(request, *args, **kwargs)
-
-        # Сохраняем данные в кэш на 15 минут
-        cache.set(cache_key, response.data, timeout=60 * 15)
-
-        return response
+        return super().list(request, *args, **kwargs)
 
     @swagger_auto_schema(
         operation_summary="Создать нового интервьюера",
@@ -160,12 +149,9 @@ class InterviewerViewSet(viewsets.ModelViewSet):
     )
     def create(self, request, *args, **kwargs):
         """
-        Создать интервьюера и очистить кэш списка.
+        Создать интервьюера. Кэш списка сбрасывается сигналом post_save.
         """
-        response = super().create(request, *args, **kwargs)
-        if response.status_code == 201:
-            cache.delete_pattern("interviewers_*")
-        return response
+        return super().create(request, *args, **kwargs)
 
     @swagger_auto_schema(
         operation_summary="Получить информацию об интервьюере",
@@ -184,17 +170,7 @@ class InterviewerViewSet(viewsets.ModelViewSet):
         """
         Получить информацию об интервьюере с поддержкой кэширования.
         """
-        instance_id = kwargs.get("pk")
-        cache_key = f"interviewer_{instance_id}"
-
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data, status=203)
-
-        response = super().retrieve(request, *args, **kwargs)
-        if response.status_code == 200:
-            cache.set(cache_key, response.data, timeout=60 * 15)
-        return response
+        return super().retrieve(request, *args, **kwargs)
 
     @swagger_auto_schema(
         operation_summary="Обновить информацию об интервьюере",
@@ -236,14 +212,9 @@ class InterviewerViewSet(viewsets.ModelViewSet):
     )
     def update(self, request, *args, **kwargs):
         """
-        Обновить информацию об интервьюере и очистить кэш.
+        Обновить информацию об интервьюере. Кэш сбрасывается сигналом post_save.
         """
-        instance_id = kwargs.get("pk")
-        response = super().update(request, *args, **kwargs)
-        if response.status_code == 200:
-            cache.delete_pattern("interviewers_*")
-            cache.delete(f"interviewer_{instance_id}")
-        return response
+        return super().update(request, *args, **kwargs)
 
     @swagger_auto_schema(
         operation_summary="Частично обновить информацию об интервьюере",
@@ -285,14 +256,9 @@ class InterviewerViewSet(viewsets.ModelViewSet):
     )
     def partial_update(self, request, *args, **kwargs):
         """
-        Частично обновить интервьюера и очистить кэш.
+        Частично обновить интервьюера. Кэш сбрасывается сигналом post_save.
         """
-        instance_id = kwargs.get("pk")
-        response = super().partial_update(request, *args, **kwargs)
-        if response.status_code == 200:
-            cache.delete_pattern("interviewers_*")
-            cache.delete(f"interviewer_{instance_id}")
-        return response
+        return super().partial_update(request, *args, **kwargs)
 
     @swagger_auto_schema(
         operation_summary="Удалить интервьюера",
@@ -324,12 +290,7 @@ class InterviewerViewSet(viewsets.ModelViewSet):
     )
     def destroy(self, request, *args, **kwargs):
         """
-        Удалить интервьюера и очистить кэш.
+        Удалить интервьюера. Кэш сбрасывается сигналом post_delete.
         """
-        instance_id = kwargs.get("pk")
-        response = super().destroy(request, *args, **kwargs)
-        if response.status_code == 204:
-            cache.delete_pattern("interviewers_*")
-            cache.delete(f"interviewer_{instance_id}")
-        return response
+        return super().destroy(request, *args, **kwargs)
 